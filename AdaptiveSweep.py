@@ -0,0 +1,217 @@
+from itertools import product
+from Evaluation import run_jobs
+from ReferenceProfile import build_reference_profile
+from SweepEngine import build_evaluations, cell_job, expand_logs, load_original, prescreen_entries
+
+# Adaptiver Sweep: statt jeden Punkt eines dichten Gitters zu evaluieren, wird ein grobes Gitter über die
+# Achsen (z. B. K und L, ε oder der Noise Threshold) evaluiert und nur dort verfeinert, wo sich die Metrik
+# innerhalb einer Zelle um mehr als tolerance ändert. So wird der Knick der Privacy-Utility-Kurve mit
+# einem Bruchteil der Evaluierungen gefunden.
+#
+# Spec wie bei SweepEngine.run_sweep. Die Kandidatenwerte einer Achse sind die Parameterwerte der
+# vorhandenen Logs bzw. für "threshold" die Liste "thresholds" (das dichte Gitter).
+# Zellen sind Boxen im Indexraum der Kandidatenwerte; eine Zelle wird in Teilzellen zerlegt (1D: Hälften,
+# 2D: Quadranten), bis die Metrik an ihren Ecken um höchstens tolerance schwankt oder sie nicht weiter
+# teilbar ist. Verfeinert wird nach der ersten Fitness-Auswertung der Spec.
+# Punkte werden wie bei run_sweep als Jobs berechnet; Checkpoints beider Sweeps sind austauschbar.
+
+# Werte der Achse als dichtes Gitter
+def _axis_values(spec, entries, axis):
+    if axis == "threshold":
+        return sorted(spec.get("thresholds", [0.2]))
+    return sorted({entry["params"][axis] for entry in entries if axis in entry["params"]})
+
+# coarse_points gleichmäßig verteilte Indizes, inklusive erstem und letztem
+def _coarse_indices(n, coarse_points):
+    if n == 1:
+        return [0]
+    points = max(2, min(coarse_points, n))
+    return sorted({round(i * (n - 1) / (points - 1)) for i in range(points)})
+
+def _corners(box):
+    return list(product(*[sorted({lo, hi}) for lo, hi in box]))
+
+# Zelle entlang aller teilbaren Achsen halbieren; leer, wenn die Zelle nicht weiter teilbar ist
+def _split(box):
+    if all(hi - lo <= 1 for lo, hi in box):
+        return []
+    halves = []
+    for lo, hi in box:
+        if hi - lo > 1:
+            mid = (lo + hi) // 2
+            halves.append([(lo, mid), (mid, hi)])
+        else:
+            halves.append([(lo, hi)])
+    return [tuple(child) for child in product(*halves)]
+
+# Wert der Metrik in den Ergebnissen eines Punkts (erste Fitness-Auswertung), None bei fehlendem Log
+def _metric(records, metric):
+    if not records:
+        return None
+    return records[0][metric]
+
+# Nicht-Achsen-Dimensionen (Algorithmus, fester Threshold, übrige Parameter) bilden je eine eigene Gruppe
+def _groups(spec, entries, axes):
+    thresholds = [None] if "threshold" in axes else spec.get("thresholds", [0.2])
+    others = sorted({
+        tuple(sorted((key, value) for key, value in entry["params"].items() if key not in axes))
+        for entry in entries
+    })
+    return [
+        (algorithm, threshold, other)
+        for algorithm in spec.get("algorithms", ["inductive"])
+        for threshold in thresholds
+        for other in others
+    ]
+
+# Verfeinerung ausführen.
+# axes: Namen der Achsen (Parameter aus den Dateinamen und/oder "threshold")
+# metric: Metrik, deren Änderung die Verfeinerung steuert; tolerance: erlaubte Änderung innerhalb einer Zelle
+# coarse_points: Punkte pro Achse im Startgitter; max_rounds: maximale Zahl an Verfeinerungsrunden
+# Liefert ein Dict mit den Achsenwerten, den evaluierten Punkten, den Blattzellen und den Ergebnissen
+# (ein Datensatz pro evaluiertem Punkt und Fitness-Auswertung, wie bei run_sweep).
+def run_adaptive_sweep(spec, axes, metric="f1_score", tolerance=0.05, coarse_points=3, max_rounds=10,
+                       stats=None):
+    original_log, profile = load_original(spec)
+    if profile is None:
+        profile = build_reference_profile(original_log)
+    entries = expand_logs(spec["logs"])
+    if spec.get("prescreen"):
+        entries = prescreen_entries(original_log, entries, **spec["prescreen"])
+    evaluations = build_evaluations(spec)
+
+    values = {axis: _axis_values(spec, entries, axis) for axis in axes}
+    for axis in axes:
+        if not values[axis]:
+            raise ValueError(f"Keine Werte für die Achse '{axis}'")
+    param_axes = [axis for axis in axes if axis != "threshold"]
+    lookup = {}
+    for entry in entries:
+        other = tuple(sorted((key, value) for key, value in entry["params"].items() if key not in axes))
+        lookup[(other, tuple(entry["params"].get(axis) for axis in param_axes))] = entry
+    groups = _groups(spec, entries, axes)
+
+    # Job eines Gitterpunkts; None, wenn für die Parameterkombination kein Log existiert
+    def job_for(group, point):
+        algorithm, threshold, other = group
+        coordinates = {axis: values[axis][i] for axis, i in zip(axes, point)}
+        entry = lookup.get((other, tuple(coordinates[axis] for axis in param_axes)))
+        if entry is None:
+            return None
+        return cell_job(entry, algorithm, coordinates.get("threshold", threshold), evaluations,
+                        approximate=spec.get("approximate"), profiling=spec.get("profiling"),
+                        share_abstraction=bool(spec.get("share_threshold_models")) and algorithm == "inductive")
+
+    start = [
+        list(zip(indices, indices[1:])) or [(indices[0], indices[0])]
+        for indices in (_coarse_indices(len(values[axis]), coarse_points) for axis in axes)
+    ]
+    cells = [(group, tuple(box)) for group in groups for box in product(*start)]
+    points = {}
+    leaves = []
+    missing = 0
+
+    for round_number in range(max_rounds + 1):
+        pending = sorted({
+            (group, corner) for group, box in cells for corner in _corners(box)
+        } - points.keys())
+        jobs = []
+        keys = []
+        for key in pending:
+            job = job_for(*key)
+            if job is None:
+                points[key] = None
+                missing += 1
+                continue
+            jobs.append(job)
+            keys.append(key)
+        outputs = run_jobs(original_log, jobs, workers=spec.get("workers"), stats=stats,
+                           checkpoint=spec.get("checkpoint"), profile=profile)
+        points.update(zip(keys, outputs))
+        print(f"Runde {round_number}: {len(jobs)} Punkte evaluiert, {len(cells)} Zellen")
+
+        if round_number == max_rounds:
+            leaves.extend(cells)
+            break
+        refined = []
+        for group, box in cells:
+            corner_values = [_metric(points[(group, corner)], metric) for corner in _corners(box)]
+            corner_values = [value for value in corner_values if value is not None]
+            children = _split(box) if corner_values and max(corner_values) - min(corner_values) > tolerance else []
+            if children:
+                refined.extend((group, child) for child in children)
+            else:
+                leaves.append((group, box))
+        cells = refined
+        if not cells:
+            break
+
+    grid_size = len(groups)
+    for axis in axes:
+        grid_size *= len(values[axis])
+    evaluated = len(points) - missing
+    print(f"{evaluated} von {grid_size} Gitterpunkten evaluiert")
+    if missing:
+        print(f"⚠️  {missing} Gitterpunkte ohne passenden Log übersprungen")
+
+    results = [record for key in sorted(points) for record in (points[key] or [])]
+    return {
+        "axes": list(axes),
+        "values": values,
+        "groups": groups,
+        "points": points,
+        "leaves": leaves,
+        "results": results
+    }
+
+# Matrix (row x column) für die Heatmaps: evaluierte Punkte direkt, alle übrigen Punkte bilinear aus
+# den Ecken ihrer Blattzelle interpoliert. Liefert (Zeilenwerte, Spaltenwerte, Matrix, evaluiert),
+# evaluiert ist eine boolesche Matrix der tatsächlich berechneten Punkte.
+# group wählt bei mehreren Gruppen (Algorithmen, feste Thresholds) die darzustellende aus.
+def interpolate_matrix(sweep, row, column, metric, group=None):
+    import numpy as np
+    axes = sweep["axes"]
+    if sorted(axes) != sorted([row, column]):
+        raise ValueError(f"Achsen {axes} passen nicht zu ({row}, {column})")
+    if group is None:
+        if len(sweep["groups"]) != 1:
+            raise ValueError("Mehrere Gruppen im Sweep, bitte group angeben")
+        group = sweep["groups"][0]
+
+    values = sweep["values"]
+    matrix = np.full((len(values[row]), len(values[column])), np.nan)
+    evaluated = np.zeros(matrix.shape, dtype=bool)
+    row_axis = axes.index(row)
+    column_axis = axes.index(column)
+
+    for (point_group, point), records in sweep["points"].items():
+        value = _metric(records, metric)
+        if point_group == group and value is not None:
+            matrix[point[row_axis], point[column_axis]] = value
+            evaluated[point[row_axis], point[column_axis]] = True
+
+    for leaf_group, box in sweep["leaves"]:
+        if leaf_group != group:
+            continue
+        corners = {corner: _metric(sweep["points"][(group, corner)], metric) for corner in _corners(box)}
+        for point in product(*[range(lo, hi + 1) for lo, hi in box]):
+            i, j = point[row_axis], point[column_axis]
+            if evaluated[i, j]:
+                continue
+            # Gewichte der Ecken nach Abstand in Werten der Achsen (nicht im Indexraum)
+            total = 0.0
+            weight_sum = 0.0
+            for corner, value in corners.items():
+                if value is None:
+                    continue
+                weight = 1.0
+                for axis, (lo, hi), index, corner_index in zip(axes, box, point, corner):
+                    if lo == hi:
+                        continue
+                    t = (values[axis][index] - values[axis][lo]) / (values[axis][hi] - values[axis][lo])
+                    weight *= t if corner_index == hi else 1 - t
+                total += weight * value
+                weight_sum += weight
+            if weight_sum > 0:
+                matrix[i, j] = total / weight_sum
+    return values[row], values[column], matrix, evaluated
@@ -0,0 +1,184 @@
+import numpy as np
+from collections import Counter
+from BoundedAlignments import bounded_alignments_per_variant
+from Evaluation import compute_f1
+from LogSampling import top_k_variants
+from ReferenceProfile import align_variants, build_profile_from_variants, prefix_log, replay_prefixes
+from VectorReplay import replay_variants_vectorized
+
+# Approximative Evaluierung für sehr große Original-Logs (z. B. Spaghetti mit 100k+ Traces).
+# Fitness und Precision werden aus einer geschichteten Stichprobe der Varianten geschätzt:
+#  - Schicht 1: die top_k häufigsten Varianten (wie LogSampling.top_k_variants), exakt mit ihrer Häufigkeit
+#  - Schicht 2: die übrigen Varianten, gezogen mit Zurücklegen proportional zu ihrer Häufigkeit
+# Pro Variante werden die Summen bestimmt, aus denen pm4py die Metriken bildet (passende Traces, Token
+# bzw. Alignment-Kosten, aktivierte und nie beobachtete Aktivitäten der ETConformance-Precision); die
+# Metriken ergeben sich als Quotienten der geschätzten Summen. Konfidenzintervalle kommen aus einem
+# Bootstrap über die Ziehungen der zweiten Schicht. Die Stichprobe wird verdoppelt, bis das breiteste
+# Intervall (Fitness, Precision, F1) schmaler als tolerance ist oder max_sample erreicht ist.
+# Jede Variante und jeder Präfix wird höchstens einmal abgespielt, auch über mehrere Fitness-Typen (cache).
+
+TOKEN_KEYS = ["missing_tokens", "consumed_tokens", "remaining_tokens", "produced_tokens"]
+ALIGNMENT_KEYS = ["cost", "bwc"]
+
+# Profil mit den gegebenen Varianten, je einmal
+def _sub_profile(variants, activity_key):
+    return build_profile_from_variants(Counter({variant: 1 for variant in variants}), activity_key)
+
+# Precision-Beiträge pro Variante (ein Trace): aktivierte (at) und davon im Original-Log nie beobachtete (ee)
+# Aktivitäten, summiert über den leeren Präfix und alle passenden Präfixe der Variante
+def _precision_contributions(profile, variants, net, im, fm, cache):
+    from pm4py.objects.petri_net.utils.align_utils import get_visible_transitions_eventually_enabled_by_marking
+    prefixes = cache.setdefault("prefixes", {})
+    if "initial" not in cache:
+        enabled = {t.label for t in get_visible_transitions_eventually_enabled_by_marking(net, im)}
+        cache["initial"] = (len(enabled), len(enabled.difference(profile["start_activities"])))
+
+    # Nur Präfixe abspielen, die noch nicht berechnet sind
+    sub = _sub_profile(variants, profile["activity_key"])
+    sub["prefix_keys"] = [prefix for prefix in sub["prefix_keys"] if prefix not in prefixes]
+    if sub["prefix_keys"]:
+        replayed = replay_prefixes(prefix_log(sub), net, im, fm, profile["activity_key"])
+        for prefix, result in zip(sub["prefix_keys"], replayed):
+            if not result["trace_is_fit"]:
+                prefixes[prefix] = (0, 0)
+                continue
+            activated = {t.label for t in result["enabled_transitions_in_marking"] if t.label is not None}
+            prefixes[prefix] = (len(activated), len(activated.difference(profile["prefixes"][prefix])))
+
+    contributions = {}
+    for variant in variants:
+        at, ee = cache["initial"]
+        for i in range(1, len(variant)):
+            prefix_at, prefix_ee = prefixes[variant[:i]]
+            at += prefix_at
+            ee += prefix_ee
+        contributions[variant] = {"at": at, "ee": ee}
+    return contributions
+
+# Fitness-Beiträge pro Variante (ein Trace) für die gewählte Fitness-Methode
+def _fitness_contributions(profile, variants, net, im, fm, fitness_method, fitness_options, cache):
+    options = fitness_options or {}
+    known = cache.setdefault(("fitness", fitness_method, tuple(sorted(options.items()))), {})
+    new = [variant for variant in variants if variant not in known]
+    if new:
+        sub = _sub_profile(new, profile["activity_key"])
+        if fitness_method == "token_based":
+            replayed = replay_variants_vectorized(sub, net, im, fm)
+            rows = [{key: replayed[key][i] for key in TOKEN_KEYS + ["trace_is_fit"]} for i in range(len(new))]
+            for variant, row in zip(sub["variants"], rows):
+                known[variant] = dict({key: float(row[key]) for key in TOKEN_KEYS}, fit=float(bool(row["trace_is_fit"])))
+        elif fitness_method in ("alignments", "alignments_bounded"):
+            if fitness_method == "alignments":
+                aligned = align_variants(sub, net, im, fm)
+            else:
+                aligned, _ = bounded_alignments_per_variant(sub, net, im, fm, **options)
+            for variant, row in zip(sub["variants"], aligned):
+                known[variant] = dict({key: float(row[key]) for key in ALIGNMENT_KEYS}, fit=float(row["fitness"] == 1.0))
+        else:
+            raise ValueError(f"Unbekannte Fitness-Methode '{fitness_method}'")
+    return {variant: known[variant] for variant in variants}
+
+# Fitness, Precision und F1 aus den (geschätzten) Summen, wie pm4py sie aggregiert
+def _metrics(totals, keys, fitness_method, fitness_type):
+    total = dict(zip(keys, totals))
+    precision = 1 - total["ee"] / total["at"] if total["at"] > 0 else 1.0
+    if fitness_type == "percentage_of_fitting_traces":
+        fitness = total["fit"] / total["n"] if total["n"] > 0 else 0.0
+    elif fitness_type == "log_fitness":
+        if fitness_method == "token_based":
+            fitness = 0.0
+            if total["consumed_tokens"] > 0 and total["produced_tokens"] > 0:
+                fitness = (0.5 * (1 - total["missing_tokens"] / total["consumed_tokens"])
+                           + 0.5 * (1 - total["remaining_tokens"] / total["produced_tokens"]))
+        else:
+            fitness = 1 - total["cost"] / total["bwc"] if total["bwc"] > 0 else 0.0
+    else:
+        raise ValueError(f"Unbekannter Fitness-Typ '{fitness_type}'")
+    return float(fitness), float(precision), float(compute_f1(precision, fitness))
+
+# Geschätzte Fitness, Precision und F1 mit Konfidenzintervallen (Felder *_ci: [untere, obere Grenze]).
+# profile: Referenzprofil des Original-Logs; cache: Dict, das mehrere Aufrufe auf demselben Modell teilen.
+def approximate_metrics(profile, net, im, fm, fitness_method="token_based",
+                        fitness_type="percentage_of_fitting_traces", fitness_options=None,
+                        top_k=100, initial_sample=200, max_sample=20000, tolerance=0.02,
+                        bootstrap=200, confidence=0.95, seed=0, cache=None):
+    if cache is None:
+        cache = {}
+    variant_counts = dict(zip(profile["variants"], profile["counts"]))
+    head = top_k_variants(variant_counts, top_k)
+    tail = [variant for variant in profile["variants"] if variant not in head]
+    # Wenige seltene Varianten: alles exakt
+    if len(tail) <= initial_sample:
+        head = set(profile["variants"])
+        tail = []
+    tail_counts = np.array([variant_counts[variant] for variant in tail], dtype=float)
+    tail_traces = float(tail_counts.sum())
+
+    keys = ["n", "fit", "at", "ee"] + (TOKEN_KEYS if fitness_method == "token_based" else ALIGNMENT_KEYS)
+    rng = np.random.default_rng(seed)
+    draws = np.array([], dtype=np.int64)
+    sample_size = initial_sample
+    lower_q = (1 - confidence) / 2
+
+    while True:
+        if tail:
+            new_draws = rng.choice(len(tail), size=sample_size - len(draws), p=tail_counts / tail_traces)
+            draws = np.concatenate([draws, new_draws])
+        drawn = [tail[i] for i in np.unique(draws)] if tail else []
+        needed = list(head) + drawn
+        fitness_parts = _fitness_contributions(profile, needed, net, im, fm, fitness_method, fitness_options, cache)
+        precision_parts = _precision_contributions(profile, needed, net, im, fm, cache)
+
+        def vector(variant):
+            parts = dict(fitness_parts[variant], **precision_parts[variant], n=1.0)
+            return [parts[key] for key in keys]
+
+        head_total = np.zeros(len(keys))
+        for variant in head:
+            head_total += variant_counts[variant] * np.array(vector(variant))
+        estimate = _metrics(head_total, keys, fitness_method, fitness_type)
+        intervals = [(value, value) for value in estimate]
+
+        if tail:
+            # Hansen-Hurwitz: bei Ziehung proportional zur Häufigkeit ist die Tail-Summe tail_traces * Mittelwert
+            rows = {i: vector(tail[i]) for i in np.unique(draws)}
+            sample = np.array([rows[i] for i in draws])
+            estimate = _metrics(head_total + tail_traces * sample.mean(axis=0), keys, fitness_method, fitness_type)
+            replicates = np.array([
+                _metrics(head_total + tail_traces * sample[rng.integers(0, len(sample), len(sample))].mean(axis=0),
+                         keys, fitness_method, fitness_type)
+                for _ in range(bootstrap)
+            ])
+            intervals = [
+                (float(np.quantile(replicates[:, j], lower_q)), float(np.quantile(replicates[:, j], 1 - lower_q)))
+                for j in range(3)
+            ]
+        width = max(upper - lower for lower, upper in intervals)
+
+        if not tail or width <= tolerance or len(draws) >= max_sample:
+            break
+        # Alle seltenen Varianten gezogen: exakt weiterrechnen, ihre Beiträge liegen bereits vor
+        if len(drawn) == len(tail):
+            head = set(profile["variants"])
+            tail = []
+            continue
+        sample_size = min(2 * len(draws), max_sample)
+
+    fitness, precision, f1_score = estimate
+    return {
+        "fitness": fitness,
+        "precision": precision,
+        "f1_score": f1_score,
+        "fitness_ci": list(intervals[0]),
+        "precision_ci": list(intervals[1]),
+        "f1_score_ci": list(intervals[2]),
+        "approximation": {
+            "exact_variants": len(head),
+            "sampled_traces": len(draws) if tail else 0,
+            "sampled_variants": len(np.unique(draws)) if tail else 0,
+            "tail_traces": int(tail_traces) if tail else 0,
+            "confidence": confidence,
+            "interval_width": width,
+            "converged": width <= tolerance
+        }
+    }
@@ -0,0 +1,279 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+import tempfile
+import multiprocessing
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+import pm4py
+from pm4py.objects.log.obj import EventLog, Trace, Event
+from pm4py.objects.log.importer.xes import importer as xes_importer
+from LogCache import load_log
+from ReferenceProfile import build_reference_profile, get_variant_counts
+from Evaluation import evaluate_for_log
+from Profiling import stage
+
+# Benchmark der Evaluierungs-Pipeline mit synthetischen Logs.
+# Für jede Kombination aus Trace- und Variantenanzahl wird ein Log erzeugt und in einem frischen Prozess
+# durch alle Stufen geschickt: XES-Export und -Import, Referenzprofil, dann Evaluation.evaluate_for_log
+# (Discovery, Precision, Fitness) mit dessen eigener Stufenmessung, zuletzt der Plot.
+# Pro Stufe landen die Messwerte von Profiling.stage im JSON-Report: Wall- und CPU-Zeit, Speicher der Stufe
+# (rss_delta_mb; mit --trace-memory zusätzlich peak_mb über tracemalloc, das die Laufzeiten verlangsamt).
+# Der Modell-Cache liegt pro Lauf in einem leeren temporären Verzeichnis, gemessen wird die echte Discovery.
+#
+# Zusätzlich wird die Startzeit der Einstiegspunkte gemessen (frischer Interpreter, Minimum über mehrere Läufe)
+# und optional gegen ein Budget geprüft.
+#
+# Beispiel: python Benchmark.py --traces 1000 10000 100000 --variants 20 200 --output benchmark_report.json
+# Nur Startzeit: python Benchmark.py --startup-only --startup-budget 1.0
+
+# Varianten aus dem Playout eines zufälligen Prozessbaums.
+# Baumgenerator und Playout von pm4py ziehen aus den globalen Generatoren von random und NumPy (Größe des
+# Baums über scipy); beide werden für die Dauer des Aufrufs mit seed belegt und danach auf ihren vorherigen
+# Zustand zurückgesetzt. Erlaubt der Baum weniger Varianten als gewünscht, werden nur diese geliefert
+# (run_benchmark meldet die Differenz).
+def variants_from_process_tree(n_variants, seed, max_rounds=50):
+    import numpy as np
+    state, np_state = random.getstate(), np.random.get_state()
+    random.seed(seed)
+    np.random.seed(seed)
+    try:
+        tree = pm4py.generate_process_tree()
+        variants = []
+        seen = set()
+        for _ in range(max_rounds):
+            played = pm4py.play_out(tree, parameters={"num_traces": max(2 * n_variants, 100)})
+            for trace in played:
+                variant = tuple(event["concept:name"] for event in trace)
+                if variant not in seen:
+                    seen.add(variant)
+                    variants.append(variant)
+                if len(variants) >= n_variants:
+                    return variants, None
+        return variants, None
+    finally:
+        random.setstate(state)
+        np.random.set_state(np_state)
+
+# Häufigste Varianten eines vorhandenen Logs (z. B. Klein), mit ihren relativen Häufigkeiten
+def variants_from_log(path, n_variants):
+    ranked = get_variant_counts(load_log(path)).most_common(n_variants)
+    return [variant for variant, _ in ranked], [count for _, count in ranked]
+
+# Log mit n_traces Traces aus den gegebenen Varianten; ohne Gewichte Zipf-verteilt
+def build_synthetic_log(variants, n_traces, seed, weights=None):
+    rng = random.Random(seed)
+    if weights is None:
+        weights = [1.0 / (rank + 1) for rank in range(len(variants))]
+    chosen = rng.choices(range(len(variants)), weights=weights, k=n_traces)
+    # Jede Variante mindestens einmal, sofern genug Traces
+    if n_traces >= len(variants):
+        chosen[:len(variants)] = range(len(variants))
+        rng.shuffle(chosen)
+
+    log = EventLog()
+    start = datetime(2025, 1, 1)
+    for case_number, index in enumerate(chosen):
+        trace = Trace()
+        trace.attributes["concept:name"] = f"case_{case_number}"
+        for position, activity in enumerate(variants[index]):
+            trace.append(Event({
+                "concept:name": activity,
+                "time:timestamp": start + timedelta(minutes=case_number, seconds=position)
+            }))
+        log.append(trace)
+    return log
+
+# Aufrufe, deren Startzeit gemessen wird; keiner davon darf pm4py oder matplotlib laden
+STARTUP_COMMANDS = {
+    "evaluate_help": ["Evaluate.py", "--help"],
+    "result_store_help": ["ResultStore.py", "--help"],
+    "import_evaluation": ["-c", "import Evaluation"]
+}
+
+# Startzeit pro Aufruf in Sekunden: Minimum über repeats Läufe in einem frischen Interpreter
+def measure_startup(repeats=5):
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    startup = {}
+    for name, arguments in STARTUP_COMMANDS.items():
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            subprocess.run([sys.executable] + arguments, cwd=base_dir, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - start)
+        startup[name] = round(min(timings), 4)
+    return startup
+
+# Ein Benchmark-Lauf; wird in einem eigenen Prozess ausgeführt, damit Caches und Speicher früherer Läufe
+# nicht mitgemessen werden
+def run_benchmark(config):
+    if config.get("trace_memory"):
+        import tracemalloc
+        tracemalloc.start()
+    stages = {}
+    with stage(stages, "generate"):
+        if config["source"] == "tree":
+            variants, weights = variants_from_process_tree(config["n_variants"], config["seed"])
+        else:
+            variants, weights = variants_from_log(config["source"], config["n_variants"])
+        if len(variants) < config["n_variants"]:
+            print(f"⚠️  Nur {len(variants)} von {config['n_variants']} Varianten erzeugt ({config['source']})")
+        log = build_synthetic_log(variants, config["n_traces"], config["seed"], weights)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        xes_path = os.path.join(tmp_dir, "synthetic.xes")
+        with stage(stages, "export"):
+            pm4py.write_xes(log, xes_path)
+        # Import ohne Log-Cache, gemessen wird das XML-Parsing
+        with stage(stages, "import"):
+            log = xes_importer.apply(xes_path)
+        with stage(stages, "profile"):
+            profile = build_reference_profile(log)
+
+        # Evaluierung wie in den Sweeps: Discovery, Precision und Token-based Fitness
+        # Die Import-Stufe der Evaluierung (pm4py) heißt hier pm4py_import, "import" ist das XML-Parsing
+        evaluation_stages = {}
+        result = evaluate_for_log(log, log, config["threshold"], fitness_method="token_based",
+                                  profile=profile, stages=evaluation_stages)
+        stages["pm4py_import"] = evaluation_stages.pop("import")
+        stages["fitness_token_based"] = evaluation_stages.pop("fitness")
+        stages.update(evaluation_stages)
+        if config["alignments"]:
+            # Discovery und Precision kommen aus dem Modell-Cache, gemessen wird nur die Fitness-Stufe
+            alignment_stages = {}
+            evaluate_for_log(log, log, config["threshold"], fitness_method="alignments", profile=profile,
+                             stages=alignment_stages)
+            stages["fitness_alignments"] = alignment_stages["fitness"]
+
+        with stage(stages, "plot"):
+            from TLKCFunctionK import plot_results
+            plot_results([dict(result, K=1)], os.path.join(tmp_dir, "plot.png"))
+
+    return {
+        "source": config["source"],
+        "n_traces": config["n_traces"],
+        "n_variants": len(variants),
+        # Angefordert; weicht von n_variants ab, wenn der Baum bzw. Log weniger Varianten hergibt
+        "n_variants_requested": config["n_variants"],
+        "n_events": sum(len(trace) for trace in log),
+        "n_places": stages["discovery"]["places"],
+        "n_transitions": stages["discovery"]["transitions"],
+        "stages": stages
+    }
+
+# Laufzeit einer Stufe; ältere Reports speichern sie unter "seconds"
+def _seconds(values):
+    return values["wall_s"] if "wall_s" in values else values["seconds"]
+
+# Speicher einer Stufe für die Ausgabe: tracemalloc-Peak, sonst RSS-Änderung
+def _memory(values):
+    if "peak_mb" in values:
+        return f"{values['peak_mb']} MB (Peak)"
+    return f"{values.get('rss_delta_mb')} MB (RSS-Δ)"
+
+# Stufen, die gegenüber einem früheren Report um mehr als tolerance (relativ) langsamer geworden sind
+def compare_reports(baseline, report, tolerance=0.2, min_seconds=0.05):
+    previous = {(r["source"], r["n_traces"], r["n_variants"]): r for r in baseline["runs"]}
+    regressions = []
+    for run in report["runs"]:
+        old = previous.get((run["source"], run["n_traces"], run["n_variants"]))
+        if old is None:
+            continue
+        for name, values in run["stages"].items():
+            if name not in old["stages"]:
+                continue
+            before = _seconds(old["stages"][name])
+            after = _seconds(values)
+            if after > min_seconds and after > before * (1 + tolerance):
+                regressions.append({
+                    "n_traces": run["n_traces"],
+                    "n_variants": run["n_variants"],
+                    "stage": name,
+                    "before": before,
+                    "after": after
+                })
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Evaluierungs-Pipeline mit synthetischen Logs")
+    parser.add_argument("--traces", type=int, nargs="+", default=[1000, 10000], help="Anzahl Traces pro Log")
+    parser.add_argument("--variants", type=int, nargs="+", default=[50], help="Anzahl Varianten pro Log")
+    parser.add_argument("--source", default="tree",
+                        help="'tree' (zufälliger Prozessbaum) oder Pfad eines XES-Logs, dessen Varianten hochskaliert werden")
+    parser.add_argument("--threshold", type=float, default=0.2, help="IMf Noise Threshold")
+    parser.add_argument("--alignments", action="store_true", help="Auch Alignment-Fitness messen")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Peak-Speicher pro Stufe über tracemalloc messen (verlangsamt die Läufe)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmark_report.json")
+    parser.add_argument("--baseline", help="Früherer Report, gegen den auf Regressionen geprüft wird")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Erlaubte relative Verlangsamung pro Stufe")
+    parser.add_argument("--startup-budget", type=float, help="Maximale Startzeit (Sekunden) pro Einstiegspunkt")
+    parser.add_argument("--startup-only", action="store_true", help="Nur die Startzeit messen")
+    args = parser.parse_args()
+
+    startup = measure_startup()
+    for name, seconds in startup.items():
+        print(f"Startzeit {name:<20} {seconds:>8.3f} s")
+    over_budget = [name for name, seconds in startup.items()
+                   if args.startup_budget is not None and seconds > args.startup_budget]
+    for name in over_budget:
+        print(f"⚠️  Startzeit {name} über Budget: {startup[name]:.3f} s > {args.startup_budget:.3f} s")
+
+    runs = []
+    for n_variants in ([] if args.startup_only else args.variants):
+        for n_traces in args.traces:
+            config = {
+                "source": args.source,
+                "n_traces": n_traces,
+                "n_variants": n_variants,
+                "threshold": args.threshold,
+                "alignments": args.alignments,
+                "trace_memory": args.trace_memory,
+                "seed": args.seed
+            }
+            print(f"Benchmark: {n_traces} Traces, {n_variants} Varianten")
+            # Frischer Prozess pro Lauf mit leerem Modell-Cache (der Prozess liest MODEL_CACHE_DIR beim Import)
+            with tempfile.TemporaryDirectory() as model_cache_dir:
+                os.environ["MODEL_CACHE_DIR"] = model_cache_dir
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                    run = executor.submit(run_benchmark, config).result()
+            for name, values in run["stages"].items():
+                print(f"  {name:<22} {_seconds(values):>10.3f} s   {_memory(values)}")
+            runs.append(run)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pm4py": pm4py.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "threshold": args.threshold,
+        "startup": startup,
+        "startup_budget": args.startup_budget,
+        "runs": runs
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"\nReport gespeichert in: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare_reports(baseline, report, args.tolerance)
+        for r in regressions:
+            print(f"⚠️  Regression {r['stage']} ({r['n_traces']} Traces, {r['n_variants']} Varianten): "
+                  f"{r['before']:.3f} s -> {r['after']:.3f} s")
+        if regressions:
+            sys.exit(1)
+    if over_budget:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
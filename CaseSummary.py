@@ -0,0 +1,239 @@
+import os
+import heapq
+import pickle
+import argparse
+import tempfile
+import numpy as np
+from LogCache import cached_entry
+from XesStream import iter_traces
+
+# Case-Übersicht eines Logs als CSV (wie beispiellog.csv): pro Case die Aktivitätsfolge als Text,
+# optional die Dauer des Cases (erster bis letzter Zeitstempel) und eine Varianten-Datei mit Häufigkeiten.
+# Der Log wird blockweise gelesen (chunk_size Events): aus dem Parquet-Eintrag des Log-Caches, falls vorhanden,
+# sonst streamend aus dem XES. Pro Block werden Case-Grenzen, Aktivitätscodes und Dauern mit NumPy bestimmt;
+# nur die Varianten werden einmal pro Case nachgeschlagen und einmal pro Variante zu Text verbunden.
+# Jeder Block wird sofort geschrieben, der Speicher wächst mit chunk_size und der Zahl der Varianten.
+# Mit sort_cases=True wird nach Case ID sortiert wie bei groupby, extern: jeder Block wird sortiert als Lauf in
+# eine temporäre Datei geschrieben, am Ende werden die Läufe mit heapq.merge zusammengeführt.
+# Events ohne Case ID werden wie bei groupby übersprungen und im Ergebnis gezählt.
+# Erwartet die Events eines Cases zusammenhängend (XES, pm4py-DataFrames, Log-Cache) und in Log-Reihenfolge.
+#
+#   python CaseSummary.py Theorie_Kapitel/20250327_Beispiellog_v4.xes beispiellog.csv --sort --durations
+
+CASE_COLUMN = "Case ID"
+ACTIVITIES_COLUMN = "Activities"
+DURATION_COLUMN = "Duration (s)"
+# Zeilen pro gespeichertem Stück eines sortierten Laufs (beim Zusammenführen liegt je Lauf ein Stück im Speicher)
+RUN_PIECE_ROWS = 10_000
+
+# Blöcke aus einer Parquet-Datei (nur die benötigten Spalten)
+def _parquet_chunks(path, columns, chunk_size):
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(path)
+    columns = [column for column in columns if column in parquet.schema_arrow.names]
+    for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+        yield batch.to_pandas()
+
+# Blöcke aus einem XES, Trace für Trace gelesen
+def _xes_chunks(path, case_id_key, activity_key, timestamp_key, chunk_size):
+    import pandas as pd
+    case_ids, activities, timestamps = [], [], []
+    keys = {activity_key, timestamp_key}
+
+    def chunk():
+        frame = pd.DataFrame({case_id_key: case_ids, activity_key: activities})
+        if timestamp_key is not None:
+            frame[timestamp_key] = pd.to_datetime(timestamps, utc=True, format="ISO8601")
+        return frame
+
+    for trace in iter_traces(path):
+        case_id = None
+        for child in trace:
+            if child.tag != "event":
+                if child.get("key") == "concept:name":
+                    case_id = child.get("value")
+                continue
+            values = {attribute.get("key"): attribute.get("value") for attribute in child if attribute.get("key") in keys}
+            if activity_key not in values:
+                continue
+            case_ids.append(case_id)
+            activities.append(values[activity_key])
+            if timestamp_key is not None:
+                timestamps.append(values.get(timestamp_key))
+        if len(case_ids) >= chunk_size:
+            yield chunk()
+            case_ids, activities, timestamps = [], [], []
+    if case_ids:
+        yield chunk()
+
+# Blöcke aus einem DataFrame; Events eines Cases werden bei Bedarf zusammengelegt (stabile Sortierung)
+def _dataframe_chunks(df, case_id_key, chunk_size):
+    cases = df[case_id_key].to_numpy()
+    runs = 1 + int(np.count_nonzero(cases[1:] != cases[:-1])) if len(cases) else 0
+    if runs != df[case_id_key].nunique():
+        df = df.sort_values(case_id_key, kind="stable")
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+def _chunks(source, case_id_key, activity_key, timestamp_key, chunk_size):
+    if not isinstance(source, str):
+        return _dataframe_chunks(source, case_id_key, chunk_size)
+    columns = [case_id_key, activity_key] + ([timestamp_key] if timestamp_key is not None else [])
+    if source.endswith(".parquet"):
+        return _parquet_chunks(source, columns, chunk_size)
+    entry_path = cached_entry(source)
+    if entry_path is not None:
+        return _parquet_chunks(entry_path, columns, chunk_size)
+    return _xes_chunks(source, case_id_key, activity_key, timestamp_key, chunk_size)
+
+# Events ohne Case ID entfernen (wie groupby); skipped zählt sie
+def _with_case_ids(chunks, case_id_key, skipped):
+    for chunk in chunks:
+        missing = chunk[case_id_key].isna().to_numpy()
+        if missing.any():
+            skipped["events"] += int(missing.sum())
+            chunk = chunk[~missing]
+        yield chunk
+
+# Blöcke so zuschneiden, dass jeder Case vollständig in einem Block liegt (der letzte Case wandert in den nächsten)
+def _complete_cases(chunks, case_id_key):
+    import pandas as pd
+    carry = None
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        cases = chunk[case_id_key].to_numpy()
+        if not len(cases):
+            continue
+        change = np.flatnonzero(cases[1:] != cases[:-1])
+        tail = int(change[-1]) + 1 if len(change) else 0
+        carry = chunk.iloc[tail:]
+        if tail:
+            yield chunk.iloc[:tail]
+    if carry is not None and len(carry):
+        yield carry
+
+# Case-Übersicht schreiben. source: XES-Pfad, Parquet-Datei oder DataFrame.
+# durations: Spalte mit der Dauer pro Case in Sekunden (aus timestamp_key)
+# variants_path: zusätzlich eine CSV mit Variante, Aktivitätsfolge und Anzahl der Cases
+# Liefert die Anzahl der Cases, Events und Varianten.
+def summarize_cases(source, output_path, chunk_size=1_000_000, separator=" → ", durations=False,
+                    variants_path=None, sort_cases=False, case_id_key="case:concept:name",
+                    activity_key="concept:name", timestamp_key="time:timestamp"):
+    import pandas as pd
+    activity_codes = {}
+    activity_names = []
+    variant_ids = {}
+    variant_texts = []
+    variant_counts = []
+    skipped = {"events": 0}
+    written = 0
+    events = 0
+
+    chunks = _chunks(source, case_id_key, activity_key, timestamp_key if durations else None, chunk_size)
+    with open(output_path, "w", encoding="utf-8", newline="") as out, tempfile.TemporaryDirectory() as run_dir:
+        runs = []
+        for chunk in _complete_cases(_with_case_ids(chunks, case_id_key, skipped), case_id_key):
+            cases = chunk[case_id_key].to_numpy()
+            starts = np.flatnonzero(np.concatenate(([True], cases[1:] != cases[:-1])))
+            ends = np.append(starts[1:], len(cases))
+            events += len(cases)
+
+            # Aktivitätscodes: pro Block faktorisieren, dann auf die globalen Codes abbilden
+            local_codes, uniques = pd.factorize(chunk[activity_key])
+            mapping = np.array([activity_codes.setdefault(name, len(activity_codes)) for name in uniques], dtype=np.uint32)
+            activity_names.extend(list(activity_codes)[len(activity_names):])
+            codes = mapping[local_codes]
+
+            # Variante pro Case; neue Varianten werden einmal zu Text verbunden
+            variant_index = np.empty(len(starts), dtype=np.int64)
+            for i, (start, end) in enumerate(zip(starts, ends)):
+                key = codes[start:end].tobytes()
+                index = variant_ids.get(key)
+                if index is None:
+                    index = variant_ids[key] = len(variant_texts)
+                    variant_texts.append(separator.join(activity_names[c] for c in codes[start:end]))
+                    variant_counts.append(0)
+                variant_counts[index] += 1
+                variant_index[i] = index
+
+            frame = pd.DataFrame({
+                CASE_COLUMN: cases[starts],
+                ACTIVITIES_COLUMN: np.array(variant_texts, dtype=object)[variant_index]
+            }, index=np.arange(written, written + len(starts)))
+            if durations:
+                timestamps = pd.to_datetime(chunk[timestamp_key], utc=True).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+                frame[DURATION_COLUMN] = (np.maximum.reduceat(timestamps, starts) - np.minimum.reduceat(timestamps, starts)) / 1e9
+
+            if sort_cases:
+                runs.append(_write_run(frame, os.path.join(run_dir, f"{len(runs)}.pkl")))
+            else:
+                frame.to_csv(out, header=written == 0)
+            written += len(starts)
+
+        if sort_cases and runs:
+            _merge_runs(runs, out, chunk_size)
+        elif not written:
+            pd.DataFrame(columns=[CASE_COLUMN, ACTIVITIES_COLUMN]).to_csv(out)
+
+    if variants_path is not None:
+        pd.DataFrame({
+            "Variant": np.arange(len(variant_texts)),
+            ACTIVITIES_COLUMN: variant_texts,
+            "Cases": variant_counts
+        }).sort_values("Cases", ascending=False, kind="stable").to_csv(variants_path, index=False)
+
+    return {"cases": written, "events": events, "variants": len(variant_texts),
+            "events_without_case_id": skipped["events"]}
+
+# Block nach Case ID sortiert als Lauf ablegen (Stücke von RUN_PIECE_ROWS Zeilen); liefert (Pfad, Spalten)
+def _write_run(frame, path):
+    frame = frame.sort_values(CASE_COLUMN, kind="stable")
+    with open(path, "wb") as f:
+        for start in range(0, len(frame), RUN_PIECE_ROWS):
+            rows = list(frame.iloc[start:start + RUN_PIECE_ROWS].itertuples(index=False, name=None))
+            pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path, list(frame.columns)
+
+# Zeilen eines Laufs Stück für Stück lesen
+def _read_run(path):
+    with open(path, "rb") as f:
+        while True:
+            try:
+                rows = pickle.load(f)
+            except EOFError:
+                return
+            yield from rows
+
+# Sortierte Läufe zusammenführen und blockweise schreiben; gleiche Case IDs behalten die Reihenfolge der Läufe
+def _merge_runs(runs, out, chunk_size):
+    import pandas as pd
+    columns = runs[0][1]
+    merged = heapq.merge(*(_read_run(path) for path, _ in runs), key=lambda row: row[0])
+    written = 0
+    while True:
+        rows = [row for _, row in zip(range(chunk_size), merged)]
+        if not rows:
+            return
+        pd.DataFrame(rows, columns=columns, index=np.arange(written, written + len(rows))).to_csv(
+            out, header=written == 0)
+        written += len(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Aktivitätsfolge pro Case als CSV (blockweise, ohne EventLog)")
+    parser.add_argument("log", help="XES-Pfad oder Parquet-Datei")
+    parser.add_argument("output", help="CSV-Ausgabedatei")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Events pro Block")
+    parser.add_argument("--durations", action="store_true", help="Dauer pro Case in Sekunden")
+    parser.add_argument("--variants", help="Zusätzliche CSV mit Varianten und ihrer Häufigkeit")
+    parser.add_argument("--sort", action="store_true", help="Nach Case ID sortieren (wie groupby)")
+    args = parser.parse_args()
+
+    summary = summarize_cases(args.log, args.output, chunk_size=args.chunk_size, durations=args.durations,
+                              variants_path=args.variants, sort_cases=args.sort)
+    print(f"{summary['cases']} Cases, {summary['events']} Events, {summary['variants']} Varianten gespeichert in: {args.output}")
+    if summary["events_without_case_id"]:
+        print(f"⚠️  {summary['events_without_case_id']} Events ohne Case ID übersprungen")
+
+if __name__ == "__main__":
+    main()
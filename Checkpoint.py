@@ -0,0 +1,53 @@
+import os
+import json
+import hashlib
+from LogCache import as_log, file_hash
+from ModelCache import log_fingerprint
+from ReferenceProfile import get_variant_counts
+
+# Checkpoint-Datei (JSONL) für Sweeps: jedes Ergebnis wird sofort nach der Berechnung angehängt.
+# Schlüssel eines Jobs ist der Inhalts-Hash des anonymisierten Logs zusammen mit den
+# Evaluierungseinstellungen und dem Fingerprint des Original-Logs. Bei einem erneuten Lauf werden
+# bereits berechnete Jobs übersprungen; neue oder geänderte Logs erhalten einen neuen Schlüssel.
+# Für Logs im Speicher (ohne Datei) tritt der Fingerprint der Varianten-Multimenge an die Stelle des Datei-Hashes.
+
+def job_key(job, reference_fingerprint):
+    # Ein mitgegebenes oder über die gemeinsame Abstraktion entdecktes Modell ist durch Log und Threshold
+    # bestimmt und gehört nicht in den Schlüssel
+    settings = {key: value for key, value in job.items() if key not in ("log_path", "model", "log", "share_abstraction")}
+    if "log" in job:
+        log_id = "variants:" + log_fingerprint(get_variant_counts(as_log(job["log"])))
+    else:
+        log_id = file_hash(job["log_path"])
+    payload = {
+        "log": log_id,
+        "reference": reference_fingerprint,
+        "settings": settings
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+# Bereits berechnete Ergebnisse lesen; eine beim Abbruch halb geschriebene letzte Zeile wird ignoriert
+def load_checkpoint(path):
+    done = {}
+    if not os.path.exists(path):
+        return done
+    line = ""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            done[record["key"]] = record["result"]
+
+    # Halbe Zeile abschließen, damit neue Ergebnisse in einer eigenen Zeile beginnen
+    if line and not line.endswith("\n"):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n")
+    return done
+
+def append_result(path, key, result):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"key": key, "result": result}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
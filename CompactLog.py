@@ -0,0 +1,211 @@
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from xml.sax.saxutils import quoteattr
+import numpy as np
+from XesStream import iter_traces
+
+# Kompakte Log-Darstellung für Discovery und Replay (CSR-Form).
+# Aktivitäten sind kleine Integer-Codes in einem flachen NumPy-Array (uint8/uint16/uint32, je nach Anzahl
+# der Aktivitäten), die Traces liegen über case_offsets darin: Case i umfasst codes[offsets[i]:offsets[i + 1]].
+# Varianten sind beim Aufbau dedupliziert (variant_offsets/variant_codes, variant_counts, Variante pro Case).
+# Pro Event bleiben 1-4 Byte (plus 8 Byte mit Zeitstempeln) statt einiger hundert Byte für ein pm4py-Event.
+# Weitere Event-Attribute (Ressourcen, Kosten, ...) werden nicht übernommen.
+#
+# Ein CompactLog ist ein Dict mit "format": "compact"; Evaluation, ModelCache, Checkpoint, Prescreen und
+# ReferenceProfile nehmen es direkt an (Varianten ohne EventLog), as_event_log wandelt bei Bedarf um.
+
+FORMAT = "compact"
+
+def is_compact(log):
+    return isinstance(log, dict) and log.get("format") == FORMAT
+
+def _code_dtype(n_activities):
+    return np.min_scalar_type(max(0, n_activities - 1))
+
+# Varianten deduplizieren: pro Case der Index seiner Variante, die Varianten selbst wieder in CSR-Form
+def _build(activities, codes, offsets, case_ids, timestamps, activity_key):
+    variant_ids = {}
+    variant_index = np.empty(len(offsets) - 1, dtype=np.int32)
+    variant_counts = []
+    variant_offsets = [0]
+    variant_codes = []
+    for i, (start, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+        trace = codes[start:end]
+        key = trace.tobytes()
+        index = variant_ids.get(key)
+        if index is None:
+            index = variant_ids[key] = len(variant_counts)
+            variant_counts.append(0)
+            variant_codes.append(trace)
+            variant_offsets.append(variant_offsets[-1] + len(trace))
+        variant_counts[index] += 1
+        variant_index[i] = index
+
+    return {
+        "format": FORMAT,
+        "activity_key": activity_key,
+        "activities": list(activities),
+        "codes": codes,
+        "offsets": offsets,
+        "case_ids": list(case_ids),
+        "timestamps": timestamps,
+        "variant_index": variant_index,
+        "variant_offsets": np.array(variant_offsets, dtype=np.int64),
+        "variant_codes": np.concatenate(variant_codes) if variant_codes else codes[:0],
+        "variant_counts": np.array(variant_counts, dtype=np.int64)
+    }
+
+# Aus einem DataFrame (Spalten wie pm4py.convert_to_dataframe); Events werden pro Case nach Zeit sortiert.
+# Mit sort_by_timestamp=False bleibt die Reihenfolge der Zeilen erhalten (Log-Reihenfolge wie beim EventLog).
+def from_dataframe(df, activity_key="concept:name", case_id_key="case:concept:name",
+                   timestamp_key="time:timestamp", keep_timestamps=False, sort_by_timestamp=True):
+    import pandas as pd
+    case_codes, case_ids = pd.factorize(df[case_id_key])
+    activity_codes, activities = pd.factorize(df[activity_key])
+    timestamps = None
+    if timestamp_key in df.columns:
+        timestamps = pd.to_datetime(df[timestamp_key], utc=True).values.astype("datetime64[ns]").astype(np.int64)
+    if sort_by_timestamp and timestamps is not None:
+        order = np.lexsort((timestamps, case_codes))
+    else:
+        order = np.argsort(case_codes, kind="stable")
+
+    codes = activity_codes[order].astype(_code_dtype(len(activities)))
+    offsets = np.concatenate(([0], np.cumsum(np.bincount(case_codes, minlength=len(case_ids))))).astype(np.int64)
+    if keep_timestamps and timestamps is not None:
+        timestamps = timestamps[order]
+    else:
+        timestamps = None
+    return _build(activities, codes, offsets, case_ids, timestamps, activity_key)
+
+def from_event_log(log, activity_key="concept:name", keep_timestamps=False):
+    import pm4py
+    return from_dataframe(pm4py.convert_to_dataframe(log), activity_key=activity_key, keep_timestamps=keep_timestamps,
+                          sort_by_timestamp=False)
+
+def _parse_timestamp(value):
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1_000_000) * 1000
+
+# XES streamend einlesen, ohne EventLog: es liegt immer nur ein Trace als XML im Speicher
+def read_xes(path, activity_key="concept:name", timestamp_key="time:timestamp", keep_timestamps=False):
+    activity_codes = {}
+    codes = array("I")
+    lengths = array("q")
+    timestamps = array("q")
+    case_ids = []
+    for trace in iter_traces(path):
+        case_id = None
+        length = 0
+        for child in trace:
+            if child.tag != "event":
+                if child.get("key") == "concept:name":
+                    case_id = child.get("value")
+                continue
+            activity = None
+            timestamp = 0
+            for attribute in child:
+                key = attribute.get("key")
+                if key == activity_key:
+                    activity = attribute.get("value")
+                elif keep_timestamps and key == timestamp_key:
+                    timestamp = _parse_timestamp(attribute.get("value"))
+            if activity is None:
+                continue
+            codes.append(activity_codes.setdefault(activity, len(activity_codes)))
+            if keep_timestamps:
+                timestamps.append(timestamp)
+            length += 1
+        case_ids.append(case_id if case_id is not None else str(len(case_ids)))
+        lengths.append(length)
+
+    activities = list(activity_codes)
+    offsets = np.concatenate(([0], np.cumsum(np.frombuffer(lengths, dtype=np.int64)))).astype(np.int64)
+    encoded = np.frombuffer(codes, dtype=np.uint32).astype(_code_dtype(len(activities)))
+    return _build(activities, encoded, offsets, case_ids,
+                  np.frombuffer(timestamps, dtype=np.int64).copy() if keep_timestamps else None, activity_key)
+
+# DataFrame mit Case-ID, Aktivität (kategorisch) und, falls vorhanden, Zeitstempel
+def to_dataframe(log, case_id_key="case:concept:name", timestamp_key="time:timestamp"):
+    import pandas as pd
+    lengths = np.diff(log["offsets"])
+    columns = {
+        case_id_key: np.repeat(np.asarray(log["case_ids"], dtype=object), lengths),
+        log["activity_key"]: pd.Categorical.from_codes(log["codes"].astype(np.int64), log["activities"])
+    }
+    if log["timestamps"] is not None:
+        columns[timestamp_key] = pd.to_datetime(log["timestamps"], utc=True)
+    return pd.DataFrame(columns)
+
+def to_event_log(log):
+    import pm4py
+    df = to_dataframe(log)
+    df[log["activity_key"]] = df[log["activity_key"]].astype(str)
+    return pm4py.convert_to_event_log(df)
+
+# XES streamend schreiben (Case-ID, Aktivität und ggf. Zeitstempel pro Event)
+def write_xes(log, path):
+    activities = [quoteattr(activity) for activity in log["activities"]]
+    timestamps = log["timestamps"]
+    with open(path, "w", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        out.write('<log xes.version="1.0" xmlns="http://www.xes-standard.org/">\n')
+        out.write('\t<extension name="Concept" prefix="concept" uri="http://www.xes-standard.org/concept.xesext"/>\n')
+        out.write('\t<extension name="Time" prefix="time" uri="http://www.xes-standard.org/time.xesext"/>\n')
+        for case_id, start, end in zip(log["case_ids"], log["offsets"][:-1], log["offsets"][1:]):
+            out.write(f'\t<trace>\n\t\t<string key="concept:name" value={quoteattr(str(case_id))}/>\n')
+            for i in range(start, end):
+                out.write(f'\t\t<event>\n\t\t\t<string key="{log["activity_key"]}" value={activities[log["codes"][i]]}/>\n')
+                if timestamps is not None:
+                    moment = datetime.fromtimestamp(timestamps[i] / 1e9, tz=timezone.utc)
+                    out.write(f'\t\t\t<date key="time:timestamp" value="{moment.isoformat()}"/>\n')
+                out.write('\t\t</event>\n')
+            out.write('\t</trace>\n')
+        out.write('</log>\n')
+
+# Varianten (Aktivitätsfolgen) mit Häufigkeit, direkt aus der Deduplizierung
+def variant_counts(log):
+    activities = log["activities"]
+    offsets = log["variant_offsets"]
+    codes = log["variant_codes"]
+    return Counter({
+        tuple(activities[c] for c in codes[start:end]): int(count)
+        for start, end, count in zip(offsets[:-1], offsets[1:], log["variant_counts"])
+    })
+
+# Kodierte Spalten wie DFGToPetri.encode_dataframe (für die DFG-Discovery)
+def to_encoded(log):
+    codes = log["codes"]
+    starts = log["offsets"][:-1]
+    ends = log["offsets"][1:]
+    non_empty = ends > starts
+    case_start = np.zeros(len(codes), dtype=bool)
+    case_end = np.zeros(len(codes), dtype=bool)
+    case_start[starts[non_empty]] = True
+    case_end[ends[non_empty] - 1] = True
+    return {
+        "activities": log["activities"],
+        "codes": codes,
+        "same_case": ~case_start[1:],
+        "case_start": case_start,
+        "case_end": case_end
+    }
+
+# Aktivitätsfolge pro Case als Text (z. B. für beispiellog.csv); jede Variante wird nur einmal verbunden
+def case_activities(log, separator=" → "):
+    import pandas as pd
+    activities = log["activities"]
+    offsets = log["variant_offsets"]
+    codes = log["variant_codes"]
+    variant_texts = np.array([
+        separator.join(activities[c] for c in codes[start:end])
+        for start, end in zip(offsets[:-1], offsets[1:])
+    ], dtype=object)
+    return pd.DataFrame({"Case ID": log["case_ids"], "Activities": variant_texts[log["variant_index"]]})
+
+# Speicherbedarf der Arrays in Byte (ohne Case-IDs und Aktivitätsnamen)
+def memory_bytes(log):
+    return sum(value.nbytes for value in log.values() if isinstance(value, np.ndarray))
@@ -1,10 +1,16 @@
-import json
-import matplotlib.pyplot as plt
 import numpy as np
+from Rendering import pyplot, show_or_save
+from ResultStore import import_json, open_store, query_matrix, source_for
 
-# JSON-Datei laden
-with open("DFG_to_Petri_Gesamt.json", "r") as f:
-    data = json.load(f)
+# Ergebnisse von DFGToPetri.py (Batch-Modus) aus dem Ergebnisspeicher lesen
+json_path = "DFG_to_Petri_Gesamt.json"
+
+# Noise Threshold, dessen Ergebnisse dargestellt werden (Einträge ohne Threshold gelten für jeden Wert)
+threshold = 0.2
+
+# Eine ältere oder von Hand ergänzte JSON-Datei wird beim ersten Lesen übernommen
+store = open_store()
+import_json(store, json_path, threshold=threshold)
 
 # Gruppierung der Daten nach Logs und Typen
 logs = ['Spaghetti', 'Lasagne', 'Klein']
@@ -18,21 +24,20 @@ colors = {
     'f1_score': '#9ecae1'     # noch helleres Blau
 }
 
-# Plot vorbereiten
+# Plot vorbereiten (im Batch-Modus ohne Fenster, siehe Rendering.py)
+plt = pyplot()
 fig, ax = plt.subplots(figsize=(12, 6))
 bar_width = 0.2
 x = np.arange(len(logs) * len(types))
 
-# Werte sammeln
-values = {'fitness': [], 'precision': [], 'f1_score': []}
-x_labels = []
-
-for log in logs:
-    for typ in types:
-        entry = next(item for item in data if item['name'] == log and item['typ'] == typ)
-        for metric in metrics:
-            values[metric].append(entry[metric])
-        x_labels.append(f"{log}\n{typ}")
+# Werte sammeln: pro Metrik eine Matrix (Log x Typ), zeilenweise in Balkenreihenfolge
+values = {}
+for metric in metrics:
+    _, _, matrix = query_matrix(store, "log", "fitness_type", metric, rows=logs, columns=types,
+                                source=source_for(json_path), threshold=threshold)
+    values[metric] = matrix.ravel()
+store.close()
+x_labels = [f"{log}\n{typ}" for log in logs for typ in types]
 
 # Balken zeichnen + Wertebeschriftung
 offsets = {'fitness': -bar_width, 'precision': 0, 'f1_score': bar_width}
@@ -41,6 +46,11 @@ for metric in metrics:
     # Werte über Balken anzeigen
     for bar in bars:
         height = bar.get_height()
+        # Fehlende Ergebnisse (NaN, von query_matrix gemeldet) werden als "n/a" auf der Grundlinie markiert
+        if np.isnan(height):
+            ax.annotate("n/a", xy=(bar.get_x() + bar.get_width() / 2, 0), xytext=(0, 3),
+                        textcoords="offset points", ha='center', va='bottom', fontsize=8)
+            continue
         ax.annotate(f"{height:.2f}",
                     xy=(bar.get_x() + bar.get_width() / 2, height),
                     xytext=(0, 3),  # vertikaler Abstand
@@ -54,4 +64,6 @@ ax.set_ylabel("Score")
 ax.set_title("Fitness, Precision und F1-Score je Log und Fit-Typ")
 ax.legend(title="Metrik")
 plt.tight_layout()
-plt.show()
+plot_path = show_or_save("DFG_to_Petri_Gesamt.png")
+if plot_path:
+    print(f"Plot gespeichert unter: {plot_path}")
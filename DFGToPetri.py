@@ -1,62 +1,172 @@
 import os
 import json
-import pm4py
-import matplotlib.pyplot as plt
-import pm4py.algo.filtering
-import pm4py.algo.filtering.dfg
-import pm4py.algo.filtering.dfg.dfg_filtering
-from pm4py.objects.log.importer.xes import importer as xes_importer
+import numpy as np
+from Rendering import figure_request, render_figures, render_petri_net
+from ResultStore import import_json, open_store
 
+# DFG -> Petri-Netz auf den kodierten Event-Spalten des Logs (CompactLog oder DataFrame).
+# Directly-Follows-Häufigkeiten, Start-/Endaktivitäten und der Rauschfilter werden mit NumPy auf
+# nach Case sortierten, ganzzahlig kodierten Spalten (Events in Log-Reihenfolge) berechnet, ohne EventLog-Objekte.
 
-log_dir = "Klein"
-original_log_path = os.path.join(log_dir, "20250414_klein_event_log.xes")
-original_log = xes_importer.apply(original_log_path)
+# Aktivitäten und Cases als Integer-Codes, stabil nach Case sortiert. Innerhalb eines Cases bleibt die
+# Reihenfolge der Zeilen (Log-Reihenfolge) wie bei CompactLog.to_encoded, sodass beide Wege für denselben
+# Log dasselbe Modell (und denselben Eintrag im Modell-Cache) liefern. Mit sort_by_timestamp=True wird
+# wie bei pm4py.discover_dfg auf DataFrames innerhalb eines Cases nach Zeitstempel sortiert.
+def encode_dataframe(df, activity_key="concept:name", case_id_key="case:concept:name",
+                     timestamp_key="time:timestamp", sort_by_timestamp=False):
+    import pandas as pd
+    case_codes, _ = pd.factorize(df[case_id_key])
+    activity_codes, activities = pd.factorize(df[activity_key])
+    if sort_by_timestamp and timestamp_key in df.columns:
+        timestamps = df[timestamp_key].values.astype("datetime64[ns]").astype(np.int64)
+        order = np.lexsort((timestamps, case_codes))
+    else:
+        order = np.argsort(case_codes, kind="stable")
 
-dfg = pm4py.discover_dfg(original_log)
+    case_codes = case_codes[order]
+    codes = activity_codes[order]
+    # Erstes bzw. letztes Event jedes Cases
+    same_case = case_codes[1:] == case_codes[:-1]
+    case_start = np.concatenate(([True], ~same_case)) if len(codes) else np.zeros(0, dtype=bool)
+    case_end = np.concatenate((~same_case, [True])) if len(codes) else np.zeros(0, dtype=bool)
+    return {
+        "activities": list(activities),
+        "codes": codes,
+        "same_case": same_case,
+        "case_start": case_start,
+        "case_end": case_end
+    }
 
-activities = set()
-for (src, tgt) in dfg[0].keys():
-    activities.add(src)
-    activities.add(tgt)
+# Directly-Follows-Kanten als Arrays (Quelle, Ziel, Häufigkeit) sowie Start-/Endhäufigkeiten pro Aktivität
+def dfg_from_encoded(encoded):
+    codes = encoded["codes"]
+    n_activities = len(encoded["activities"])
+    pairs = codes[:-1][encoded["same_case"]].astype(np.int64) * n_activities + codes[1:][encoded["same_case"]]
+    unique_pairs, frequencies = np.unique(pairs, return_counts=True)
+    return {
+        "activities": encoded["activities"],
+        "source": unique_pairs // n_activities if n_activities else unique_pairs,
+        "target": unique_pairs % n_activities if n_activities else unique_pairs,
+        "frequency": frequencies,
+        "start": np.bincount(codes[encoded["case_start"]], minlength=n_activities),
+        "end": np.bincount(codes[encoded["case_end"]], minlength=n_activities)
+    }
 
-print(activities)
+# Rauschfilter wie pm4py clean_dfg_based_on_noise_thresh: eine Kante fällt weg, wenn ihre Häufigkeit
+# kleiner ist als threshold * (maximale Kantenhäufigkeit an Quelle bzw. Ziel), jeweils das Minimum
+def filter_dfg_noise(dfg, noise_threshold):
+    source, target, frequency = dfg["source"], dfg["target"], dfg["frequency"]
+    activity_max = np.zeros(len(dfg["activities"]), dtype=np.int64)
+    np.maximum.at(activity_max, source, frequency)
+    np.maximum.at(activity_max, target, frequency)
+    limit = np.minimum(activity_max[source] * noise_threshold, activity_max[target] * noise_threshold)
+    keep = ~(frequency < limit)
+    return dict(dfg, source=source[keep], target=target[keep], frequency=frequency[keep])
 
-dfg_filtered = pm4py.algo.filtering.dfg.dfg_filtering.clean_dfg_based_on_noise_thresh(dfg[0], activities, 0.2)
+# Arrays in die Dictionaries umwandeln, die pm4py für die Konvertierung erwartet
+def to_dfg_dicts(dfg):
+    activities = dfg["activities"]
+    graph = {
+        (activities[s], activities[t]): int(f)
+        for s, t, f in zip(dfg["source"], dfg["target"], dfg["frequency"])
+    }
+    start_activities = {activities[i]: int(c) for i, c in enumerate(dfg["start"]) if c > 0}
+    end_activities = {activities[i]: int(c) for i, c in enumerate(dfg["end"]) if c > 0}
+    return graph, start_activities, end_activities
 
-#Hier ist die angepasste Zeile mit Start-/End-Activities
-net, im, fm = pm4py.objects.conversion.dfg.variants.to_petri_net_invisibles_no_duplicates.apply(
-    dfg_filtered,
-    parameters={
-        "start_activities": dfg[1],
-        "end_activities": dfg[2]
+def discover_petri_net_from_dfg(encoded, noise_threshold):
+    from pm4py.objects.conversion.dfg.variants import to_petri_net_invisibles_no_duplicates
+    dfg_filtered, start_activities, end_activities = to_dfg_dicts(
+        filter_dfg_noise(dfg_from_encoded(encoded), noise_threshold)
+    )
+    return to_petri_net_invisibles_no_duplicates.apply(
+        dfg_filtered,
+        parameters={
+            "start_activities": start_activities,
+            "end_activities": end_activities
+        }
+    )
 
-    }
-)
-pm4py.view_petri_net(net,im,fm)
+# Alle Logs x Thresholds auswerten; Ergebnisse in der Reihenfolge der Logs und Thresholds,
+# dazu die Modelle pro (Log, Threshold).
+# Jeder Log wird gegen sich selbst bewertet: alle Jobs (algorithm "dfg", eine Fitness-Auswertung pro Typ)
+# laufen gemeinsam in einem Pool (Evaluation.run_jobs), jeder mit dem Referenzprofil seines Logs
+# (Memory-Map, MappedLog.py). Die Modelle kommen mit den Ergebnissen aus den Workern zurück.
+# approximate: Optionen der approximativen Evaluierung (ApproximateEvaluation.py), None = exakt
+def run_batch(logs, thresholds, fitness_types, fitness_method="token_based", workers=None, approximate=None):
+    from concurrent.futures import ProcessPoolExecutor
+    from Evaluation import make_job, run_jobs
+    from MappedLog import map_log
+    if workers is None:
+        workers = os.cpu_count() or 1
 
+    # Logs parallel parsen und abbilden, danach lesen alle Worker die Memory-Maps
+    paths = list(logs.values())
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+            references = list(executor.map(map_log, paths))
+    else:
+        references = [map_log(path) for path in paths]
+
+    evaluations = [{"fitness_method": fitness_method, "fitness_type": fitness_type} for fitness_type in fitness_types]
+    jobs = [
+        make_job(log_path, threshold, meta={"name": name}, algorithm="dfg", evaluations=evaluations,
+                 approximate=approximate, reference=reference, return_model=True)
+        for (name, log_path), reference in zip(logs.items(), references)
+        for threshold in thresholds
+    ]
+
+    results = []
+    models = {}
+    for job, records in zip(jobs, run_jobs(None, jobs, workers=workers)):
+        for record in records:
+            models[(job["meta"]["name"], job["threshold"])] = record.pop("model")
+            result = {"name": record.pop("name"), "typ": record.pop("fitness_type"), "threshold": job["threshold"]}
+            del record["fitness_method"]
+            result.update(record)
+            results.append(result)
+    return results, models
+
+def main():
+    # Alle Logs, Thresholds und Fitness-Typen in einem Lauf; das Ergebnis liest DFGMatplot.py direkt
+    logs = {
+        "Spaghetti": "20250414_spaghetti_event_log_v2_modified.xes",
+        "Lasagne": os.path.join("Lasagne", "20250413_lasagna_event_log_modified.xes"),
+        "Klein": os.path.join("Klein", "20250414_klein_event_log.xes")
+    }
+    thresholds = [0.2]
+    fitness_types = ["log_fitness", "percentage_of_fitting_traces"]
+    # Anzahl paralleler Worker (None = alle CPU-Kerne)
+    workers = None
+    # Approximative Evaluierung mit Konfidenzintervallen für sehr große Logs, z. B. {"tolerance": 0.02};
+    # None wertet alle Varianten exakt aus
+    approximate = None
 
-# Berechne Precision und Fitness (über Alignments)
-precision = pm4py.precision_token_based_replay(original_log, net, im, fm)
-fitness_result = pm4py.fitness_token_based_replay(original_log, net, im, fm)
-# hier ggfs. auswählen, welche fitness verwendet werden soll
-fitness = fitness_result["percentage_of_fitting_traces"] / 100.0  
-#fitness = fitness_result["log_fitness"]
+    # Petri-Netze werden nach der Evaluierung als SVG gespeichert
+    petri_dir = "DFG_to_Petri_Netze"
 
-# F1-Score berechnen
-f1_score = 2 * (fitness * precision) / (fitness + precision) if (fitness + precision) > 0 else 0
+    results, models = run_batch(logs, thresholds, fitness_types, workers=workers, approximate=approximate)
+    for r in results:
+        print(f"{r['name']} ({r['typ']}, Threshold {r['threshold']}): "
+              f"Fitness: {r['fitness']:.4f}, Precision: {r['precision']:.4f}, F1: {r['f1_score']:.4f}")
 
-# JSON-Daten vorbereiten
+    # In Datei speichern
+    json_path = "DFG_to_Petri_Gesamt.json"
+    with open(json_path, "w") as f:
+        json.dump(results, f, indent=4)
+    store = open_store()
+    import_json(store, json_path)
+    store.close()
 
-metrics_output = {
-    "name": "Spaghetti",
-    "typ":"percentage_of_fitting_traces",
-    "fitness": fitness,
-    "precision": precision,
-    "f1_score": f1_score
-}
+    os.makedirs(petri_dir, exist_ok=True)
+    figures = [
+        figure_request(render_petri_net, os.path.join(petri_dir, f"{name}_{threshold}.svg"), *model)
+        for (name, threshold), model in models.items()
+    ]
+    render_figures(figures, workers=workers)
 
-# In Datei speichern
-with open("Spaghetti_DFG_to_Petri.json", "w") as f:
-    json.dump(metrics_output, f, indent=4)
+    print(f"\nMetriken gespeichert in: {json_path}")
+    print(f"Petri-Netze gespeichert in: {petri_dir}")
 
-print("\nMetriken gespeichert")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import sys
+import json
+import argparse
+from contextlib import redirect_stdout
+from Evaluation import FITNESS_METHODS, FITNESS_TYPES, make_job, run_jobs
+
+# Schlanker Einstiegspunkt für einzelne Evaluierungen, z. B. aus einer Orchestrierung heraus.
+# Schwere Bibliotheken werden erst in der Stufe importiert, die sie braucht: --help und Argumentfehler
+# kommen ohne pm4py, pandas und NumPy aus, matplotlib wird nur mit --plot geladen.
+#
+# Beispiel: python Evaluate.py Klein/20250414_klein_event_log.xes TLKC_K_Klein/[25].xes --threshold 0.1 0.2
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fitness, Precision und F1-Score anonymisierter Logs gegenüber dem Original-Log")
+    parser.add_argument("original", help="XES-Pfad des Original-Logs")
+    parser.add_argument("anonymized", nargs="+", help="XES-Pfade der anonymisierten Logs")
+    parser.add_argument("--threshold", type=float, nargs="+", default=[0.2], help="IMf Noise Thresholds")
+    parser.add_argument("--fitness-method", choices=FITNESS_METHODS, default="token_based")
+    parser.add_argument("--fitness-type", choices=FITNESS_TYPES, default="percentage_of_fitting_traces")
+    parser.add_argument("--workers", type=int, help="Anzahl paralleler Worker (Standard: alle CPU-Kerne)")
+    parser.add_argument("--approximate", action="store_true",
+                        help="Fitness und Precision aus einer Varianten-Stichprobe schätzen (mit Konfidenzintervallen)")
+    parser.add_argument("--tolerance", type=float, default=0.02,
+                        help="Mit --approximate: maximale Breite der Konfidenzintervalle")
+    parser.add_argument("--top-k", type=int, default=100,
+                        help="Mit --approximate: Anzahl häufigster Varianten, die exakt ausgewertet werden")
+    parser.add_argument("--profile", action="store_true",
+                        help="Zeiten, Speicher, Netzgröße und Varianten pro Stufe im Ergebnis (Feld stages)")
+    parser.add_argument("--profiler", choices=["cprofile", "pyinstrument"],
+                        help="Mit --profile: Profil pro Job in --profile-dir schreiben")
+    parser.add_argument("--profile-dir", default="profiles", help="Zielordner der Profile")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Mit --profile: Peak-Speicher pro Stufe über tracemalloc (langsamer)")
+    parser.add_argument("--checkpoint", help="JSONL-Checkpoint; bereits berechnete Jobs werden übersprungen")
+    parser.add_argument("--output", help="JSON-Ausgabedatei (Standard: stdout)")
+    parser.add_argument("--plot", help="Optional: Plot der Metriken über die Thresholds (PNG, für einen anonymisierten Log)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    approximate = {"tolerance": args.tolerance, "top_k": args.top_k} if args.approximate else None
+    profiling = None
+    if args.profile:
+        profiling = {"profiler": args.profiler, "profile_dir": args.profile_dir, "trace_memory": args.trace_memory}
+    jobs = [
+        make_job(path, threshold, meta={"log": path, "threshold": threshold},
+                 fitness_method=args.fitness_method, fitness_type=args.fitness_type, approximate=approximate,
+                 profiling=profiling)
+        for path in args.anonymized
+        for threshold in args.threshold
+    ]
+
+    # Ohne --output gehört stdout allein dem JSON-Ergebnis, Statusmeldungen gehen nach stderr
+    with redirect_stdout(sys.stderr if args.output is None else sys.stdout):
+        # Original-Log als Memory-Map (MappedLog.py): die Worker lesen Log und Referenzprofil aus dem Page-Cache
+        from MappedLog import map_log, open_mapped_log, open_mapped_profile
+        directory = map_log(args.original)
+        results = run_jobs(open_mapped_log(directory), jobs, workers=args.workers, checkpoint=args.checkpoint,
+                           profile=open_mapped_profile(directory))
+        if args.profile:
+            from Profiling import print_stage_report
+            print_stage_report(results)
+
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=4)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+    if args.plot:
+        from Rendering import figure_request, render_figures
+        from UtilityFunctionNachThreshold import plot_results
+        render_figures([figure_request(plot_results, args.plot, results)], workers=1)
+
+if __name__ == "__main__":
+    main()
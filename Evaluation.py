@@ -0,0 +1,413 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from LogCache import as_event_log, as_log, load_log
+from Profiling import log_size, net_size, profile_job, profile_name, profiling_options, stage
+
+# Gemeinsame Evaluierung (Discovery, Precision, Fitness, F1) für alle Benchmark-Skripte.
+# Module mit NumPy (Replay, Referenzprofil, CompactLog, Modell-Cache, Checkpoint) werden erst in den Funktionen
+# importiert, sodass "import Evaluation" und damit Evaluate.py --help ohne NumPy auskommen.
+
+FITNESS_METHODS = ["token_based", "alignments", "alignments_bounded"]
+FITNESS_TYPES = ["percentage_of_fitting_traces", "log_fitness"]
+# "inductive": IMf mit noise_threshold; "dfg": DFG mit Rauschfilter -> Petri-Netz (DFGToPetri.py)
+DISCOVERY_ALGORITHMS = ["inductive", "dfg"]
+DISCOVERY_KEYS = {
+    "activity_key": "concept:name",
+    "timestamp_key": "time:timestamp",
+    "case_id_key": "concept:name"
+}
+
+# Zustand eines Worker-Prozesses: das Referenzprofil des Original-Logs wird nur einmal pro Prozess übergeben
+_worker_state = {}
+
+# Prozessmodell mit dem Inductive Miner (IMf) bzw. über den gefilterten DFG entdecken;
+# identische Logs werden aus dem Modell-Cache bedient.
+# Mit share_abstraction nutzt der Inductive Miner die Log-Abstraktion, die dieser Prozess für den Log hält
+# (ThresholdSweep.shared_abstraction): Schnitte und Netze gleicher Prozessbäume aus früheren Thresholds
+# werden übernommen.
+def discover_model(log, threshold, algorithm="inductive", share_abstraction=False):
+    import pm4py
+    from CompactLog import is_compact, to_encoded
+    from ModelCache import discover_cached
+    from ReferenceProfile import get_variant_counts
+    from ThresholdSweep import (build_abstraction_from_variants, discover_from_abstraction, discover_shared,
+                                shared_abstraction)
+    if algorithm == "inductive" and share_abstraction:
+        abstraction = shared_abstraction(get_variant_counts(log, DISCOVERY_KEYS["activity_key"]),
+                                         DISCOVERY_KEYS["activity_key"])
+        return discover_cached(None, threshold, lambda: discover_shared(abstraction, threshold)[0], DISCOVERY_KEYS,
+                               variant_counts=abstraction["variant_counts"])
+    if algorithm == "inductive" and is_compact(log):
+        # Inductive Miner direkt auf den Varianten (UVCL) des CompactLog
+        discover = lambda: discover_from_abstraction(build_abstraction_from_variants(get_variant_counts(log)), threshold)
+    elif algorithm == "inductive":
+        discover = lambda: pm4py.discover_petri_net_inductive(log, noise_threshold=threshold, **DISCOVERY_KEYS)
+    elif algorithm == "dfg":
+        from DFGToPetri import discover_petri_net_from_dfg, encode_dataframe
+        discover = lambda: discover_petri_net_from_dfg(
+            to_encoded(log) if is_compact(log) else encode_dataframe(pm4py.convert_to_dataframe(log)), threshold
+        )
+    else:
+        raise ValueError(f"Unbekannter Discovery-Algorithmus '{algorithm}'")
+    return discover_cached(log, threshold, discover, DISCOVERY_KEYS, algorithm)
+
+# Fitness-Replay mit der gewählten Methode (Token-based Replay oder Alignments) auf dem Referenzprofil.
+# "alignments_bounded" nimmt in fitness_options die Budgets max_time_per_variant und max_total_time (Sekunden).
+def compute_fitness(profile, net, im, fm, fitness_method="token_based", fitness_options=None):
+    from ReferenceProfile import fitness_from_profile
+    if fitness_method == "alignments_bounded":
+        from BoundedAlignments import bounded_alignment_fitness
+        return bounded_alignment_fitness(profile, net, im, fm, **(fitness_options or {}))
+    return fitness_from_profile(profile, net, im, fm, fitness_method)
+
+# Fitness-Wert aus dem Replay-Ergebnis lesen (percentage_of_fitting_traces oder log_fitness)
+def extract_fitness(fitness_result, fitness_type="percentage_of_fitting_traces"):
+    if fitness_type == "percentage_of_fitting_traces":
+        return fitness_result["percentage_of_fitting_traces"] / 100.0
+    if fitness_type == "log_fitness":
+        return fitness_result["log_fitness"]
+    raise ValueError(f"Unbekannter Fitness-Typ '{fitness_type}'")
+
+def compute_f1(precision, fitness):
+    return (
+        2 * precision * fitness / (precision + fitness)
+        if (precision + fitness) > 0 else 0
+    )
+
+# Evaluierung für einen anonymisierten Log.
+# Wird ein vorberechnetes Referenzprofil des Original-Logs übergeben, wird original_log nicht mehr benötigt.
+# Mit approximate (Dict mit Optionen, z. B. {"tolerance": 0.02}) werden Fitness und Precision aus einer
+# Varianten-Stichprobe geschätzt und mit Konfidenzintervallen geliefert (ApproximateEvaluation.py).
+# Mit stages (Dict) werden die Stufen gemessen (Profiling.py) und im Ergebnis unter "stages" abgelegt.
+# Mit return_model=True enthält das Ergebnis das bewertete Modell (net, im, fm) unter "model".
+# share_abstraction wird an discover_model weitergegeben.
+def evaluate_for_log(original_log, anonymized_log, threshold,
+                     fitness_method="token_based", fitness_type="percentage_of_fitting_traces",
+                     profile=None, fitness_options=None, model=None, algorithm="inductive", approximate=None,
+                     stages=None, return_model=False, share_abstraction=False):
+    # Erster (verzögerter) Import von pm4py und den Replay-Modulen als eigene Stufe vor der Discovery
+    with stage(stages, "import", pm4py_loaded="pm4py" in sys.modules):
+        import pm4py
+        from ReferenceProfile import build_reference_profile, precision_from_profile
+        from VectorReplay import encode_prefixes, encode_variants
+    if profile is None:
+        profile = build_reference_profile(original_log)
+
+    # Ein bereits entdecktes Modell (z. B. aus ThresholdSweep) wird direkt bewertet
+    with stage(stages, "discovery", algorithm=algorithm, precomputed=model is not None) as record:
+        net, im, fm = model if model is not None else discover_model(anonymized_log, threshold, algorithm,
+                                                                     share_abstraction)
+        record.update(net_size(net))
+
+    if approximate is not None:
+        from ApproximateEvaluation import approximate_metrics
+        with stage(stages, "approximate", variants=len(encode_variants(profile)["counts"])):
+            result = approximate_metrics(profile, net, im, fm, fitness_method, fitness_type, fitness_options,
+                                         **approximate)
+        if stages is not None:
+            result["stages"] = stages
+        if return_model:
+            result["model"] = (net, im, fm)
+        return result
+
+    # Precision & Fitness
+    with stage(stages, "precision", prefixes=len(encode_prefixes(profile)["count"])):
+        precision = precision_from_profile(profile, net, im, fm)
+    with stage(stages, "fitness", fitness_method=fitness_method, variants=len(encode_variants(profile)["counts"])):
+        fitness_result = compute_fitness(profile, net, im, fm, fitness_method, fitness_options)
+    fitness = extract_fitness(fitness_result, fitness_type)
+
+    result = {
+        "fitness": fitness,
+        "precision": precision,
+        "f1_score": compute_f1(precision, fitness)
+    }
+    # Bei begrenzten Alignments: welche Varianten das Budget überschritten haben
+    if "budget_report" in fitness_result:
+        result["alignment_budget"] = fitness_result["budget_report"]
+    if stages is not None:
+        result["stages"] = stages
+    if return_model:
+        result["model"] = (net, im, fm)
+    return result
+
+# Mehrere Fitness-Auswertungen auf einem Modell: Discovery und Precision laufen einmal,
+# der Replay einmal pro Fitness-Methode (und Optionen); jeder Fitness-Typ liest nur aus dem Replay-Ergebnis.
+# evaluations: Liste von Dicts mit fitness_method, fitness_type und optional fitness_options.
+# Mit stages erhält jedes Ergebnis die gemeinsamen Stufen und die Fitness-Stufe seines Replays
+# (Fitness-Typen derselben Methode teilen sich einen Replay und damit dieselbe Messung).
+# Mit return_model=True enthält jedes Ergebnis das bewertete Modell (net, im, fm) unter "model".
+# share_abstraction wird an discover_model weitergegeben.
+def evaluate_many_for_log(anonymized_log, threshold, evaluations, profile, algorithm="inductive", model=None,
+                          approximate=None, stages=None, return_model=False, share_abstraction=False):
+    with stage(stages, "import", pm4py_loaded="pm4py" in sys.modules):
+        import pm4py
+        from ReferenceProfile import precision_from_profile
+        from VectorReplay import encode_prefixes, encode_variants
+    with stage(stages, "discovery", algorithm=algorithm, precomputed=model is not None) as record:
+        net, im, fm = model if model is not None else discover_model(anonymized_log, threshold, algorithm,
+                                                                     share_abstraction)
+        record.update(net_size(net))
+
+    def with_stages(result, name, fitness_stage):
+        if stages is not None:
+            result["stages"] = dict(stages, **{name: fitness_stage[name]})
+        return result
+
+    if approximate is not None:
+        # Die Auswertungen teilen sich die bereits abgespielten Varianten und Präfixe
+        from ApproximateEvaluation import approximate_metrics
+        cache = {}
+        results = []
+        for evaluation in evaluations:
+            fitness_stage = {} if stages is not None else None
+            with stage(fitness_stage, "approximate", variants=len(encode_variants(profile)["counts"])):
+                result = approximate_metrics(profile, net, im, fm, evaluation["fitness_method"],
+                                             evaluation["fitness_type"], evaluation.get("fitness_options"),
+                                             cache=cache, **approximate)
+            results.append(with_stages(
+                dict({"fitness_method": evaluation["fitness_method"], "fitness_type": evaluation["fitness_type"]},
+                     **result),
+                "approximate", fitness_stage
+            ))
+        if return_model:
+            for result in results:
+                result["model"] = (net, im, fm)
+        return results
+    with stage(stages, "precision", prefixes=len(encode_prefixes(profile)["count"])):
+        precision = precision_from_profile(profile, net, im, fm)
+
+    replays = {}
+    replay_stages = {}
+    results = []
+    for evaluation in evaluations:
+        fitness_method = evaluation["fitness_method"]
+        fitness_options = evaluation.get("fitness_options") or {}
+        replay_key = (fitness_method, tuple(sorted(fitness_options.items())))
+        if replay_key not in replays:
+            replay_stages[replay_key] = {} if stages is not None else None
+            with stage(replay_stages[replay_key], "fitness", fitness_method=fitness_method,
+                       variants=len(encode_variants(profile)["counts"])):
+                replays[replay_key] = compute_fitness(profile, net, im, fm, fitness_method, fitness_options)
+        fitness_result = replays[replay_key]
+        fitness = extract_fitness(fitness_result, evaluation["fitness_type"])
+
+        result = {
+            "fitness_method": fitness_method,
+            "fitness_type": evaluation["fitness_type"],
+            "fitness": fitness,
+            "precision": precision,
+            "f1_score": compute_f1(precision, fitness)
+        }
+        if "budget_report" in fitness_result:
+            result["alignment_budget"] = fitness_result["budget_report"]
+        results.append(with_stages(result, "fitness", replay_stages[replay_key]))
+    if return_model:
+        for result in results:
+            result["model"] = (net, im, fm)
+    return results
+
+# Job-Beschreibung für run_jobs: Pfad des anonymisierten Logs, Parameter und Metadaten (z. B. K, L, ε).
+# Statt eines Pfads kann mit log ein Log im Speicher übergeben werden (log_path=None).
+# Mit evaluations liefert der Job eine Liste von Ergebnissen, eines pro Fitness-Auswertung (evaluate_many_for_log).
+# Mit reference (Verzeichnis von MappedLog.map_log) wird der Job gegen dieses Original-Log statt gegen das
+# des Pools bewertet, z. B. mehrere Logs gegen sich selbst in einem Pool.
+# Mit return_model=True enthalten die Ergebnisse das bewertete Modell unter "model" (nicht JSON-tauglich,
+# daher nicht zusammen mit einem Checkpoint).
+# Mit share_abstraction=True teilen sich die Jobs eines Workers für denselben Log die Log-Abstraktion des
+# Inductive Miners (discover_model), z. B. über viele Thresholds.
+def make_job(log_path, threshold, meta=None,
+             fitness_method="token_based", fitness_type="percentage_of_fitting_traces",
+             fitness_options=None, model=None, log=None, algorithm="inductive", evaluations=None,
+             approximate=None, profiling=None, reference=None, return_model=False, share_abstraction=False):
+    job = {
+        "log_path": log_path,
+        "threshold": threshold,
+        "fitness_method": fitness_method,
+        "fitness_type": fitness_type,
+        "fitness_options": fitness_options or {},
+        "meta": meta or {}
+    }
+    # Optional: bereits entdecktes Modell (net, im, fm), dann entfällt die Discovery im Worker
+    if model is not None:
+        job["model"] = model
+    # Optional: anonymisierter Log im Speicher (EventLog, DataFrame oder Event-Stream)
+    if log is not None:
+        job["log"] = log
+    # Nur abweichende Einstellungen aufnehmen, damit bestehende Checkpoint-Schlüssel gültig bleiben
+    if algorithm != "inductive":
+        job["algorithm"] = algorithm
+    if evaluations is not None:
+        job["evaluations"] = evaluations
+    if approximate is not None:
+        job["approximate"] = approximate
+    if reference is not None:
+        job["reference"] = reference
+    if return_model:
+        job["return_model"] = True
+    if share_abstraction:
+        job["share_abstraction"] = True
+    # Optional: Messung pro Stufe und Profil des Jobs (Profiling.py)
+    profiling = profiling_options(profiling)
+    if profiling is not None:
+        job["profiling"] = profiling
+    return job
+
+def _init_worker(profile):
+    _worker_state.clear()
+    _worker_state["profile"] = profile
+    _worker_state["last_log"] = (None, None)
+    _worker_state["references"] = {}
+
+# Referenzprofil eines Jobs: das eigene (reference, pro Worker einmal geöffnet) oder das des Pools
+def _job_profile(job):
+    if "reference" not in job:
+        return _worker_state["profile"]
+    references = _worker_state["references"]
+    if job["reference"] not in references:
+        from MappedLog import open_mapped_profile
+        references[job["reference"]] = open_mapped_profile(job["reference"])
+    return references[job["reference"]]
+
+# Anonymisierten Log laden; aufeinanderfolgende Jobs auf derselben, unveränderten Datei parsen nur einmal
+def _load_job_log(log_path):
+    stat = os.stat(log_path)
+    log_id = (log_path, stat.st_size, stat.st_mtime_ns)
+    last_id, last_log = _worker_state["last_log"]
+    if last_id != log_id:
+        last_log = load_log(log_path, compact=True)
+        _worker_state["last_log"] = (log_id, last_log)
+    return last_log
+
+def _evaluate_job(job):
+    from ModelCache import cache_stats
+    cache_stats.clear()
+    with profile_job(job.get("profiling"), profile_name(job)):
+        result = _run_job(job, {} if "profiling" in job else None)
+    return result, dict(cache_stats)
+
+def _run_job(job, stages):
+    model = job.get("model")
+    anonymized_log = None
+    if model is None:
+        with stage(stages, "load") as record:
+            anonymized_log = as_log(job["log"]) if "log" in job else _load_job_log(job["log_path"])
+            if stages is not None:
+                record.update(log_size(anonymized_log))
+
+    if "evaluations" in job:
+        results = evaluate_many_for_log(anonymized_log, job["threshold"], job["evaluations"],
+                                        _job_profile(job), job.get("algorithm", "inductive"), model,
+                                        job.get("approximate"), stages, job.get("return_model", False),
+                                        job.get("share_abstraction", False))
+        for result in results:
+            result.update(job["meta"])
+        return results
+
+    result = evaluate_for_log(
+        None,
+        anonymized_log,
+        job["threshold"],
+        fitness_method=job["fitness_method"],
+        fitness_type=job["fitness_type"],
+        profile=_job_profile(job),
+        fitness_options=job["fitness_options"],
+        model=model,
+        algorithm=job.get("algorithm", "inductive"),
+        approximate=job.get("approximate"),
+        stages=stages,
+        return_model=job.get("return_model", False),
+        share_abstraction=job.get("share_abstraction", False)
+    )
+    result.update(job["meta"])
+    return result
+
+# Prozess-Pool, dessen Worker das Referenzprofil resident halten (auch vom EvaluationServer genutzt)
+def start_worker_pool(profile, workers):
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(profile,))
+
+# Job im Pool ausführen; das Future liefert (Ergebnis, Statistik des Modell-Caches)
+def submit_job(executor, job):
+    return executor.submit(_evaluate_job, job)
+
+# Ausstehende Jobs ausführen; liefert (Index, Ergebnis) in der Reihenfolge der Fertigstellung
+def _iter_outputs(profile, jobs, indices, workers):
+    if workers == 1:
+        _init_worker(profile)
+        for i in indices:
+            yield i, _evaluate_job(jobs[i])
+        return
+
+    with start_worker_pool(profile, workers) as executor:
+        futures = {submit_job(executor, jobs[i]): i for i in indices}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+# Alle Jobs auf einen Prozess-Pool verteilen. Die Ergebnisse kommen in der Reihenfolge der Jobs
+# zurück, sodass die JSON-Ausgabe unabhängig von der Anzahl der Worker identisch ist.
+# Das Referenzprofil des Original-Logs wird einmal pro Sweep berechnet.
+# Ist stats ein Counter, werden darin die Treffer des Modell-Caches aller Worker gesammelt.
+# Mit checkpoint (Pfad einer JSONL-Datei) wird jedes Ergebnis sofort gesichert und bereits
+# berechnete Jobs werden bei einem erneuten Lauf übersprungen.
+# Ein bereits berechnetes Referenzprofil (profile) wird übernommen, z. B. über mehrere Runden eines Sweeps.
+# Tragen alle Jobs ein eigenes Original-Log (reference in make_job), darf original_log None sein.
+def run_jobs(original_log, jobs, workers=None, stats=None, checkpoint=None, profile=None):
+    from Checkpoint import append_result, job_key, load_checkpoint
+    from ModelCache import log_fingerprint
+    from ReferenceProfile import build_reference_profile, get_variant_counts
+    jobs = list(jobs)
+    results = [None] * len(jobs)
+
+    keys = None
+    if original_log is not None:
+        original_log = as_log(original_log)
+    if checkpoint is not None:
+        # Jobs mit eigenem Original-Log tragen es über reference (Inhalts-Hash im Verzeichnisnamen) im Schlüssel
+        reference_fingerprint = log_fingerprint(get_variant_counts(original_log)) if original_log is not None else None
+        keys = [job_key(job, reference_fingerprint) for job in jobs]
+        done = load_checkpoint(checkpoint)
+        for i, key in enumerate(keys):
+            if key in done:
+                results[i] = done[key]
+        skipped = sum(result is not None for result in results)
+        if skipped:
+            print(f"{skipped} von {len(jobs)} Jobs bereits berechnet (Checkpoint: {checkpoint})")
+
+    pending = [i for i, result in enumerate(results) if result is None]
+    if not pending:
+        return results
+
+    if profile is None and original_log is not None:
+        profile = build_reference_profile(original_log)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(pending)))
+
+    for i, (result, job_stats) in _iter_outputs(profile, jobs, pending, workers):
+        results[i] = result
+        if stats is not None:
+            stats.update(job_stats)
+        if checkpoint is not None:
+            append_result(checkpoint, keys[i], result)
+    return results
+
+# Ausgaben eines Anonymisierers direkt evaluieren, ohne XES-Zwischendateien.
+# outputs: Paare (Log im Speicher, Parameter-Dict), z. B. ({"epsilon": 0.1}); die Parameter landen als
+# Metadaten im Ergebnis statt im Dateinamen. Mit export_dir werden die Logs zusätzlich als XES gesichert.
+def evaluate_outputs(original_log, outputs, threshold, export_dir=None, workers=None, stats=None,
+                     checkpoint=None, **job_options):
+    from CompactLog import is_compact, write_xes
+    jobs = []
+    for log, params in outputs:
+        log_path = None
+        if export_dir is not None:
+            import pm4py
+            os.makedirs(export_dir, exist_ok=True)
+            log_path = os.path.join(export_dir, "_".join(f"{key}_{value}" for key, value in params.items()) + ".xes")
+            if is_compact(log):
+                write_xes(log, log_path)
+            else:
+                pm4py.write_xes(as_event_log(log), log_path)
+        jobs.append(make_job(log_path, threshold, meta=dict(params), log=log, **job_options))
+    return run_jobs(original_log, jobs, workers=workers, stats=stats, checkpoint=checkpoint)
@@ -0,0 +1,203 @@
+import os
+import json
+import argparse
+import threading
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from Evaluation import FITNESS_METHODS, FITNESS_TYPES, make_job, start_worker_pool, submit_job
+from MappedLog import map_log, open_mapped_profile
+from VectorReplay import encode_variants
+
+# Lokaler Evaluierungsdienst (HTTP, nur 127.0.0.1).
+# Der Dienst lädt pm4py einmal und hält pro Original-Log das Referenzprofil und einen Worker-Pool resident,
+# dessen Worker das Profil ebenfalls behalten. Das Profil liegt als Memory-Map vor (MappedLog.py): die Worker
+# erhalten nur den Pfad und teilen sich die Daten über den Page-Cache. Eine Anfrage kostet damit nur noch Laden des anonymisierten
+# Logs (Log-Cache), Discovery (Modell-Cache) und Replay. Ändert sich die Datei eines Original-Logs,
+# werden Profil und Pool bei der nächsten Anfrage neu aufgebaut; laufende Anfragen rechnen im alten Pool zu Ende.
+#
+#   python EvaluationServer.py --port 8765 --preload Klein/20250414_klein_event_log.xes
+#
+# POST /evaluate  {"original": "<xes>", "jobs": [{"log": "<xes>", "threshold": 0.2, ...}]}
+#                 Felder pro Job wie make_job: threshold, fitness_method, fitness_type, fitness_options, meta.
+#                 Ohne "jobs" gilt die Anfrage selbst als ein Job.
+#                 Antwort: {"results": [...], "cache": {...}} in der Reihenfolge der Jobs
+# GET  /health    Status, residente Original-Logs, Worker pro Pool
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+_references = {}
+# Schützt nur _references und _path_locks; das Parsen eines Logs läuft unter der Sperre seines Pfads,
+# sodass /health und Anfragen für andere Original-Logs nicht warten
+_references_lock = threading.Lock()
+_path_locks = {}
+
+def _path_lock(original_path):
+    with _references_lock:
+        return _path_locks.setdefault(original_path, threading.Lock())
+
+# Pool einer abgelösten oder freigegebenen Referenz beenden, sobald keine Anfrage ihn mehr benutzt
+def _retire_if_unused(reference):
+    if reference["retired"] and reference["users"] == 0:
+        reference["pool"].shutdown(wait=False)
+
+# Profil und Worker-Pool eines Original-Logs, bei geänderter Datei neu aufgebaut.
+# Die Referenz ist bis release_reference reserviert (Referenzzählung): ein abgelöster Pool wird erst
+# beendet, wenn die letzte Anfrage, die ihn noch benutzt, fertig ist.
+def acquire_reference(original_path, workers):
+    original_path = os.path.abspath(original_path)
+    with _path_lock(original_path):
+        stat = os.stat(original_path)
+        file_id = (stat.st_size, stat.st_mtime_ns)
+        with _references_lock:
+            reference = _references.get(original_path)
+            if reference is not None and reference["file_id"] == file_id:
+                reference["users"] += 1
+                return reference
+
+        profile = open_mapped_profile(map_log(original_path))
+        new_reference = {
+            "file_id": file_id,
+            "n_traces": profile["n_traces"],
+            "n_variants": len(encode_variants(profile)["counts"]),
+            "pool": start_worker_pool(profile, workers),
+            "users": 1,
+            "retired": False
+        }
+        with _references_lock:
+            old_reference = _references.get(original_path)
+            _references[original_path] = new_reference
+            if old_reference is not None:
+                old_reference["retired"] = True
+                _retire_if_unused(old_reference)
+        return new_reference
+
+def release_reference(reference):
+    with _references_lock:
+        reference["users"] -= 1
+        _retire_if_unused(reference)
+
+def _job_from_request(entry):
+    fitness_method = entry.get("fitness_method", "token_based")
+    fitness_type = entry.get("fitness_type", "percentage_of_fitting_traces")
+    if fitness_method not in FITNESS_METHODS:
+        raise ValueError(f"Unbekannte Fitness-Methode '{fitness_method}'")
+    if fitness_type not in FITNESS_TYPES:
+        raise ValueError(f"Unbekannter Fitness-Typ '{fitness_type}'")
+    if not os.path.isfile(entry["log"]):
+        raise ValueError(f"Log '{entry['log']}' nicht gefunden")
+    return make_job(entry["log"], float(entry.get("threshold", 0.2)), meta=entry.get("meta"),
+                    fitness_method=fitness_method, fitness_type=fitness_type,
+                    fitness_options=entry.get("fitness_options"))
+
+# Anfrage auswerten; die Jobs laufen parallel im Pool des Original-Logs
+def evaluate_request(payload, workers):
+    if not os.path.isfile(payload["original"]):
+        raise ValueError(f"Original-Log '{payload['original']}' nicht gefunden")
+    jobs = [_job_from_request(entry) for entry in payload.get("jobs", [payload])]
+    reference = acquire_reference(payload["original"], workers)
+    try:
+        futures = [submit_job(reference["pool"], job) for job in jobs]
+        results = []
+        stats = Counter()
+        for future in futures:
+            result, job_stats = future.result()
+            results.append(result)
+            stats.update(job_stats)
+    finally:
+        release_reference(reference)
+    return {"results": results, "cache": dict(stats)}
+
+def _health(workers):
+    with _references_lock:
+        originals = {
+            path: {"n_traces": reference["n_traces"], "n_variants": reference["n_variants"]}
+            for path, reference in _references.items()
+        }
+    return {"status": "ok", "pid": os.getpid(), "workers": workers, "originals": originals}
+
+class EvaluationHandler(BaseHTTPRequestHandler):
+    workers = None
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, _health(self.workers))
+        else:
+            self._send_json(404, {"error": f"Unbekannter Pfad '{self.path}'"})
+
+    def do_POST(self):
+        if self.path != "/evaluate":
+            self._send_json(404, {"error": f"Unbekannter Pfad '{self.path}'"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            body = evaluate_request(payload, self.workers)
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": f"Ungültige Anfrage: {e}"})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": repr(e)})
+            return
+        self._send_json(200, body)
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, preload=()):
+    workers = workers or os.cpu_count() or 1
+    for original_path in preload:
+        print(f"Lade Original-Log {original_path}")
+        release_reference(acquire_reference(original_path, workers))
+
+    EvaluationHandler.workers = workers
+    server = ThreadingHTTPServer((host, port), EvaluationHandler)
+    print(f"Evaluierungsdienst läuft auf http://{host}:{port} ({workers} Worker pro Original-Log)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with _references_lock:
+            references = list(_references.values())
+            _references.clear()
+        for reference in references:
+            reference["pool"].shutdown()
+
+# Client: Jobs (Dicts mit "log" und optional threshold, fitness_method, fitness_type, fitness_options, meta)
+# an einen laufenden Dienst schicken; liefert die Ergebnisse in der Reihenfolge der Jobs
+def evaluate_remote(original_path, jobs, url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=None):
+    payload = {
+        "original": os.path.abspath(original_path),
+        "jobs": [dict(job, log=os.path.abspath(job["log"])) for job in jobs]
+    }
+    request = urllib.request.Request(
+        f"{url}/evaluate",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())["results"]
+
+def health(url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=5):
+    with urllib.request.urlopen(f"{url}/health", timeout=timeout) as response:
+        return json.loads(response.read())
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokaler Evaluierungsdienst mit residenten Original-Logs")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, help="Worker pro Original-Log (Standard: alle CPU-Kerne)")
+    parser.add_argument("--preload", nargs="*", default=[], help="Original-Logs, die beim Start geladen werden")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.preload)
+
+if __name__ == "__main__":
+    main()
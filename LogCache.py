@@ -0,0 +1,186 @@
+import os
+import json
+import hashlib
+import shutil
+import tempfile
+from importlib.metadata import version
+
+# Persistenter Cache für geparste XES-Logs.
+# Ein Log wird einmal geparst und als Parquet-Datei (DataFrame-Form von convert_to_dataframe) abgelegt.
+#
+# Invalidierung: Der Schlüssel eines Eintrags ist der SHA-256 des Dateiinhalts zusammen mit der
+# Cache-Formatversion und den Versionen von pm4py und pandas. Ändert sich die XES-Datei oder eine
+# dieser Versionen, wird der alte Eintrag nie wieder getroffen und fällt später der LRU-Verdrängung zum Opfer.
+# Damit nicht bei jedem Aufruf die ganze Datei gehasht werden muss, merkt sich der Index (index/, eine Datei
+# pro Pfad) Größe, mtime und Hash; nur wenn sich Größe oder mtime ändern, wird neu gehasht.
+# Ein CompactLog (compact=True) behält wie der EventLog die Reihenfolge der Events in der Datei.
+
+CACHE_DIR = os.environ.get("LOG_CACHE_DIR", ".log_cache")
+# Obergrenze für die Gesamtgröße des Caches (Standard 2 GB), älteste Einträge werden zuerst gelöscht
+MAX_CACHE_BYTES = int(os.environ.get("LOG_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+CACHE_FORMAT_VERSION = 1
+
+_INDEX_DIR = "index"
+# Früherer gemeinsamer Index, wird nur noch von clear_cache entfernt
+_LEGACY_INDEX_FILE = "index.json"
+_ENTRY_SUFFIX = ".parquet"
+
+
+# Eine kleine Indexdatei pro Pfad: parallele Prozesse und Threads überschreiben so nie die Einträge anderer Pfade
+def _index_path(cache_dir, abs_path):
+    name = hashlib.sha256(abs_path.encode("utf-8")).hexdigest() + ".json"
+    return os.path.join(cache_dir, _INDEX_DIR, name)
+
+def _read_index_entry(cache_dir, abs_path):
+    try:
+        with open(_index_path(cache_dir, abs_path), "r") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("path") == abs_path else None
+
+def _write_index_entry(cache_dir, abs_path, entry):
+    # Atomar ersetzen, damit parallel laufende Worker keinen halb geschriebenen Eintrag lesen
+    index_dir = os.path.join(cache_dir, _INDEX_DIR)
+    os.makedirs(index_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=index_dir, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(dict(entry, path=abs_path), f, indent=4)
+    os.replace(tmp_path, _index_path(cache_dir, abs_path))
+
+# SHA-256 des Dateiinhalts; für unveränderte Pfade (Größe + mtime) aus dem Index gelesen
+def file_hash(path, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    abs_path = os.path.abspath(path)
+    stat = os.stat(abs_path)
+
+    entry = _read_index_entry(cache_dir, abs_path)
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+
+    sha = hashlib.sha256()
+    with open(abs_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    digest = sha.hexdigest()
+
+    _write_index_entry(cache_dir, abs_path, {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest})
+    return digest
+
+def _cache_key(content_hash):
+    # Versionen aus den Paket-Metadaten, ohne pm4py und pandas zu importieren
+    versions = f"{content_hash}|{CACHE_FORMAT_VERSION}|{version('pm4py')}|{version('pandas')}"
+    return hashlib.sha256(versions.encode("utf-8")).hexdigest()
+
+# LRU-Verdrängung: Zugriffe setzen die mtime eines Eintrags, die ältesten werden zuerst gelöscht.
+# suffix: Dateiendung der Einträge (auch vom Modell-Cache genutzt)
+def enforce_size_limit(cache_dir, max_bytes, keep=None, suffix=_ENTRY_SUFFIX):
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(suffix) or ".tmp" in name:
+            continue
+        entry_path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(entry_path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry_path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if entry_path == keep:
+            continue
+        try:
+            os.remove(entry_path)
+            total -= size
+        except OSError:
+            pass
+
+def _store(df, entry_path, cache_dir, max_bytes):
+    tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, entry_path)
+    except Exception as e:
+        # z. B. Attributspalten mit gemischten Typen, die Parquet nicht abbilden kann
+        print(f"⚠️  Log konnte nicht im Cache abgelegt werden: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    enforce_size_limit(cache_dir, max_bytes, keep=entry_path)
+
+# Parquet-Eintrag eines XES-Logs, falls er bereits im Cache liegt (sonst None), z. B. für blockweises Lesen
+def cached_entry(path, cache_dir=CACHE_DIR):
+    entry_path = os.path.join(cache_dir, _cache_key(file_hash(path, cache_dir)) + _ENTRY_SUFFIX)
+    return entry_path if os.path.exists(entry_path) else None
+
+# CompactLog aus einem Cache-Eintrag; gelesen werden nur Case-ID, Aktivität und Zeitstempel
+def _read_compact(entry_path):
+    import pandas as pd
+    import pyarrow.parquet as pq
+    from CompactLog import from_dataframe
+    names = set(pq.read_schema(entry_path).names)
+    columns = [column for column in ("case:concept:name", "concept:name", "time:timestamp") if column in names]
+    return from_dataframe(pd.read_parquet(entry_path, columns=columns), sort_by_timestamp=False)
+
+# XES-Log laden, beim ersten Aufruf parsen und im Cache ablegen, danach direkt aus Parquet lesen.
+# Mit as_dataframe=True wird die DataFrame-Form zurückgegeben, mit compact=True ein CompactLog
+# (CompactLog.py), sonst ein EventLog wie von xes_importer.apply.
+def load_log(path, as_dataframe=False, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, compact=False):
+    import pandas as pd
+    import pm4py
+    os.makedirs(cache_dir, exist_ok=True)
+    entry_path = os.path.join(cache_dir, _cache_key(file_hash(path, cache_dir)) + _ENTRY_SUFFIX)
+
+    if os.path.exists(entry_path):
+        try:
+            if compact:
+                log = _read_compact(entry_path)
+                os.utime(entry_path)
+                return log
+            df = pd.read_parquet(entry_path)
+            os.utime(entry_path)
+            return df if as_dataframe else pm4py.convert_to_event_log(df)
+        except Exception as e:
+            print(f"⚠️  Cache-Eintrag für '{path}' unlesbar, Log wird neu geparst: {e}")
+
+    from pm4py.objects.log.importer.xes import importer as xes_importer
+    log = xes_importer.apply(path)
+    df = pm4py.convert_to_dataframe(log)
+    _store(df, entry_path, cache_dir, max_bytes)
+    if compact:
+        from CompactLog import from_dataframe
+        return from_dataframe(df, sort_by_timestamp=False)
+    return df if as_dataframe else log
+
+# Log im Speicher (EventLog, DataFrame, EventStream oder Liste von Event-Dicts) als EventLog,
+# z. B. direkt aus einem Anonymisierer ohne XES-Zwischendatei
+def as_event_log(log):
+    import pandas as pd
+    import pm4py
+    from pm4py.objects.log.obj import EventLog
+    from CompactLog import is_compact, to_event_log
+    if isinstance(log, EventLog):
+        return log
+    if is_compact(log):
+        return to_event_log(log)
+    if isinstance(log, list):
+        log = pd.DataFrame(log)
+    return pm4py.convert_to_event_log(log)
+
+# Log im Speicher für die Evaluierung: ein CompactLog bleibt kompakt (Varianten ohne EventLog),
+# alles andere wird wie bei as_event_log umgewandelt
+def as_log(log):
+    from CompactLog import is_compact
+    return log if is_compact(log) else as_event_log(log)
+
+# Alle Cache-Einträge und den Index löschen
+def clear_cache(cache_dir=CACHE_DIR):
+    if not os.path.isdir(cache_dir):
+        return
+    for name in os.listdir(cache_dir):
+        if name.endswith(_ENTRY_SUFFIX) or name == _LEGACY_INDEX_FILE:
+            os.remove(os.path.join(cache_dir, name))
+    shutil.rmtree(os.path.join(cache_dir, _INDEX_DIR), ignore_errors=True)
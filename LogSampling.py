@@ -1,14 +1,46 @@
-import os
-import json
-import pm4py
-import matplotlib.pyplot as plt
-from pm4py.objects.log.importer.xes import importer as xes_importer
+from collections import Counter
+from LogCache import load_log
+from XesStream import iter_traces, trace_activities, write_filtered_xes
 
-# Log einlesen
-log = xes_importer.apply("20250414_spaghetti_event_log_v2_modified.xes")
+# Top-k-Varianten im Speicher filtern (ganzer Log wird geladen)
+def sample_top_k_in_memory(input_path, output_path, k):
+    import pm4py
+    log = load_log(input_path)
+    filter_log = pm4py.filter_variants_top_k(log, k)
+    pm4py.objects.log.exporter.xes.exporter.apply(filter_log, output_path)
+    return len(filter_log)
 
-# Varianten zählen
-filter_log = pm4py.filter_variants_top_k(log,100)
-pm4py.objects.log.exporter.xes.exporter.apply(filter_log,"spaghetti_top_100.xes")
+# Erster Durchlauf: Varianten zählen, es liegt immer nur ein Trace im Speicher
+def count_variants_streaming(input_path):
+    variant_counts = Counter()
+    for trace in iter_traces(input_path):
+        variant_counts[trace_activities(trace)] += 1
+    return variant_counts
 
+# Die k häufigsten Varianten, gleiche Sortierung wie pm4py.filter_variants_top_k
+def top_k_variants(variant_counts, k):
+    ranked = sorted(variant_counts.items(), key=lambda x: (x[1], x[0]), reverse=True)
+    return {variant for variant, _ in ranked[:k]}
 
+# Zweiter Durchlauf: Traces der Top-k-Varianten direkt in die Ausgabedatei schreiben
+def sample_top_k_streaming(input_path, output_path, k):
+    variants = top_k_variants(count_variants_streaming(input_path), k)
+    return write_filtered_xes(input_path, output_path,
+                              lambda trace: trace_activities(trace) in variants)
+
+def main():
+    input_path = "20250414_spaghetti_event_log_v2_modified.xes"
+    output_path = "spaghetti_top_100.xes"
+    k = 100
+    # Streaming-Modus: konstanter Speicherbedarf auch für sehr große Logs
+    streaming = True
+
+    if streaming:
+        kept = sample_top_k_streaming(input_path, output_path, k)
+    else:
+        kept = sample_top_k_in_memory(input_path, output_path, k)
+
+    print(f"{kept} Traces der Top-{k}-Varianten gespeichert in: {output_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import os
+import json
+import shutil
+import tempfile
+from collections import Counter
+import numpy as np
+from CompactLog import FORMAT
+from LogCache import file_hash, load_log
+
+# Original-Log als speicherabgebildete Binärdateien (.npy) für beliebig viele Worker-Prozesse.
+# Ein Verzeichnis enthält den CompactLog (Codes, Case-Offsets, Varianten), die Variantenmatrix für den
+# vektorisierten Replay und den Präfixbaum mit Häufigkeiten und Folgeaktivitäten. Prozesse öffnen die
+# Dateien mit np.load(mmap_mode="r"); die Daten liegen einmal im Page-Cache des Betriebssystems statt
+# einmal pro Worker im Speicher.
+#
+# open_mapped_profile liefert ein Referenzprofil auf diesen Dateien. Variantenmatrix und Präfixbaum werden
+# direkt abgebildet; Fitness (Token-based Replay) und Precision laufen im VectorReplay nur auf diesen Arrays,
+# ein Worker legt dafür keine Varianten-Tupel, Präfix-Dicts oder pm4py-Logs an. Diese Python-Strukturen
+# entstehen nur, wenn ein Pfad sie ausdrücklich braucht (Alignments, approximative Evaluierung) und dann pro
+# Worker. Beim Übergeben an einen Worker wird nur der Verzeichnispfad übertragen.
+#
+# Verzeichnisse liegen unter MAPPED_LOG_DIR/<Inhalts-Hash des XES>; ein geänderter Log erhält ein neues.
+
+MAPPED_LOG_DIR = os.environ.get("MAPPED_LOG_DIR", ".mapped_logs")
+# Version 3: Events in Datei-Reihenfolge statt pro Case nach Zeitstempel sortiert
+FORMAT_VERSION = 3
+
+_ARRAYS = ["codes", "offsets", "variant_index", "variant_offsets", "variant_codes", "variant_counts"]
+
+# Präfixbaum wie VectorReplay.encode_prefixes (Aktivitätscodes sortiert); Eltern stehen immer vor ihren Kindern
+def _prefix_tree(compact):
+    to_sorted = _sorted_codes(compact["activities"])
+    nodes = {}
+    parent = []
+    activity = []
+    count = []
+    next_codes = []
+    offsets = compact["variant_offsets"]
+    codes = compact["variant_codes"]
+    for start, end, variant_count in zip(offsets[:-1], offsets[1:], compact["variant_counts"]):
+        node = -1
+        for i in range(start, end - 1):
+            key = (node, int(codes[i]))
+            child = nodes.get(key)
+            if child is None:
+                child = nodes[key] = len(parent)
+                parent.append(node)
+                activity.append(int(to_sorted[codes[i]]))
+                count.append(0)
+                next_codes.append(set())
+            count[child] += int(variant_count)
+            next_codes[child].add(int(to_sorted[codes[i + 1]]))
+            node = child
+
+    next_offsets = np.concatenate(([0], np.cumsum([len(s) for s in next_codes]))).astype(np.int64)
+    return {
+        "prefix_parent": np.array(parent, dtype=np.int64),
+        "prefix_activity": np.array(activity, dtype=np.int64),
+        "prefix_count": np.array(count, dtype=np.int64),
+        "prefix_next_offsets": next_offsets,
+        "prefix_next_codes": np.array([c for s in next_codes for c in sorted(s)], dtype=np.int64)
+    }
+
+# Abbildung der CompactLog-Codes auf die Codes der sortierten Aktivitätsliste
+def _sorted_codes(activities):
+    order = sorted(range(len(activities)), key=lambda i: activities[i])
+    to_sorted = np.empty(len(activities), dtype=np.int64)
+    to_sorted[order] = np.arange(len(activities))
+    return to_sorted
+
+# Variantenmatrix wie VectorReplay.encode_variants (Aktivitäten sortiert, -1 als Auffüllwert)
+def _variant_matrix(compact):
+    to_sorted = _sorted_codes(compact["activities"])
+    offsets = compact["variant_offsets"]
+    lengths = np.diff(offsets)
+    matrix = np.full((len(lengths), int(lengths.max()) if len(lengths) else 0), -1, dtype=np.int64)
+    for i, (start, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+        matrix[i, :end - start] = to_sorted[compact["variant_codes"][start:end]]
+    return {"variant_matrix": matrix, "variant_lengths": lengths}
+
+def _is_complete(directory):
+    return os.path.exists(os.path.join(directory, "meta.json"))
+
+# Arrays und Metadaten eines CompactLogs in ein Verzeichnis schreiben
+def _write_arrays(compact, tmp_dir):
+    arrays = {key: compact[key] for key in _ARRAYS}
+    arrays["case_ids"] = np.array([str(case_id) for case_id in compact["case_ids"]])
+    arrays.update(_prefix_tree(compact))
+    arrays.update(_variant_matrix(compact))
+    for key, value in arrays.items():
+        np.save(os.path.join(tmp_dir, key + ".npy"), np.ascontiguousarray(value))
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump({
+            "version": FORMAT_VERSION,
+            "activity_key": compact["activity_key"],
+            "activities": compact["activities"],
+            "n_traces": int(compact["variant_counts"].sum())
+        }, f)
+
+# CompactLog in ein Verzeichnis schreiben: erst in ein eigenes temporäres Verzeichnis daneben, dann atomar
+# umbenennen. Hat ein anderer Prozess das Ziel inzwischen geschrieben, gilt das als Erfolg (gleicher Inhalt).
+def write_mapped_log(compact, directory):
+    tmp_dir = tempfile.mkdtemp(prefix=os.path.basename(directory) + ".", suffix=".tmp",
+                               dir=os.path.dirname(os.path.abspath(directory)))
+    try:
+        _write_arrays(compact, tmp_dir)
+        try:
+            os.rename(tmp_dir, directory)
+        except OSError:
+            if not _is_complete(directory):
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return directory
+
+# XES-Log einmal abbilden; liefert das Verzeichnis (vorhandene, aktuelle Abbildungen werden wiederverwendet).
+# Bilden mehrere Prozesse denselben Log gleichzeitig ab, schreibt nur der erste; die übrigen verwenden sein Ergebnis.
+def map_log(path, mapped_dir=MAPPED_LOG_DIR):
+    directory = os.path.join(mapped_dir, f"{file_hash(path)}_v{FORMAT_VERSION}")
+    if not _is_complete(directory):
+        os.makedirs(mapped_dir, exist_ok=True)
+        compact = load_log(path, compact=True)
+        # Während des Parsens kann ein anderer Prozess die Abbildung fertiggestellt haben
+        if not _is_complete(directory):
+            write_mapped_log(compact, directory)
+    return directory
+
+def _load(directory, key):
+    return np.load(os.path.join(directory, key + ".npy"), mmap_mode="r")
+
+def _meta(directory):
+    with open(os.path.join(directory, "meta.json")) as f:
+        return json.load(f)
+
+# Abgebildeten Log als CompactLog öffnen (Arrays als Memory-Maps)
+def open_mapped_log(directory):
+    meta = _meta(directory)
+    log = {key: _load(directory, key) for key in _ARRAYS}
+    log.update({
+        "format": FORMAT,
+        "activity_key": meta["activity_key"],
+        "activities": meta["activities"],
+        "case_ids": _load(directory, "case_ids"),
+        "timestamps": None,
+        "mapped_dir": directory
+    })
+    return log
+
+def _variants(profile):
+    log = profile.mapped_log
+    activities = log["activities"]
+    offsets = log["variant_offsets"]
+    return [tuple(activities[c] for c in log["variant_codes"][start:end]) for start, end in zip(offsets[:-1], offsets[1:])]
+
+def _prefix_keys(profile):
+    tree = profile["prefix_tree"]
+    activities = profile["variant_matrix"]["activities"]
+    keys = []
+    for parent, activity in zip(tree["parent"], tree["activity"]):
+        keys.append((keys[parent] if parent >= 0 else ()) + (activities[activity],))
+    return keys
+
+def _prefixes(profile):
+    tree = profile["prefix_tree"]
+    activities = profile["variant_matrix"]["activities"]
+    offsets = tree["next_offsets"]
+    return {
+        prefix: {activities[c] for c in tree["next_codes"][start:end]}
+        for prefix, start, end in zip(profile["prefix_keys"], offsets[:-1], offsets[1:])
+    }
+
+def _prefix_count(profile):
+    return Counter({prefix: int(count) for prefix, count in zip(profile["prefix_keys"], profile["prefix_tree"]["count"])})
+
+# Felder des Referenzprofils (ReferenceProfile.build_profile_from_variants), erst beim ersten Zugriff gebaut
+_PROFILE_FIELDS = {
+    "variants": _variants,
+    "counts": lambda profile: [int(count) for count in profile.mapped_log["variant_counts"]],
+    "prefix_keys": _prefix_keys,
+    "prefixes": _prefixes,
+    "prefix_count": _prefix_count,
+    "start_activities": lambda profile: {variant[0] for variant in profile["variants"] if variant},
+}
+
+# Referenzprofil auf einem abgebildeten Log; fehlende Felder werden bei Bedarf aus den Dateien gebaut.
+# Beim Pickeln (z. B. an einen Worker-Pool) wird nur der Pfad übertragen.
+class MappedProfile(dict):
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+        self.mapped_log = open_mapped_log(directory)
+        meta = _meta(directory)
+        self["activity_key"] = meta["activity_key"]
+        self["n_traces"] = meta["n_traces"]
+        self["activities"] = set(meta["activities"])
+        self["variant_matrix"] = {
+            "activities": sorted(meta["activities"]),
+            "matrix": _load(directory, "variant_matrix"),
+            "lengths": _load(directory, "variant_lengths"),
+            "counts": self.mapped_log["variant_counts"]
+        }
+        self["prefix_tree"] = {key: _load(directory, "prefix_" + key)
+                               for key in ("parent", "activity", "count", "next_offsets", "next_codes")}
+
+    def __missing__(self, key):
+        if key not in _PROFILE_FIELDS:
+            raise KeyError(key)
+        value = self[key] = _PROFILE_FIELDS[key](self)
+        return value
+
+    def __reduce__(self):
+        return MappedProfile, (self.directory,)
+
+def open_mapped_profile(directory):
+    return MappedProfile(directory)
+
+# Alle Abbildungen löschen
+def clear_mapped_logs(mapped_dir=MAPPED_LOG_DIR):
+    shutil.rmtree(mapped_dir, ignore_errors=True)
@@ -0,0 +1,108 @@
+import os
+import json
+import time
+import hashlib
+from collections import Counter, OrderedDict
+from importlib.metadata import version
+from LogCache import enforce_size_limit
+from ReferenceProfile import get_variant_counts
+
+# Cache für entdeckte Petri-Netze.
+# Der Inductive Miner hängt nur von der Varianten-Multimenge des Logs ab. Schlüssel ist daher ein
+# Fingerprint dieser Multimenge zusammen mit Algorithmus, noise_threshold, Key-Spalten und pm4py-Version.
+# Die Netze werden als PNML abgelegt, sodass auch andere Prozesse und spätere Läufe sie wiederverwenden.
+# Im Speicher hält jeder Prozess nur die zuletzt benutzten Modelle (LRU); auf der Platte werden wie beim
+# Log-Cache die am längsten nicht benutzten PNML-Dateien gelöscht, sobald die Größenobergrenze überschritten ist.
+
+MODEL_CACHE_DIR = os.environ.get("MODEL_CACHE_DIR", ".model_cache")
+# Version 2: DFG-Modelle aus Events in Log-Reihenfolge (vorher bei DataFrames nach Zeitstempel sortiert)
+MODEL_CACHE_FORMAT_VERSION = 2
+# Höchstzahl der Modelle im Speicher pro Prozess
+MAX_MEMORY_MODELS = int(os.environ.get("MODEL_CACHE_MAX_MODELS", 256))
+# Obergrenze für die Gesamtgröße der PNML-Dateien (Standard 512 MB)
+MAX_CACHE_BYTES = int(os.environ.get("MODEL_CACHE_MAX_BYTES", 512 * 1024 ** 2))
+
+# Trefferstatistik dieses Prozesses (hits, misses, Discovery-Zeit der misses)
+cache_stats = Counter()
+
+_memory_cache = OrderedDict()
+
+def _remember(key, model, max_models):
+    _memory_cache[key] = model
+    _memory_cache.move_to_end(key)
+    while len(_memory_cache) > max_models:
+        _memory_cache.popitem(last=False)
+
+# Fingerprint der Varianten-Multimenge, unabhängig von Trace-Reihenfolge, Case-IDs und Zeitstempeln
+def log_fingerprint(variant_counts):
+    sha = hashlib.sha256()
+    for variant, count in sorted(variant_counts.items()):
+        sha.update(json.dumps([list(variant), count]).encode("utf-8"))
+    return sha.hexdigest()
+
+def model_key(variant_counts, threshold, key_columns, algorithm="inductive"):
+    payload = {
+        "log": log_fingerprint(variant_counts),
+        "algorithm": algorithm,
+        "noise_threshold": threshold,
+        "keys": key_columns,
+        "pm4py": version("pm4py"),
+        "format": MODEL_CACHE_FORMAT_VERSION
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+# Modell aus dem Cache holen oder mit discover() entdecken und ablegen.
+# Sind die Varianten des Logs bereits bekannt, können sie als variant_counts übergeben werden.
+def discover_cached(log, threshold, discover, key_columns, algorithm="inductive", cache_dir=MODEL_CACHE_DIR,
+                    variant_counts=None, max_models=MAX_MEMORY_MODELS, max_bytes=MAX_CACHE_BYTES):
+    if variant_counts is None:
+        variant_counts = get_variant_counts(log, key_columns["activity_key"])
+    key = model_key(variant_counts, threshold, key_columns, algorithm)
+
+    if key in _memory_cache:
+        cache_stats["hits"] += 1
+        _memory_cache.move_to_end(key)
+        return _memory_cache[key]
+
+    import pm4py
+    pnml_path = os.path.join(cache_dir, key + ".pnml")
+    if os.path.exists(pnml_path):
+        try:
+            model = pm4py.read_pnml(pnml_path)
+        except Exception as e:
+            print(f"⚠️  Cache-Eintrag '{pnml_path}' unlesbar, Modell wird neu entdeckt: {e}")
+        else:
+            cache_stats["hits"] += 1
+            # Zugriff für die LRU-Verdrängung auf der Platte vermerken
+            try:
+                os.utime(pnml_path)
+            except OSError:
+                pass
+            _remember(key, model, max_models)
+            return model
+
+    start = time.perf_counter()
+    model = discover()
+    cache_stats["misses"] += 1
+    cache_stats["discovery_seconds"] += time.perf_counter() - start
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Temporärdatei muss auf .pnml enden, da pm4py.write_pnml die Endung sonst anhängt
+    tmp_path = os.path.join(cache_dir, f"{key}.{os.getpid()}.tmp.pnml")
+    pm4py.write_pnml(*model, tmp_path)
+    os.replace(tmp_path, pnml_path)
+    enforce_size_limit(cache_dir, max_bytes, keep=pnml_path, suffix=".pnml")
+    _remember(key, model, max_models)
+    return model
+
+# Zusammenfassung am Ende eines Sweeps
+def print_cache_report(stats):
+    hits = stats.get("hits", 0)
+    misses = stats.get("misses", 0)
+    total = hits + misses
+    if total == 0:
+        return
+    print(f"\nModell-Cache: {hits} Treffer, {misses} Discoveries ({100.0 * hits / total:.1f} % eingespart)")
+    if misses > 0 and hits > 0:
+        saved = stats["discovery_seconds"] / misses * hits
+        print(f"Geschätzte eingesparte Discovery-Zeit: {saved:.1f} s")
@@ -0,0 +1,141 @@
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+import numpy as np
+from LogCache import as_log, load_log
+from ReferenceProfile import get_variant_counts
+
+# Schnelle Vorauswahl anonymisierter Logs ohne Discovery und Replay.
+# Aus den Varianten-Häufigkeiten von Original- und anonymisiertem Log werden Varianten-, DFG- und
+# Trace-Längen-Statistiken gebildet und als Zählvektoren verglichen:
+#   variant_overlap          Schnittmenge der Varianten-Verteilungen (Summe der Minima, 1 = identisch)
+#   variant_jaccard          Jaccard-Index der Varianten-Mengen
+#   trace_coverage           Anteil der Original-Traces, deren Variante im anonymisierten Log vorkommt
+#   dfg_jsd                  Jensen-Shannon-Divergenz der DFG-Kantenhäufigkeiten inkl. Start/Ende (0 = identisch, 1 = disjunkt)
+#   dfg_edge_jaccard         Jaccard-Index der DFG-Kanten
+#   length_wasserstein       Wasserstein-1-Abstand der Trace-Längen-Verteilungen (in Events)
+#   prescreen_score          Mittel aus variant_overlap, 1 - dfg_jsd und 1 - length_wasserstein / mittlere Original-Länge
+# Ein Vergleich dauert Millisekunden; nur die Kandidaten, die triage auswählt, gehen in die teure Evaluierung.
+#
+#   python Prescreen.py Klein/20250414_klein_event_log.xes TLKC_K_Klein/*.xes --keep 10
+
+START = "▶"
+END = "■"
+
+# Varianten-, DFG- und Längen-Statistik eines Logs (EventLog, CompactLog, DataFrame, ...) oder eines Varianten-Counters
+def log_statistics(log_or_variants):
+    variant_counts = log_or_variants if isinstance(log_or_variants, Counter) else get_variant_counts(as_log(log_or_variants))
+    dfg = Counter()
+    lengths = Counter()
+    for variant, count in variant_counts.items():
+        lengths[len(variant)] += count
+        for edge in zip((START,) + variant, variant + (END,)):
+            dfg[edge] += count
+    return {
+        "variants": variant_counts,
+        "dfg": dfg,
+        "lengths": lengths,
+        "n_traces": sum(variant_counts.values())
+    }
+
+# Zwei Counter als Zählvektoren über der gemeinsamen Schlüsselmenge
+def _aligned(a, b):
+    keys = list(set(a) | set(b))
+    return (np.array([a.get(key, 0) for key in keys], dtype=float),
+            np.array([b.get(key, 0) for key in keys], dtype=float),
+            keys)
+
+def _normalized(counts):
+    total = counts.sum()
+    return counts / total if total > 0 else counts
+
+def _jaccard(a, b):
+    return float(np.count_nonzero((a > 0) & (b > 0)) / max(1, np.count_nonzero((a > 0) | (b > 0))))
+
+# Jensen-Shannon-Divergenz (Basis 2, Werte in [0, 1])
+def _jsd(p, q):
+    m = 0.5 * (p + q)
+
+    def kl(x):
+        mask = x > 0
+        return float((x[mask] * np.log2(x[mask] / m[mask])).sum())
+    return 0.5 * kl(p) + 0.5 * kl(q)
+
+# Wasserstein-1 zweier diskreter Verteilungen: Fläche zwischen den Verteilungsfunktionen
+def _wasserstein(p, q, support):
+    order = np.argsort(support)
+    support = np.asarray(support, dtype=float)[order]
+    cdf_gap = np.abs(np.cumsum(p[order]) - np.cumsum(q[order]))[:-1]
+    return float((cdf_gap * np.diff(support)).sum())
+
+def compare_statistics(original, anonymized):
+    original_variants, anonymized_variants, _ = _aligned(original["variants"], anonymized["variants"])
+    p_variants, q_variants = _normalized(original_variants), _normalized(anonymized_variants)
+    original_dfg, anonymized_dfg, _ = _aligned(original["dfg"], anonymized["dfg"])
+    original_lengths, anonymized_lengths, support = _aligned(original["lengths"], anonymized["lengths"])
+    p_lengths = _normalized(original_lengths)
+
+    variant_overlap = float(np.minimum(p_variants, q_variants).sum())
+    dfg_jsd = _jsd(_normalized(original_dfg), _normalized(anonymized_dfg))
+    length_wasserstein = _wasserstein(p_lengths, _normalized(anonymized_lengths), support)
+    mean_length = float((p_lengths * np.asarray(support, dtype=float)).sum()) or 1.0
+    return {
+        "variant_overlap": variant_overlap,
+        "variant_jaccard": _jaccard(original_variants, anonymized_variants),
+        "trace_coverage": float(original_variants[anonymized_variants > 0].sum() / max(1.0, original_variants.sum())),
+        "dfg_jsd": dfg_jsd,
+        "dfg_edge_jaccard": _jaccard(original_dfg, anonymized_dfg),
+        "length_wasserstein": length_wasserstein,
+        "prescreen_score": float(np.mean([
+            variant_overlap,
+            1 - dfg_jsd,
+            1 - min(1.0, length_wasserstein / mean_length)
+        ]))
+    }
+
+# Vorauswahl-Metriken für jeden Kandidaten. candidates: Liste von (Name, Pfad oder Log im Speicher).
+# Liefert einen Datensatz pro Kandidat mit "log", den Metriken und der Rechenzeit des Vergleichs (ms).
+def prescreen(original_log, candidates):
+    original = log_statistics(as_log(original_log))
+    records = []
+    for name, log in candidates:
+        anonymized_log = load_log(log, compact=True) if isinstance(log, str) else log
+        start = time.perf_counter()
+        record = {"log": name}
+        record.update(compare_statistics(original, log_statistics(anonymized_log)))
+        record["prescreen_ms"] = (time.perf_counter() - start) * 1000
+        records.append(record)
+    return records
+
+# Kandidaten für die volle Evaluierung auswählen: mindestens min_score, davon die keep besten nach key
+def triage(records, keep=None, min_score=None, key="prescreen_score"):
+    selected = [r for r in records if min_score is None or r[key] >= min_score]
+    selected.sort(key=lambda r: r[key], reverse=True)
+    return selected if keep is None else selected[:keep]
+
+def main():
+    parser = argparse.ArgumentParser(description="Schnelle Vorauswahl anonymisierter Logs über Varianten- und DFG-Statistiken")
+    parser.add_argument("original", help="XES-Pfad des Original-Logs")
+    parser.add_argument("anonymized", nargs="+", help="XES-Pfade der anonymisierten Logs")
+    parser.add_argument("--keep", type=int, help="Nur die besten N Kandidaten ausgeben")
+    parser.add_argument("--min-score", type=float, help="Mindestwert von prescreen_score")
+    parser.add_argument("--output", help="JSON-Ausgabedatei (Standard: Tabelle auf stdout)")
+    args = parser.parse_args()
+
+    records = prescreen(load_log(args.original, compact=True), [(path, path) for path in args.anonymized])
+    selected = triage(records, args.keep, args.min_score)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(selected, f, indent=4)
+        print(f"{len(selected)} von {len(records)} Kandidaten gespeichert in: {args.output}")
+        return
+
+    for r in selected:
+        print(f"{r['prescreen_score']:.3f}  Varianten {r['variant_overlap']:.3f}  DFG-JSD {r['dfg_jsd']:.3f}  "
+              f"Längen-W1 {r['length_wasserstein']:.2f}  ({r['prescreen_ms']:.1f} ms)  {r['log']}")
+    print(f"{len(selected)} von {len(records)} Kandidaten ausgewählt", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
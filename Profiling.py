@@ -0,0 +1,168 @@
+import os
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Optionale Messung pro Stufe einer Evaluierung (Laden, Import von pm4py, Discovery, Precision, Fitness).
+# Ein Job mit "profiling" (make_job(..., profiling={...}) bzw. "profiling" in der Sweep-Spec) liefert in
+# jedem Ergebnis-Datensatz ein Feld "stages": pro Stufe Wall- und CPU-Zeit (Sekunden), Speicher (MB) und
+# Kennzahlen wie Netzgröße oder Anzahl der Varianten. Ohne "profiling" wird nichts gemessen.
+#
+# Speicher pro Stufe:
+#   peak_mb              Peak der Python-Allokationen während der Stufe über dem Stand zu Beginn (tracemalloc,
+#                        nur mit "trace_memory"); das ist die Speicherkennzahl einer Stufe
+#   rss_delta_mb         Änderung des RSS über die Stufe (Linux); freigegebener Speicher kann sie negativ machen
+#   process_peak_rss_mb  Höchststand des RSS des ganzen Prozesses bis zum Ende der Stufe (ru_maxrss); kumulativ,
+#                        enthält also frühere Stufen und Jobs desselben Workers
+#
+# Optionen (Dict; True steht für {}):
+#   "trace_memory"  peak_mb pro Stufe über tracemalloc; verlangsamt die Evaluierung deutlich
+#   "profiler"      "cprofile" oder "pyinstrument": Profil des ganzen Jobs als Datei in profile_dir
+#                   (.prof für snakeviz/pstats, .html bei pyinstrument)
+#   "profile_dir"   Zielordner der Profile (Standard "profiles")
+#
+#   python Evaluate.py original.xes anonymized.xes --profile --profiler cprofile
+
+PROFILERS = ["cprofile", "pyinstrument"]
+
+# profiling-Wert eines Jobs als Options-Dict; None/False = keine Messung
+def profiling_options(profiling):
+    if profiling is None or profiling is False:
+        return None
+    return {} if profiling is True else dict(profiling)
+
+# Höchststand des RSS seit Prozessstart (MB)
+def process_peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux liefert kB, macOS Bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+# Aktueller RSS (MB); nur unter Linux verfügbar
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+# Eine Stufe messen und unter name in stages ablegen; Kennzahlen können in das gelieferte Dict geschrieben
+# werden. Mit stages=None (keine Messung) läuft der Block unverändert.
+@contextmanager
+def stage(stages, name, **details):
+    record = dict(details)
+    if stages is None:
+        yield record
+        return
+    traced = tracemalloc.is_tracing()
+    if traced:
+        tracemalloc.reset_peak()
+        traced_before = tracemalloc.get_traced_memory()[0]
+    rss_before = current_rss_mb()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield record
+    finally:
+        record["wall_s"] = round(time.perf_counter() - wall, 4)
+        record["cpu_s"] = round(time.process_time() - cpu, 4)
+        if traced and tracemalloc.is_tracing():
+            record["peak_mb"] = round((tracemalloc.get_traced_memory()[1] - traced_before) / (1024 * 1024), 1)
+        rss_after = current_rss_mb()
+        if rss_before is not None and rss_after is not None:
+            record["rss_delta_mb"] = round(rss_after - rss_before, 1)
+        record["process_peak_rss_mb"] = process_peak_rss_mb()
+        stages[name] = record
+
+# Größe eines Petri-Netzes
+def net_size(net):
+    return {
+        "places": len(net.places),
+        "transitions": len(net.transitions),
+        "invisible_transitions": sum(1 for t in net.transitions if t.label is None),
+        "arcs": len(net.arcs)
+    }
+
+# Traces, Events und Varianten eines Logs (CompactLog direkt, sonst über die Varianten-Häufigkeiten)
+def log_size(log):
+    from CompactLog import is_compact
+    from ReferenceProfile import get_variant_counts
+    if is_compact(log):
+        return {
+            "traces": len(log["offsets"]) - 1,
+            "events": len(log["codes"]),
+            "variants": len(log["variant_counts"])
+        }
+    variant_counts = get_variant_counts(log)
+    return {
+        "traces": sum(variant_counts.values()),
+        "events": sum(len(variant) * count for variant, count in variant_counts.items()),
+        "variants": len(variant_counts)
+    }
+
+# Dateiname eines Job-Profils aus den Metadaten (z. B. "K=25_algorithm=inductive_threshold=0.2")
+def profile_name(job):
+    meta = job.get("meta") or {}
+    name = "_".join(f"{key}={value}" for key, value in meta.items())
+    if not name:
+        name = f"{os.path.splitext(os.path.basename(job.get('log_path') or 'log'))[0]}_threshold={job['threshold']}"
+    return re.sub(r"[^\w.=-]+", "_", name)
+
+# Ganzen Job profilieren (tracemalloc, cProfile/pyinstrument); liefert den Pfad des Profils oder None
+@contextmanager
+def profile_job(options, name):
+    if options is None:
+        yield None
+        return
+    trace_memory = options.get("trace_memory", False) and not tracemalloc.is_tracing()
+    if trace_memory:
+        tracemalloc.start()
+    profiler_name = options.get("profiler")
+    if profiler_name is not None and profiler_name not in PROFILERS:
+        raise ValueError(f"Unbekannter Profiler '{profiler_name}'")
+    directory = options.get("profile_dir", "profiles")
+    path = None
+    profiler = None
+    if profiler_name == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        path = os.path.join(directory, name + ".prof")
+    elif profiler_name == "pyinstrument":
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        path = os.path.join(directory, name + ".html")
+    try:
+        yield path
+    finally:
+        if profiler is not None:
+            os.makedirs(directory, exist_ok=True)
+            if profiler_name == "cprofile":
+                profiler.disable()
+                profiler.dump_stats(path)
+            else:
+                profiler.stop()
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(profiler.output_html())
+        if trace_memory:
+            tracemalloc.stop()
+
+# Langsamste Datensätze mit ihren Stufen ausgeben (Wall-Zeit der Stufen summiert)
+def print_stage_report(results, top=10):
+    records = [r for r in results if r and "stages" in r]
+    if not records:
+        return
+    total = lambda r: sum(s["wall_s"] for s in r["stages"].values())
+    print(f"\n⏱️  Langsamste {min(top, len(records))} von {len(records)} Auswertungen:")
+    for r in sorted(records, key=total, reverse=True)[:top]:
+        described = ", ".join(f"{key} = {value}" for key, value in r.items()
+                              if key not in ("stages", "fitness", "precision", "f1_score") and not isinstance(value, (dict, list)))
+        stages = ", ".join(f"{name} {s['wall_s']:.2f} s" for name, s in r["stages"].items())
+        print(f"  {total(r):8.2f} s  {described}  ({stages})")
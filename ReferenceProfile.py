@@ -0,0 +1,110 @@
+from collections import Counter
+from CompactLog import is_compact, variant_counts
+from VectorReplay import fitness_vectorized, precision_vectorized
+
+# Replay-invariante Daten des Original-Logs, einmal pro Sweep berechnet und für jedes Modell wiederverwendet:
+# Varianten mit Häufigkeiten, Präfixe mit Folgeaktivitäten (flacher Präfixbaum) und Aktivitätsmenge.
+# Replay läuft damit einmal pro Variante bzw. Präfix statt einmal pro Trace.
+# pm4py wird erst beim ersten Replay importiert; die Logs für den pm4py-Replay entstehen dann aus dem Profil.
+
+# Varianten (Aktivitätsfolgen) eines Logs mit ihrer Häufigkeit; ein CompactLog liefert sie direkt
+def get_variant_counts(log, activity_key="concept:name"):
+    if is_compact(log):
+        return variant_counts(log)
+    return Counter(tuple(event[activity_key] for event in trace) for trace in log)
+
+# Log mit genau einem Trace pro Aktivitätsfolge
+def _make_log(sequences, activity_key):
+    from pm4py.objects.log.obj import EventLog, Trace, Event
+    log = EventLog()
+    for sequence in sequences:
+        trace = Trace()
+        for activity in sequence:
+            event = Event()
+            event[activity_key] = activity
+            trace.append(event)
+        log.append(trace)
+    return log
+
+def build_reference_profile(log, activity_key="concept:name"):
+    return build_profile_from_variants(get_variant_counts(log, activity_key), activity_key)
+
+def build_profile_from_variants(variant_counts, activity_key="concept:name"):
+    variants = list(variant_counts)
+    counts = [variant_counts[variant] for variant in variants]
+
+    # Präfixe wie in der ETConformance-Precision: Präfix -> beobachtete Folgeaktivitäten
+    prefixes = {}
+    prefix_count = Counter()
+    for variant, count in zip(variants, counts):
+        for i in range(1, len(variant)):
+            prefix = variant[:i]
+            prefixes.setdefault(prefix, set()).add(variant[i])
+            prefix_count[prefix] += count
+    prefix_keys = list(prefixes)
+
+    return {
+        "activity_key": activity_key,
+        "n_traces": sum(counts),
+        "variants": variants,
+        "counts": counts,
+        "prefix_keys": prefix_keys,
+        "prefixes": prefixes,
+        "prefix_count": prefix_count,
+        "start_activities": {variant[0] for variant in variants if variant},
+        "activities": {activity for variant in variants for activity in variant}
+    }
+
+# Log mit einem Trace pro Variante bzw. pro Präfix; wird beim ersten Replay gebaut und im Profil abgelegt
+def variant_log(profile):
+    if "variant_log" not in profile:
+        profile["variant_log"] = _make_log(profile["variants"], profile["activity_key"])
+    return profile["variant_log"]
+
+def prefix_log(profile):
+    if "prefix_log" not in profile:
+        profile["prefix_log"] = _make_log(profile["prefix_keys"], profile["activity_key"])
+    return profile["prefix_log"]
+
+# Ergebnisse pro Variante mit der Häufigkeit der Variante gewichten (Trace-Ebene)
+def expand_by_counts(variant_results, counts):
+    expanded = []
+    for result, count in zip(variant_results, counts):
+        expanded.extend([result] * count)
+    return expanded
+
+# Alignments einmal pro Variante
+def align_variants(profile, net, im, fm, parameters=None):
+    from pm4py.algo.conformance.alignments.petri_net import algorithm as alignments
+    parameters = dict(parameters or {})
+    parameters[alignments.Parameters.ACTIVITY_KEY] = profile["activity_key"]
+    return alignments.apply(variant_log(profile), net, im, fm, parameters=parameters)
+
+# Liefert dasselbe Dictionary wie pm4py.fitness_token_based_replay bzw. pm4py.fitness_alignments.
+# Token-based Replay läuft vektorisiert (VectorReplay).
+def fitness_from_profile(profile, net, im, fm, fitness_method="token_based"):
+    if fitness_method == "token_based":
+        return fitness_vectorized(profile, net, im, fm)
+    if fitness_method == "alignments":
+        from pm4py.algo.evaluation.replay_fitness.variants import alignment_based as alignment_fitness
+        aligned = align_variants(profile, net, im, fm)
+        return alignment_fitness.evaluate(expand_by_counts(aligned, profile["counts"]))
+    raise ValueError(f"Unbekannte Fitness-Methode '{fitness_method}'")
+
+# Replay der Präfixe wie in der ETConformance-Precision (Abbruch beim ersten nicht passenden Schritt)
+def replay_prefixes(prefix_log, net, im, fm, activity_key="concept:name"):
+    # Die Parameter definiert die Variante; algorithm selbst exportiert sie nicht
+    from pm4py.algo.conformance.tokenreplay import algorithm as token_replay
+    from pm4py.algo.conformance.tokenreplay.variants.token_replay import Parameters
+    parameters = {
+        Parameters.CONSIDER_REMAINING_IN_FITNESS: False,
+        Parameters.TRY_TO_REACH_FINAL_MARKING_THROUGH_HIDDEN: False,
+        Parameters.STOP_IMMEDIATELY_UNFIT: True,
+        Parameters.WALK_THROUGH_HIDDEN_TRANS: True,
+        Parameters.ACTIVITY_KEY: activity_key
+    }
+    return token_replay.apply(prefix_log, net, im, fm, parameters=parameters)
+
+# ETConformance-Precision (wie pm4py.precision_token_based_replay) auf Basis des Profils (VectorReplay)
+def precision_from_profile(profile, net, im, fm):
+    return precision_vectorized(profile, net, im, fm)
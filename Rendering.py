@@ -0,0 +1,80 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Rendering-Schicht für alle Skripte.
+#  - matplotlib, seaborn und pm4py werden erst importiert, wenn eine Abbildung gezeichnet wird.
+#  - Im Batch-Modus (Standard) wird das nicht-interaktive Agg-Backend erzwungen; es öffnet sich kein Fenster,
+#    Abbildungen werden nur als Datei gespeichert. RENDER_INTERACTIVE=1 erlaubt plt.show() und Fenster.
+#  - render_figures zeichnet alle angeforderten Abbildungen (Linienplots, Heatmaps, Petri-Netz-SVGs)
+#    nach der Evaluierung in einem eigenen Worker-Pool.
+
+BATCH_MODE = os.environ.get("RENDER_INTERACTIVE") != "1"
+
+def pyplot():
+    import matplotlib
+    if BATCH_MODE:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def seaborn():
+    pyplot()
+    import seaborn as sns
+    return sns
+
+# Abbildung im Batch-Modus speichern, sonst anzeigen
+def show_or_save(output_path):
+    plt = pyplot()
+    if BATCH_MODE:
+        plt.savefig(output_path)
+        plt.close()
+        return output_path
+    plt.show()
+    return None
+
+# Petri-Netz als SVG (oder im Format der Dateiendung) speichern statt pm4py.view_petri_net
+def render_petri_net(net, im, fm, output_path):
+    import pm4py
+    pm4py.save_vis_petri_net(net, im, fm, output_path)
+
+# Konfidenzband einer Metrik, wenn die Ergebnisse Intervallgrenzen tragen (approximative Evaluierung, *_ci)
+def error_band(plt, x_values, results, metric, color):
+    if not results or not all(f"{metric}_ci" in r for r in results):
+        return
+    plt.fill_between(x_values, [r[f"{metric}_ci"][0] for r in results], [r[f"{metric}_ci"][1] for r in results],
+                     color=color, alpha=0.2)
+
+# Auftrag für render_figures: function(*args, output_path=output_path, **kwargs)
+def figure_request(function, output_path, *args, **kwargs):
+    return {"function": function, "output_path": output_path, "args": args, "kwargs": kwargs}
+
+def _render(request):
+    request["function"](*request["args"], output_path=request["output_path"], **request["kwargs"])
+    return request["output_path"]
+
+# Alle Abbildungen zeichnen; ein Fehler beim Zeichnen bricht die übrigen Abbildungen nicht ab.
+# Liefert die Pfade der erfolgreich gespeicherten Abbildungen.
+def render_figures(requests, workers=None):
+    if not requests:
+        return []
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(requests)))
+
+    rendered = []
+    if workers == 1:
+        for request in requests:
+            try:
+                rendered.append(_render(request))
+            except Exception as e:
+                print(f"⚠️  Abbildung {request['output_path']} konnte nicht gespeichert werden: {e}")
+        return rendered
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_render, request) for request in requests]
+        for request, future in zip(requests, futures):
+            try:
+                rendered.append(future.result())
+            except Exception as e:
+                print(f"⚠️  Abbildung {request['output_path']} konnte nicht gespeichert werden: {e}")
+    return rendered
@@ -0,0 +1,211 @@
+import os
+import json
+import sqlite3
+import argparse
+from datetime import datetime
+import numpy as np
+
+# Gemeinsamer Ergebnisspeicher (SQLite) für alle Benchmark-Skripte.
+# Jede Evaluierung ist eine Zeile mit indizierten Spalten für Log, Anonymisierer, Parameter (K, L, ε, Threshold),
+# Fitness-Methode/-Typ und den Metriken. Die Ergebnisse eines Laufs gehören zu einer "source"
+# (Standard: Pfad der JSON-Ergebnisdatei ohne Endung); ein erneuter Lauf ersetzt die Zeilen seiner source.
+# Die Abfragen liefern direkt NumPy-Serien bzw. -Matrizen für die Plots.
+#
+# Bestehende JSON-Ergebnisdateien werden mit import_json (oder python ResultStore.py <dateien>) übernommen.
+
+RESULTS_DB = os.environ.get("RESULTS_DB", "results.sqlite")
+
+PARAMETER_COLUMNS = ["log", "anonymizer", "K", "L", "epsilon", "threshold", "algorithm", "fitness_method", "fitness_type"]
+METRIC_COLUMNS = ["fitness", "precision", "f1_score"]
+COLUMNS = PARAMETER_COLUMNS + METRIC_COLUMNS + ["source"]
+
+# Alternative Schlüsselnamen in vorhandenen JSON-Dateien
+_ALIASES = {"name": "log", "typ": "fitness_type"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    log TEXT,
+    anonymizer TEXT,
+    K INTEGER,
+    L INTEGER,
+    epsilon REAL,
+    threshold REAL,
+    algorithm TEXT,
+    fitness_method TEXT,
+    fitness_type TEXT,
+    fitness REAL,
+    precision REAL,
+    f1_score REAL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_source ON results (source);
+CREATE INDEX IF NOT EXISTS idx_results_log ON results (log, anonymizer, fitness_type, threshold);
+CREATE INDEX IF NOT EXISTS idx_results_params ON results (anonymizer, K, L, epsilon);
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    path TEXT,
+    mtime_ns INTEGER,
+    updated TEXT
+);
+"""
+
+def open_store(path=RESULTS_DB):
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    # Spalten, die erst später hinzugekommen sind, in bestehenden Datenbanken ergänzen
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+    for column in ("algorithm",):
+        if column not in existing:
+            conn.execute(f"ALTER TABLE results ADD COLUMN {column} TEXT")
+    return conn
+
+# Ergebnis-Dict in eine Zeile umwandeln; Felder ohne eigene Spalte landen als JSON in "extra"
+def _to_row(record, source, defaults):
+    values = dict(defaults)
+    extra = {}
+    for key, value in record.items():
+        key = _ALIASES.get(key, key)
+        if key in PARAMETER_COLUMNS or key in METRIC_COLUMNS:
+            values[key] = value
+        else:
+            extra[key] = value
+    row = [source] + [values.get(column) for column in PARAMETER_COLUMNS + METRIC_COLUMNS]
+    row.append(json.dumps(extra, default=str) if extra else None)
+    return row
+
+# Ergebnisse eines Laufs speichern; vorhandene Zeilen derselben source werden ersetzt.
+# defaults ergänzt Spalten, die nicht in den Ergebnissen stehen (z. B. log="Lasagne", anonymizer="TLKC").
+def store_results(conn, records, source, path=None, **defaults):
+    unknown = set(defaults) - set(PARAMETER_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unbekannte Spalten: {sorted(unknown)}")
+    rows = [_to_row(record, source, defaults) for record in records]
+    mtime_ns = os.stat(path).st_mtime_ns if path and os.path.exists(path) else None
+    with conn:
+        conn.execute("DELETE FROM results WHERE source = ?", (source,))
+        conn.executemany(
+            f"INSERT INTO results (source, {', '.join(PARAMETER_COLUMNS + METRIC_COLUMNS)}, extra) "
+            f"VALUES ({', '.join('?' * (len(PARAMETER_COLUMNS) + len(METRIC_COLUMNS) + 2))})",
+            rows
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO sources (source, path, mtime_ns, updated) VALUES (?, ?, ?, ?)",
+            (source, path, mtime_ns, datetime.now().isoformat(timespec="seconds"))
+        )
+    return len(rows)
+
+# source einer JSON-Ergebnisdatei: Pfad ohne Endung (z. B. "Lasagne/heatmap_results")
+def source_for(path):
+    return os.path.splitext(os.path.normpath(path))[0]
+
+# JSON-Ergebnisdatei (Liste von Ergebnis-Dicts) übernehmen; unveränderte Dateien werden übersprungen
+def import_json(conn, path, source=None, **defaults):
+    source = source or source_for(path)
+    known = conn.execute("SELECT mtime_ns FROM sources WHERE source = ?", (source,)).fetchone()
+    if known is not None and known[0] == os.stat(path).st_mtime_ns:
+        return 0
+    with open(path, "r") as f:
+        records = json.load(f)
+    return store_results(conn, records, source, path=path, **defaults)
+
+# WHERE-Klausel aus Filtern: Einzelwert (=), None (IS NULL) oder Liste (IN)
+def _where(filters):
+    clauses = []
+    params = []
+    for column, value in filters.items():
+        if column not in COLUMNS:
+            raise ValueError(f"Unbekannte Spalte: {column}")
+        if value is None:
+            clauses.append(f"{column} IS NULL")
+        elif isinstance(value, (list, tuple, set)):
+            value = list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+def _check_columns(*columns):
+    for column in columns:
+        if column not in COLUMNS:
+            raise ValueError(f"Unbekannte Spalte: {column}")
+
+# Metrik über einem Parameter, aufsteigend sortiert: (x-Werte, Werte) als NumPy-Arrays
+def query_series(conn, x, metric, **filters):
+    _check_columns(x, metric)
+    where, params = _where(filters)
+    rows = conn.execute(f"SELECT {x}, {metric} FROM results{where} ORDER BY {x}", params).fetchall()
+    if not rows:
+        return np.array([]), np.array([])
+    x_values, values = zip(*rows)
+    return np.array(x_values), np.array(values, dtype=float)
+
+# Zusammenfassung mehrerer Ergebnisse in einer Zelle (aggregate von query_matrix)
+_AGGREGATES = {"mean": np.mean, "min": np.min, "max": np.max}
+
+# Metrik als Matrix (Zeilen x Spalten), z. B. K x L für die Heatmaps.
+# Ohne rows/columns werden alle vorkommenden Werte sortiert verwendet; fehlende Zellen erhalten fill
+# und werden mit einer Warnung aufgeführt.
+# Mehrere Ergebnisse in einer Zelle (z. B. mehrere Fitness-Methoden, wenn nicht danach gefiltert wird) sind
+# ein Fehler, außer aggregate ("mean", "min" oder "max") fasst sie ausdrücklich zusammen.
+# Liefert (Zeilenwerte, Spaltenwerte, Matrix).
+def query_matrix(conn, row, column, metric, rows=None, columns=None, fill=np.nan, aggregate=None, **filters):
+    _check_columns(row, column, metric)
+    if aggregate is not None and aggregate not in _AGGREGATES:
+        raise ValueError(f"Unbekannte Aggregation '{aggregate}' (erlaubt: {', '.join(_AGGREGATES)})")
+    if rows is not None:
+        filters[row] = list(rows)
+    if columns is not None:
+        filters[column] = list(columns)
+    where, params = _where(filters)
+    fetched = conn.execute(f"SELECT {row}, {column}, {metric} FROM results{where}", params).fetchall()
+
+    row_values = list(rows) if rows is not None else sorted({r for r, _, _ in fetched})
+    column_values = list(columns) if columns is not None else sorted({c for _, c, _ in fetched})
+    cells = {}
+    for r, c, v in fetched:
+        cells.setdefault((r, c), []).append(np.nan if v is None else float(v))
+
+    duplicates = sorted((cell for cell, cell_values in cells.items() if len(cell_values) > 1), key=str)
+    if duplicates and aggregate is None:
+        listed = ", ".join(f"{row}={r}/{column}={c}" for r, c in duplicates[:5])
+        raise ValueError(f"{len(duplicates)} Zellen von '{metric}' haben mehrere Ergebnisse ({listed}); "
+                         f"Filter ergänzen oder aggregate angeben")
+
+    matrix = np.full((len(row_values), len(column_values)), fill, dtype=float)
+    missing = []
+    for i, r in enumerate(row_values):
+        for j, c in enumerate(column_values):
+            if (r, c) in cells:
+                matrix[i, j] = _AGGREGATES[aggregate](cells[(r, c)]) if aggregate else cells[(r, c)][0]
+            else:
+                missing.append((r, c))
+    if missing:
+        listed = ", ".join(f"{row}={r}/{column}={c}" for r, c in missing[:5])
+        more = f" und {len(missing) - 5} weitere" if len(missing) > 5 else ""
+        print(f"⚠️  {len(missing)} von {matrix.size} Zellen von '{metric}' ohne Ergebnis, gefüllt mit {fill}: {listed}{more}")
+    return row_values, column_values, matrix
+
+def main():
+    parser = argparse.ArgumentParser(description="Vorhandene JSON-Ergebnisdateien in den Ergebnisspeicher übernehmen")
+    parser.add_argument("files", nargs="+", help="JSON-Ergebnisdateien")
+    parser.add_argument("--db", default=RESULTS_DB)
+    parser.add_argument("--log", help="Log-Name für Ergebnisse ohne 'name'-Feld")
+    parser.add_argument("--anonymizer", help="Anonymisierer (z. B. TLKC, PRIPEL)")
+    parser.add_argument("--threshold", type=float, help="Noise Threshold für Ergebnisse ohne 'threshold'-Feld")
+    args = parser.parse_args()
+
+    defaults = {key: value for key, value in
+                {"log": args.log, "anonymizer": args.anonymizer, "threshold": args.threshold}.items()
+                if value is not None}
+    conn = open_store(args.db)
+    for path in args.files:
+        count = import_json(conn, path, **defaults)
+        print(f"{path}: {count} Ergebnisse übernommen" if count else f"{path}: unverändert")
+    conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import os
+import re
+from Evaluation import DISCOVERY_ALGORITHMS, FITNESS_METHODS, FITNESS_TYPES, make_job, run_jobs
+from LogCache import as_log, load_log
+from MappedLog import map_log, open_mapped_log, open_mapped_profile
+from Prescreen import prescreen, triage
+
+# Deklarativer Sweep über Anonymisierer-Parameter x Discovery-Algorithmus x Noise Threshold x Fitness.
+#
+# Spec (Dict):
+#   "original"               XES-Pfad des Original-Logs (alternativ "original_log": Log im Speicher)
+#   "logs"                   {"dir": Ordner, "pattern": Regex mit benannten Gruppen, z. B. r"L(?P<L>\d+)_K(?P<K>\d+)\.xes"}
+#                            und optional "types": {Gruppe: Typ}, z. B. {"epsilon": float} (sonst int, float oder Text),
+#                            oder Liste von {"path": XES-Pfad oder "log": Log im Speicher, "params": {...}}
+#   "algorithms"             Discovery-Algorithmen (Standard ["inductive"], siehe DISCOVERY_ALGORITHMS)
+#   "thresholds"             Noise Thresholds (Standard [0.2])
+#   "fitness_methods"        Standard ["token_based"]
+#   "fitness_types"          Standard ["percentage_of_fitting_traces"]
+#   "fitness_options"        Optionen der Fitness-Methode, z. B. Budgets für "alignments_bounded"
+#   "share_threshold_models" Inductive-Modelle in den Workern über eine gemeinsame Log-Abstraktion (ThresholdSweep)
+#                            entdecken: die Jobs eines Workers für denselben Log teilen sich Schnitte, Thresholds
+#                            mit gleichem Prozessbaum ein Modell (Standard False)
+#   "prescreen"              Vorauswahl über Varianten-/DFG-Statistiken (Prescreen.py), z. B. {"keep": 20, "min_score": 0.5};
+#                            nur die ausgewählten Logs werden evaluiert
+#   "approximate"            Optionen der approximativen Evaluierung (ApproximateEvaluation.py), z. B.
+#                            {"tolerance": 0.02}; Ergebnisse enthalten dann *_ci-Intervalle
+#   "profiling"              Messung pro Stufe (Profiling.py), z. B. {"profiler": "cprofile"}; Ergebnisse enthalten
+#                            dann "stages" mit Zeiten, Speicher, Netzgröße und Varianten
+#   "mapped"                 Original-Log als Memory-Map ablegen (MappedLog.py), sodass alle Worker dieselben Seiten
+#                            im Page-Cache lesen (Standard True; nur mit "original")
+#   "workers", "checkpoint"  wie bei run_jobs
+#
+# Eine Zelle (Log, Algorithmus, Threshold) ist ein Job: Discovery und Precision laufen einmal, der Replay
+# einmal pro Fitness-Methode, jeder Fitness-Typ liest nur aus dem Replay-Ergebnis. Logs mit gleicher
+# Varianten-Multimenge teilen sich Modelle über den Modell-Cache. Die Kosten wachsen damit mit der Zahl
+# der verschiedenen Berechnungen, nicht mit der Zahl der Ergebnis-Datensätze.
+# Ergebnis: ein Datensatz pro Zelle und Fitness-Auswertung, mit den Parametern als Feldern.
+
+# Parameterwert aus einer Regex-Gruppe: int, float oder Text
+def _parse_value(text):
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+# Logs der Spec als Liste von {"path", "log", "params"}
+def expand_logs(logs):
+    if isinstance(logs, dict):
+        pattern = re.compile(logs["pattern"])
+        entries = []
+        for file in sorted(os.listdir(logs["dir"])):
+            match = pattern.fullmatch(file)
+            if not match:
+                if file.endswith(".xes"):
+                    print(f"⚠️  {file} passt nicht zum Muster {logs['pattern']} und wird übersprungen")
+                continue
+            types = logs.get("types", {})
+            params = {key: types.get(key, _parse_value)(value) for key, value in match.groupdict().items()}
+            entries.append({"path": os.path.join(logs["dir"], file), "log": None, "params": params})
+        return entries
+    return [
+        {"path": entry.get("path"), "log": entry.get("log"), "params": dict(entry.get("params", {}))}
+        for entry in logs
+    ]
+
+# Vorauswahl: nur Logs, die triage auswählt, gehen in die Evaluierung (Reihenfolge bleibt erhalten)
+def prescreen_entries(original_log, entries, keep=None, min_score=None):
+    records = prescreen(original_log, [
+        (i, entry["path"] if entry["log"] is None else entry["log"]) for i, entry in enumerate(entries)
+    ])
+    selected = sorted(record["log"] for record in triage(records, keep, min_score))
+    print(f"Vorauswahl: {len(selected)} von {len(entries)} Logs werden evaluiert")
+    return [entries[i] for i in selected]
+
+# Fitness-Auswertungen der Spec (Fitness-Methoden x Fitness-Typen)
+def build_evaluations(spec):
+    for algorithm in spec.get("algorithms", ["inductive"]):
+        if algorithm not in DISCOVERY_ALGORITHMS:
+            raise ValueError(f"Unbekannter Discovery-Algorithmus '{algorithm}'")
+    evaluations = []
+    for fitness_method in spec.get("fitness_methods", ["token_based"]):
+        if fitness_method not in FITNESS_METHODS:
+            raise ValueError(f"Unbekannte Fitness-Methode '{fitness_method}'")
+        for fitness_type in spec.get("fitness_types", ["percentage_of_fitting_traces"]):
+            if fitness_type not in FITNESS_TYPES:
+                raise ValueError(f"Unbekannter Fitness-Typ '{fitness_type}'")
+            evaluations.append({
+                "fitness_method": fitness_method,
+                "fitness_type": fitness_type,
+                "fitness_options": spec.get("fitness_options", {})
+            })
+    return evaluations
+
+# Job einer Zelle (Log, Algorithmus, Threshold); die Parameter des Logs landen als Felder im Ergebnis
+def cell_job(entry, algorithm, threshold, evaluations, model=None, approximate=None, profiling=None,
+             share_abstraction=False):
+    meta = dict(entry["params"], algorithm=algorithm, threshold=threshold)
+    return make_job(entry["path"], threshold, meta=meta, log=entry["log"], algorithm=algorithm,
+                    evaluations=evaluations, model=model, approximate=approximate, profiling=profiling,
+                    share_abstraction=share_abstraction)
+
+# Jobs aller Zellen. Die Discovery läuft in den Workern, mit share_threshold_models über die gemeinsame
+# Log-Abstraktion; bereits im Checkpoint stehende Jobs überspringt run_jobs, ohne zu entdecken.
+def build_jobs(spec, entries):
+    algorithms = spec.get("algorithms", ["inductive"])
+    thresholds = spec.get("thresholds", [0.2])
+    evaluations = build_evaluations(spec)
+    share_models = bool(spec.get("share_threshold_models"))
+
+    jobs = []
+    for entry in entries:
+        described = ", ".join(f"{key} = {value}" for key, value in entry["params"].items())
+        print(f"Evaluating {described or entry['path']} ({entry['path'] or 'im Speicher'})")
+        jobs.extend(
+            cell_job(entry, algorithm, threshold, evaluations,
+                     approximate=spec.get("approximate"), profiling=spec.get("profiling"),
+                     share_abstraction=share_models and algorithm == "inductive")
+            for algorithm in algorithms
+            for threshold in thresholds
+        )
+    return jobs
+
+# Original-Log und, bei Memory-Map, das Referenzprofil darauf (sonst None: run_jobs baut es)
+def load_original(spec):
+    if "original_log" in spec:
+        return as_log(spec["original_log"]), None
+    if spec.get("mapped", True):
+        directory = map_log(spec["original"])
+        return open_mapped_log(directory), open_mapped_profile(directory)
+    return load_log(spec["original"], compact=True), None
+
+# Sweep ausführen; stats sammelt die Treffer des Modell-Caches aller Worker
+def run_sweep(spec, stats=None):
+    original_log, profile = load_original(spec)
+    entries = expand_logs(spec["logs"])
+    if spec.get("prescreen"):
+        entries = prescreen_entries(original_log, entries, **spec["prescreen"])
+
+    jobs = build_jobs(spec, entries)
+    outputs = run_jobs(original_log, jobs, workers=spec.get("workers"), stats=stats,
+                       checkpoint=spec.get("checkpoint"), profile=profile)
+    return [record for records in outputs for record in records]
@@ -1,47 +1,31 @@
 import os
-import re
 import json
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pm4py
-from pm4py.objects.log.importer.xes import importer as xes_importer
-
-# Bewertung eines anonymisierten Logs
-def evaluate_for_log(original_log, anonymized_log, threshold):
-    net, im, fm = pm4py.discover_petri_net_inductive(
-        anonymized_log,
-        noise_threshold=threshold,
-        activity_key="concept:name",
-        timestamp_key="time:timestamp",
-        case_id_key="concept:name"
-    )
-
-    precision = pm4py.precision_token_based_replay(original_log, net, im, fm)
-    fitness_result = pm4py.fitness_alignments(original_log, net, im, fm)
-    #ggfs. Art der Fitness anpassen ( percentage_of_fitting_traces oder log_fitness)
-    fitness = fitness_result["percentage_of_fitting_traces"] / 100.0  # wichtig: Skalierung
-    #fitness = fitness_result["log_fitness"]
-
-    f1_score = (
-        2 * precision * fitness / (precision + fitness)
-        if (precision + fitness) > 0 else 0
-    )
-
-    return {
-        "fitness": fitness,
-        "precision": precision,
-        "f1_score": f1_score
-    }
-
-# Kombinierte Heatmap zeichnen
-def plot_combined_heatmap(matrices, x_labels, y_labels, output_path):
+from collections import Counter
+from AdaptiveSweep import interpolate_matrix, run_adaptive_sweep
+from ModelCache import print_cache_report
+from Profiling import print_stage_report
+from Rendering import figure_request, pyplot, render_figures, seaborn
+from ResultStore import import_json, open_store, query_matrix, source_for
+from SweepEngine import run_sweep
+
+# Kombinierte Heatmap zeichnen; mit evaluated (boolesche Matrix, adaptiver Sweep) werden nur
+# tatsächlich berechnete Zellen beschriftet, interpolierte Zellen bleiben ohne Zahl
+def plot_combined_heatmap(matrices, x_labels, y_labels, output_path, evaluated=None):
+    plt = pyplot()
+    sns = seaborn()
     fig, axes = plt.subplots(1, 3, figsize=(18, 6))
     metrics = ["Fitness", "Precision", "F1-Score"]
     cmaps = ["YlGnBu", "YlOrRd", "PuBuGn"]
 
     for ax, metric, matrix, cmap in zip(axes, metrics, matrices, cmaps):
-        sns.heatmap(matrix, annot=True, fmt=".2f", xticklabels=x_labels, yticklabels=y_labels,
+        annot, fmt = True, ".2f"
+        if evaluated is not None:
+            annot = [
+                [f"{value:.2f}" if computed else "" for value, computed in zip(row, computed_row)]
+                for row, computed_row in zip(matrix, evaluated)
+            ]
+            fmt = ""
+        sns.heatmap(matrix, annot=annot, fmt=fmt, xticklabels=x_labels, yticklabels=y_labels,
                     cmap=cmap, vmin=0, vmax=1, ax=ax)
         ax.set_title(f"{metric} Heatmap")
         ax.set_xlabel("L-Wert")
@@ -57,68 +41,72 @@ def main():
     anonymized_dir = "TLKC_Lasagne"
     os.makedirs(metrics_dir, exist_ok=True)
 
-    # Original-Log laden
-    original_log_path = os.path.join(metrics_dir, "20250413_lasagna_event_log_modified.xes")
-    original_log = xes_importer.apply(original_log_path)
     threshold = 0.2
+    # Exakte Alignment-Fitness. Opt-in "alignments_bounded": Varianten, die laut Token-based Replay perfekt passen,
+    # überspringen A*, die übrigen laufen mit Zeitbudget (Sekunden) pro Variante und pro Log (BoundedAlignments.py)
+    fitness_method = "alignments"
+    fitness_options = {"max_time_per_variant": 10.0, "max_total_time": 600.0} if fitness_method == "alignments_bounded" else {}
+    # Adaptiv: grobes K x L-Gitter, verfeinert nur dort, wo sich der F1-Score innerhalb einer Zelle um mehr
+    # als adaptive_tolerance ändert; übrige Zellen werden interpoliert
+    adaptive = False
+    adaptive_tolerance = 0.05
+
+    # Sweep über L x K (Lx_Ky.xes).
+    # Jedes Ergebnis wird sofort gesichert; ein erneuter Lauf überspringt bereits berechnete Jobs
+    spec = {
+        "original": os.path.join(metrics_dir, "20250413_lasagna_event_log_modified.xes"),
+        "logs": {"dir": anonymized_dir, "pattern": r"L(?P<L>\d+)_K(?P<K>\d+)\.xes"},
+        "thresholds": [threshold],
+        "fitness_methods": [fitness_method],
+        "fitness_options": fitness_options,
+        # Messung pro Stufe (Zeiten, Speicher, Netzgröße) in heatmap_results.json, z. B. {"profiler": "cprofile"}
+        "profiling": None,
+        # Anzahl paralleler Worker (None = alle CPU-Kerne)
+        "workers": None,
+        "checkpoint": os.path.join(metrics_dir, "heatmap_results.checkpoint.jsonl")
+    }
+    cache_stats = Counter()
+    if adaptive:
+        sweep = run_adaptive_sweep(spec, ["K", "L"], tolerance=adaptive_tolerance, stats=cache_stats)
+        all_results = sweep["results"]
+    else:
+        all_results = run_sweep(spec, stats=cache_stats)
+
+    # Ergebnisse speichern und in den Ergebnisspeicher übernehmen
+    json_path = os.path.join(metrics_dir, "heatmap_results.json")
+    with open(json_path, "w") as f:
+        json.dump(all_results, f, indent=4)
+    store = open_store()
+    import_json(store, json_path, log=metrics_dir, anonymizer="TLKC", threshold=threshold,
+                fitness_method=fitness_method)
 
-    # Anonymisierte Logs laden (Lx_Ky.xes)
-    anonymized_files = sorted([
-        f for f in os.listdir(anonymized_dir) if re.match(r"L\d+_K\d+\.xes", f)
-    ])
-
-    all_results = []
-    L_values = set()
-    K_values = set()
-    result_dict = {}
-
-    for file in anonymized_files:
-        match = re.match(r"L(\d+)_K(\d+)\.xes", file)
-        if not match:
-            continue
-        L = int(match.group(1))
-        K = int(match.group(2))
-
-        log_path = os.path.join(anonymized_dir, file)
-        anonymized_log = xes_importer.apply(log_path)
-
-        print(f"Evaluating L = {L}, K = {K} ({file})")
-        result = evaluate_for_log(original_log, anonymized_log, threshold)
-        result["L"] = L
-        result["K"] = K
-        all_results.append(result)
-
-        L_values.add(L)
-        K_values.add(K)
-        result_dict[(L, K)] = result
-
-    L_sorted = sorted(L_values)
-    K_sorted = sorted(K_values)
-
+    # Matrizen (K x L) direkt aus dem Ergebnisspeicher, fehlende Kombinationen mit 0;
+    # im adaptiven Modus aus dem Sweep, nicht evaluierte Zellen interpoliert
+    evaluated = None
     def make_matrix(metric):
-        matrix = np.zeros((len(K_sorted), len(L_sorted)))
-        for i, K in enumerate(K_sorted):
-            for j, L in enumerate(L_sorted):
-                value = result_dict.get((L, K), {}).get(metric, 0)
-                matrix[i][j] = value
-        return matrix
+        nonlocal evaluated
+        if adaptive:
+            K_values, L_values, matrix, evaluated = interpolate_matrix(sweep, "K", "L", metric)
+            return K_values, L_values, matrix
+        return query_matrix(store, "K", "L", metric, fill=0, source=source_for(json_path))
 
     # Heatmaps erzeugen
-    fitness_matrix = make_matrix("fitness")
-    precision_matrix = make_matrix("precision")
-    f1_matrix = make_matrix("f1_score")
-
-    plot_combined_heatmap(
+    K_sorted, L_sorted, fitness_matrix = make_matrix("fitness")
+    _, _, precision_matrix = make_matrix("precision")
+    _, _, f1_matrix = make_matrix("f1_score")
+    store.close()
+
+    render_figures([figure_request(
+        plot_combined_heatmap,
+        os.path.join(metrics_dir, "heatmap_combined.png"),
         [fitness_matrix, precision_matrix, f1_matrix],
         x_labels=L_sorted,
         y_labels=K_sorted,
-        output_path=os.path.join(metrics_dir, "heatmap_combined.png")
-    )
-
-    # Ergebnisse speichern
-    with open(os.path.join(metrics_dir, "heatmap_results.json"), "w") as f:
-        json.dump(all_results, f, indent=4)
+        evaluated=evaluated
+    )])
 
+    print_cache_report(cache_stats)
+    print_stage_report(all_results)
     print("\nBenchmark abgeschlossen!")
     print("Heatmap gespeichert unter: Lasagne/heatmap_combined.png")
     print("Ergebnisse gespeichert in: Lasagne/heatmap_results.json")
@@ -0,0 +1,141 @@
+from collections import OrderedDict
+from ModelCache import discover_cached, log_fingerprint
+from ReferenceProfile import get_variant_counts
+
+# Noise-Threshold-Sweep für den Inductive Miner auf einem festen Log.
+# Die Log-Abstraktion (Varianten mit Häufigkeiten als UVCL) wird einmal aufgebaut und für alle Thresholds
+# verwendet. Darin sammeln sich die Schnitte und Fall-Throughs der ungefilterten Teil-Logs, die nicht vom
+# Threshold abhängen, sowie die Petri-Netze pro Prozessbaum: ergibt ein Threshold denselben Prozessbaum wie
+# ein bereits berechneter, wird dessen Netz übernommen.
+# Grenze: der Rauschfilter von IMf (zweiter Durchlauf auf dem gefilterten DFG eines Teil-Logs) und die Schnitte
+# darauf werden pro Threshold neu berechnet, ebenso die Datenstrukturen (DFG) der daraus entstehenden Teil-Logs.
+# Ein gleicher gefilterter DFG auf oberster Ebene reicht für die Übernahme eines Netzes nicht: IMf filtert den
+# DFG jedes Teil-Logs in der Rekursion erneut, dort können sich die Thresholds noch unterscheiden.
+
+# Höchstzahl der Abstraktionen, die ein Prozess für shared_abstraction hält (LRU)
+MAX_SHARED_ABSTRACTIONS = 4
+
+_shared_abstractions = OrderedDict()
+
+def build_log_abstraction(log, activity_key="concept:name"):
+    return build_abstraction_from_variants(get_variant_counts(log, activity_key), activity_key)
+
+def build_abstraction_from_variants(variant_counts, activity_key="concept:name"):
+    from pm4py.util.compression.dtypes import UVCL
+    uvcl = UVCL()
+    for variant, count in variant_counts.items():
+        uvcl[variant] = count
+    return {
+        "activity_key": activity_key,
+        "variant_counts": variant_counts,
+        "uvcl": uvcl,
+        # Schnitte pro Teil-Log (Varianten-Multimenge), von allen Thresholds gemeinsam genutzt
+        "cuts": {},
+        # Petri-Netz pro Prozessbaum: (Threshold der ersten Discovery, Modell)
+        "models": {}
+    }
+
+# Abstraktion eines Logs, die sich alle Discovery-Aufrufe dieses Prozesses teilen (z. B. die Jobs eines
+# Workers für verschiedene Thresholds desselben Logs); Schlüssel ist der Fingerprint der Varianten-Multimenge
+def shared_abstraction(variant_counts, activity_key="concept:name"):
+    key = (log_fingerprint(variant_counts), activity_key)
+    if key not in _shared_abstractions:
+        _shared_abstractions[key] = build_abstraction_from_variants(variant_counts, activity_key)
+    _shared_abstractions.move_to_end(key)
+    while len(_shared_abstractions) > MAX_SHARED_ABSTRACTIONS:
+        _shared_abstractions.popitem(last=False)
+    return _shared_abstractions[key]
+
+# Inductive Miner, der Schnitte und Fall-Throughs ungefilterter Teil-Logs (Operator und Teil-Logs samt DFG)
+# in abstraction["cuts"] ablegt und wiederverwendet. Beide hängen nur vom Teil-Log ab, nicht vom Threshold;
+# pro Threshold neu berechnet werden nur der Rauschfilter (zweiter Durchlauf von IMf) und die Schnitte
+# auf dem gefilterten DFG.
+def _shared_cut_miner(threshold, parameters, cuts):
+    from copy import deepcopy
+    from pm4py.algo.discovery.inductive.variants.im import IMUVCL
+    from pm4py.algo.discovery.inductive.variants.imf import IMFUVCL
+
+    def cached(kind, obj, compute):
+        key = (kind, frozenset(obj.data_structure.items()))
+        if key not in cuts:
+            result = compute()
+            # Der Operator-Knoten erhält in _recurse seine Kinder, abgelegt wird daher eine unveränderte Kopie
+            cuts[key] = None if result is None else (deepcopy(result[0]), result[1])
+            return result
+        if cuts[key] is None:
+            return None
+        tree, children = cuts[key]
+        return deepcopy(tree), children
+
+    class SharedCutsIM(IMUVCL):
+        def find_cut(self, obj, parameters=None):
+            return cached("cut", obj, lambda: super(SharedCutsIM, self).find_cut(obj, parameters))
+
+        def fall_through(self, obj, parameters=None):
+            return cached("fall_through", obj, lambda: super(SharedCutsIM, self).fall_through(obj, parameters))
+
+    class SharedCutsIMF(IMFUVCL):
+        filtered = False
+
+        # Im zweiten Durchlauf ist der DFG gefiltert; dessen Schnitt hängt vom Threshold ab.
+        # fall_through ruft IMf nur im ersten Durchlauf auf, also immer für einen ungefilterten Teil-Log.
+        def apply(self, obj, parameters=None, second_iteration=False):
+            self.filtered = second_iteration
+            return super().apply(obj, parameters, second_iteration)
+
+        def find_cut(self, obj, parameters=None):
+            if self.filtered:
+                return super().find_cut(obj, parameters)
+            return cached("cut", obj, lambda: super(SharedCutsIMF, self).find_cut(obj, parameters))
+
+        def fall_through(self, obj, parameters=None):
+            return cached("fall_through", obj, lambda: super(SharedCutsIMF, self).fall_through(obj, parameters))
+
+    return SharedCutsIMF(parameters) if threshold > 0 else SharedCutsIM(parameters)
+
+# Prozessbaum für einen Threshold aus der Abstraktion (IMf, bei Threshold 0 der normale IM).
+# Wie inductive_miner.apply für eine UVCL; apply selbst erkennt die UVCL nicht (Typprüfung gegen den
+# typing-Alias) und versucht, sie als DataFrame zu projizieren.
+def discover_tree_from_abstraction(abstraction, threshold):
+    from pm4py.algo.discovery.inductive.dtypes.im_ds import IMDataStructureUVCL
+    from pm4py.objects.process_tree.utils.generic import fold, tree_sort
+    parameters = {
+        "noise_threshold": threshold,
+        "activity_key": abstraction["activity_key"]
+    }
+    miner = _shared_cut_miner(threshold, parameters, abstraction["cuts"])
+    tree = fold(miner.apply(IMDataStructureUVCL(abstraction["uvcl"]), parameters))
+    tree_sort(tree)
+    return tree
+
+# Modell für einen Threshold aus der Abstraktion entdecken (wie pm4py.discover_petri_net_inductive)
+def discover_from_abstraction(abstraction, threshold):
+    from pm4py.objects.conversion.process_tree import converter as pt_converter
+    return pt_converter.apply(discover_tree_from_abstraction(abstraction, threshold))
+
+# Modell für einen Threshold; liefert (Modell, Threshold, dessen Modell bei gleichem Prozessbaum übernommen wurde)
+def discover_shared(abstraction, threshold, reuse_equal_trees=True):
+    from pm4py.objects.conversion.process_tree import converter as pt_converter
+    tree = discover_tree_from_abstraction(abstraction, threshold)
+    signature = repr(tree)
+    if reuse_equal_trees and signature in abstraction["models"]:
+        reused_from, model = abstraction["models"][signature]
+        return model, reused_from
+    model = pt_converter.apply(tree)
+    abstraction["models"].setdefault(signature, (threshold, model))
+    return model, None
+
+# Modelle für alle Thresholds; liefert pro Threshold das Modell und ggf. den Threshold, dessen Modell übernommen wurde.
+# Übernommen wird nur bei identischem Prozessbaum; Modelle aus dem Modell-Cache werden direkt verwendet.
+def sweep_thresholds(abstraction, thresholds, key_columns, reuse_equal_trees=True):
+    sweep = []
+    for threshold in thresholds:
+        reused = {"from": None}
+
+        def discover():
+            model, reused["from"] = discover_shared(abstraction, threshold, reuse_equal_trees)
+            return model
+
+        model = discover_cached(None, threshold, discover, key_columns, variant_counts=abstraction["variant_counts"])
+        sweep.append({"threshold": threshold, "model": model, "reused_from": reused["from"]})
+    return sweep
@@ -1,50 +1,29 @@
 import os
 import json
-import pm4py
-import matplotlib.pyplot as plt
-from pm4py.objects.log.importer.xes import importer as xes_importer
-
-# Evaluierung für einen Noise-Wert
-def evaluate_for_threshold(threshold, original_log, anonymized_log):
-    net, im, fm = pm4py.discover_petri_net_inductive(
-        anonymized_log, 
-        noise_threshold=threshold, 
-        activity_key="concept:name", 
-        timestamp_key="time:timestamp", 
-        case_id_key="concept:name"
-    )
-
-    # Precision & Fitness
-    precision = pm4py.precision_token_based_replay(original_log, net, im, fm)
-    fitness_result = pm4py.fitness_alignments(original_log, net, im, fm)
-    #ggfs. Art der Fitness anpassen ( percentage_of_fitting_traces oder log_fitness)
-    fitness = fitness_result["percentage_of_fitting_traces"] / 100
-    #fitness = fitness_result["log_fitness"]
-
-    # F1-Score
-    f1_score = (
-        2 * precision * fitness / (precision + fitness)
-        if (precision + fitness) > 0 else 0
-    )
-
-    return {
-        "threshold": threshold,
-        "fitness": fitness,
-        "precision": precision,
-        "f1_score": f1_score
-    }
+from collections import Counter
+from AdaptiveSweep import run_adaptive_sweep
+from ModelCache import print_cache_report
+from Rendering import error_band, figure_request, pyplot, render_figures
+from ResultStore import import_json, open_store
+from SweepEngine import run_sweep
 
 # Zeichne Diagramm
 def plot_results(results, output_path):
+    plt = pyplot()
     thresholds = [r["threshold"] for r in results]
     fitnesses = [r["fitness"] for r in results]
     precisions = [r["precision"] for r in results]
     f1_scores = [r["f1_score"] for r in results]
 
     plt.figure(figsize=(8, 5))
-    plt.plot(thresholds, fitnesses, marker="o", label="Fitness")
-    plt.plot(thresholds, precisions, marker="s", label="Precision")
-    plt.plot(thresholds, f1_scores, marker="^", label="F1-Score")
+    fitness_line, = plt.plot(thresholds, fitnesses, marker="o", label="Fitness")
+    precision_line, = plt.plot(thresholds, precisions, marker="s", label="Precision")
+    f1_line, = plt.plot(thresholds, f1_scores, marker="^", label="F1-Score")
+
+    # Bei approximativer Evaluierung: Konfidenzintervalle als Bänder
+    error_band(plt, thresholds, results, "fitness", fitness_line.get_color())
+    error_band(plt, thresholds, results, "precision", precision_line.get_color())
+    error_band(plt, thresholds, results, "f1_score", f1_line.get_color())
 
     # Werte direkt an die Punkte schreiben
     for x, y in zip(thresholds, fitnesses):
@@ -72,28 +51,55 @@ def main():
     original_log_path = os.path.join(lasagne_dir, "20250413_lasagna_event_log_modified.xes")
     anonymized_log_path = os.path.join(lasagne_dir, "20250413_lasagna_event_log_modified.xes")
 
-    # Logs laden
-    original_log = xes_importer.apply(original_log_path)
-    anonymized_log = xes_importer.apply(anonymized_log_path)
-
     thresholds = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
-    all_results = []
+    # Adaptiv: feines Threshold-Gitter (Schritt 0.05), von dem nur die Punkte um starke Änderungen des
+    # F1-Scores (mehr als adaptive_tolerance zwischen Nachbarn) evaluiert werden
+    adaptive = False
+    adaptive_tolerance = 0.05
+    if adaptive:
+        thresholds = [round(i * 0.05, 2) for i in range(21)]
+    # Exakte Alignment-Fitness. Opt-in "alignments_bounded": Varianten, die laut Token-based Replay perfekt passen,
+    # überspringen A*, die übrigen laufen mit Zeitbudget (Sekunden) pro Variante und pro Log (BoundedAlignments.py)
+    fitness_method = "alignments"
+    fitness_options = {"max_time_per_variant": 10.0, "max_total_time": 600.0} if fitness_method == "alignments_bounded" else {}
+
+    # Modelle aller Thresholds aus einer gemeinsamen Log-Abstraktion entdecken;
+    # Thresholds mit gleichem Prozessbaum übernehmen das bereits entdeckte Modell.
+    # Jedes Ergebnis wird sofort gesichert; ein erneuter Lauf überspringt bereits berechnete Jobs
+    spec = {
+        "original": original_log_path,
+        "logs": [{"path": anonymized_log_path, "params": {}}],
+        "thresholds": thresholds,
+        "share_threshold_models": True,
+        "fitness_methods": [fitness_method],
+        "fitness_options": fitness_options,
+        # Anzahl paralleler Worker (None = alle CPU-Kerne)
+        "workers": None,
+        "checkpoint": os.path.join(lasagne_dir, "TLKC_benchmarking_results.checkpoint.jsonl")
+    }
+    cache_stats = Counter()
+    if adaptive:
+        all_results = run_adaptive_sweep(spec, ["threshold"], tolerance=adaptive_tolerance, coarse_points=5,
+                                         stats=cache_stats)["results"]
+    else:
+        all_results = run_sweep(spec, stats=cache_stats)
 
-    for threshold in thresholds:
-        print(f"Evaluating threshold = {threshold}")
-        result = evaluate_for_threshold(threshold, original_log, anonymized_log)
-        print(f"Fitness: {result['fitness']:.4f}, Precision: {result['precision']:.4f}, F1: {result['f1_score']:.4f}")
-        all_results.append(result)
+    for result in all_results:
+        print(f"Threshold {result['threshold']}: Fitness: {result['fitness']:.4f}, Precision: {result['precision']:.4f}, F1: {result['f1_score']:.4f}")
 
     # JSON speichern
     json_path = os.path.join(lasagne_dir, "TLKC_benchmarking_results.json")
     with open(json_path, "w") as f:
         json.dump(all_results, f, indent=4)
+    store = open_store()
+    import_json(store, json_path, log=lasagne_dir, fitness_method=fitness_method)
+    store.close()
 
     # Plot speichern
     plot_path = os.path.join(lasagne_dir, "TLKC_benchmarking_plot.png")
-    plot_results(all_results, plot_path)
+    render_figures([figure_request(plot_results, plot_path, all_results)])
 
+    print_cache_report(cache_stats)
     print("\nBenchmark abgeschlossen!")
     print(f"Ergebnisse gespeichert in: {json_path}")
     print(f"Plot gespeichert unter:    {plot_path}")
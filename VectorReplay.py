@@ -0,0 +1,401 @@
+import numpy as np
+
+# Vektorisierter Token-based Replay auf Variantenebene, auch für Netze mit unsichtbaren Transitionen
+# und doppelten Labels (IM/IMf-Modelle).
+#
+# pm4pys Token-based Replay ist pro Event eine Funktion der aktuellen Markierung und der Aktivität: die
+# Transition, der Weg über tau-Transitionen und die ergänzten Tokens hängen nur davon ab. Der Replay wird
+# daher als Automat über Markierungen abgebildet (Zustand = Markierung, Übergang = Aktivität). Jeder neue
+# Übergang wird einmal mit pm4pys Schrittlogik (die Schritte aus apply_trace mit pm4pys eigenen Hilfsfunktionen)
+# berechnet und mit seinen Zählungen (missing/consumed/produced) in Tabellen abgelegt; ebenso einmal pro
+# Zustand der Abschluss zur Endmarkierung über tau-Transitionen. Danach laufen alle Varianten
+# spaltenweise als Tabellen-Lookups (Variante x Position) durch den Automaten.
+# Die Zählungen entsprechen damit exakt pm4py.fitness_token_based_replay; nur die Python-Arbeit wächst mit
+# der Zahl der verschiedenen (Markierung, Aktivität)-Paare statt mit der Zahl der Events.
+# Die ETConformance-Precision nutzt dieselben Übergänge auf dem Präfixbaum des Profils (encode_prefixes):
+# ein Präfix passt, solange kein Schritt Tokens ergänzen muss, und der Zustand liefert die aktivierten Labels.
+# Varianten und Präfixe werden nur als Code-Arrays gelesen, Python-Tupel der Varianten sind nicht nötig.
+
+# Varianten des Referenzprofils als Matrix (Variante x Position) mit Aktivitätscodes, -1 als Auffüllwert.
+# Wird einmal pro Profil berechnet und im Profil abgelegt.
+def encode_variants(profile):
+    if "variant_matrix" not in profile:
+        activities = sorted(profile["activities"])
+        activity_index = {activity: i for i, activity in enumerate(activities)}
+        variants = profile["variants"]
+        lengths = np.array([len(variant) for variant in variants], dtype=np.int64)
+        width = int(lengths.max()) if len(variants) else 0
+        matrix = np.full((len(variants), width), -1, dtype=np.int64)
+        for i, variant in enumerate(variants):
+            matrix[i, :len(variant)] = [activity_index[activity] for activity in variant]
+        profile["variant_matrix"] = {
+            "activities": activities,
+            "matrix": matrix,
+            "lengths": lengths,
+            "counts": np.array(profile["counts"], dtype=np.int64)
+        }
+    return profile["variant_matrix"]
+
+# Präfixbaum des Referenzprofils mit denselben Aktivitätscodes wie encode_variants: Knoten i ist ein Präfix,
+# parent/activity beschreiben ihn (Eltern stehen vor ihren Kindern), count ist die Zahl der Traces mit diesem
+# Präfix, next_codes[next_offsets[i]:next_offsets[i + 1]] die beobachteten Folgeaktivitäten.
+def encode_prefixes(profile):
+    if "prefix_tree" not in profile:
+        activity_index = {activity: i for i, activity in enumerate(encode_variants(profile)["activities"])}
+        node_index = {}
+        parent = []
+        activity = []
+        next_codes = []
+        for prefix in profile["prefix_keys"]:
+            node_index[prefix] = len(parent)
+            parent.append(node_index[prefix[:-1]] if len(prefix) > 1 else -1)
+            activity.append(activity_index[prefix[-1]])
+            next_codes.append(sorted(activity_index[a] for a in profile["prefixes"][prefix]))
+        profile["prefix_tree"] = {
+            "parent": np.array(parent, dtype=np.int64),
+            "activity": np.array(activity, dtype=np.int64),
+            "count": np.array([profile["prefix_count"][prefix] for prefix in profile["prefix_keys"]], dtype=np.int64),
+            "next_offsets": np.concatenate(([0], np.cumsum([len(codes) for codes in next_codes]))).astype(np.int64),
+            "next_codes": np.array([c for codes in next_codes for c in codes], dtype=np.int64)
+        }
+    return profile["prefix_tree"]
+
+# Replay-Automat eines Netzes; Zustand 0 ist die Anfangsmarkierung. Die Spalten der Tabellen sind die bisher
+# abgespielten Aktivitäten, neue Aktivitäten (z. B. aus einem anderen Profil) erhalten neue Spalten.
+def compile_replay(net, im, fm, activity_key="concept:name"):
+    from pm4py.algo.conformance.tokenreplay.variants.token_replay import TechnicalParameters
+    from pm4py.objects.petri_net.utils.petri_utils import get_places_shortest_path_by_hidden
+
+    # Zuordnung Label -> Transition wie in pm4py (bei doppelten Labels die letzte nach Namen)
+    trans_map = {}
+    for transition in sorted(net.transitions, key=lambda t: t.name):
+        trans_map[transition.label] = transition
+
+    automaton = {
+        "net": net,
+        "im": im,
+        "fm": fm,
+        "activity_key": activity_key,
+        "trans_map": trans_map,
+        "shortest_paths": get_places_shortest_path_by_hidden(net, TechnicalParameters.MAX_REC_DEPTH.value),
+        "place_index": {place: i for i, place in enumerate(net.places)},
+        "activities": [],
+        "columns": {},
+        "state_ids": {},
+        "markings": [],
+        # Pro Zustand: sichtbare, letztlich aktivierte Labels (None = noch nicht berechnet, nur für die Precision)
+        "enabled_labels": [],
+        # Pro Zustand und Aktivität: Folgezustand (-1 = noch nicht berechnet), missing, consumed, produced
+        "next": np.full((0, 0), -1, dtype=np.int64),
+        "missing": np.zeros((0, 0), dtype=np.int64),
+        "consumed": np.zeros((0, 0), dtype=np.int64),
+        "produced": np.zeros((0, 0), dtype=np.int64),
+        # Pro Zustand: aktivierte Aktivitäten der Spalten und Anzahl aller aktivierten Labels
+        "enabled": np.zeros((0, 0), dtype=bool),
+        "enabled_count": np.zeros(0, dtype=np.int64),
+        # Pro Zustand: Abschluss zur Endmarkierung (missing, consumed, remaining, produced), -1 = noch nicht berechnet
+        "final": np.full((0, 4), -1, dtype=np.int64)
+    }
+    _add_state(automaton, im)
+    return automaton
+
+# Tabellen auf mindestens rows Zustände und columns Aktivitäten vergrößern (Zeilen werden verdoppelt)
+def _resize(automaton, rows, columns):
+    old_rows, old_columns = automaton["next"].shape
+    if rows <= old_rows and columns <= old_columns:
+        return
+    rows = max(old_rows, 16, 2 * rows) if rows > old_rows else old_rows
+    for name, fill in (("next", -1), ("missing", 0), ("consumed", 0), ("produced", 0), ("enabled", False)):
+        table = automaton[name]
+        grown = np.full((rows, max(columns, old_columns)), fill, dtype=table.dtype)
+        grown[:old_rows, :old_columns] = table
+        automaton[name] = grown
+    for name, width, fill in (("final", 4, -1), ("enabled_count", None, 0)):
+        table = automaton[name]
+        grown = np.full((rows, width) if width else rows, fill, dtype=table.dtype)
+        grown[:len(table)] = table
+        automaton[name] = grown
+
+# Spalten des Automaten für eine Liste von Aktivitäten (neue Aktivitäten werden angehängt)
+def activity_columns(automaton, activities):
+    for activity in activities:
+        if activity in automaton["columns"]:
+            continue
+        column = automaton["columns"][activity] = len(automaton["activities"])
+        automaton["activities"].append(activity)
+        _resize(automaton, len(automaton["markings"]), column + 1)
+        for state, labels in enumerate(automaton["enabled_labels"]):
+            if labels is not None:
+                automaton["enabled"][state, column] = activity in labels
+    return np.array([automaton["columns"][activity] for activity in activities], dtype=np.int64)
+
+# Zustand einer Markierung; die Reihenfolge der Stellen gehört dazu, da pm4py Gleichstände in dieser Reihenfolge auflöst
+def _add_state(automaton, marking):
+    key = tuple((automaton["place_index"][place], tokens) for place, tokens in marking.items())
+    state = automaton["state_ids"].get(key)
+    if state is not None:
+        return state
+    state = automaton["state_ids"][key] = len(automaton["markings"])
+    automaton["markings"].append(marking)
+    automaton["enabled_labels"].append(None)
+    _resize(automaton, state + 1, len(automaton["activities"]))
+    return state
+
+# Ein Event ab einer Markierung, Schritt für Schritt wie in pm4pys apply_trace (walk_through_hidden_trans):
+# passende aktivierte Transition, sonst über tau-Transitionen aktivieren, sonst fehlende Tokens ergänzen.
+# Liefert Folgemarkierung, missing, consumed, produced.
+def _step(automaton, marking, activity):
+    from copy import copy
+    from pm4py.algo.conformance.tokenreplay.variants.token_replay import (add_missing_tokens, apply_hidden_trans,
+                                                                          get_consumed_tokens, get_produced_tokens)
+    from pm4py.objects.petri_net import semantics
+    net = automaton["net"]
+    marking = copy(marking)
+    # Aktivitäten ohne Transition werden übersprungen (consider_activities_not_in_model_in_fitness=False)
+    if activity not in automaton["trans_map"]:
+        return marking, 0, 0, 0
+    candidates = [x for x in semantics.enabled_transitions(net, marking) if x.label == activity]
+    transition = candidates[0] if candidates else automaton["trans_map"][activity]
+    missing = consumed = produced = 0
+    if not semantics.is_enabled(transition, net, marking):
+        _, marking, hidden, _ = apply_hidden_trans(transition, net, copy(marking), automaton["shortest_paths"],
+                                                   [], 0, set(), [], False)
+        for fired in hidden:
+            consumed += get_consumed_tokens(fired)[0]
+            produced += get_produced_tokens(fired)[0]
+    if not semantics.is_enabled(transition, net, marking):
+        missing = add_missing_tokens(transition, marking)[0]
+    consumed += get_consumed_tokens(transition)[0]
+    produced += get_produced_tokens(transition)[0]
+    if semantics.is_enabled(transition, net, marking):
+        marking = semantics.execute(transition, net, marking)
+    return marking, missing, consumed, produced
+
+# Abschluss nach dem letzten Event wie in pm4pys apply_trace (try_to_reach_final_marking_through_hidden):
+# tau-Transitionen Richtung Endmarkierung feuern, dann fehlende und übrige Tokens zählen.
+# Liefert missing, consumed, remaining, produced des Abschlusses.
+def _close(automaton, marking):
+    from copy import copy
+    from pm4py.algo.conformance.tokenreplay.variants.token_replay import (TechnicalParameters,
+                                                                          break_condition_final_marking,
+                                                                          get_consumed_tokens, get_produced_tokens,
+                                                                          get_req_transitions_for_final_marking)
+    from pm4py.objects.petri_net import semantics
+    net, fm, paths = automaton["net"], automaton["fm"], automaton["shortest_paths"]
+    marking = copy(marking)
+    consumed = produced = 0
+
+    def fire(transition):
+        nonlocal marking, consumed, produced
+        marking = semantics.execute(transition, net, marking)
+        consumed += get_consumed_tokens(transition)[0]
+        produced += get_produced_tokens(transition)[0]
+
+    for _ in range(TechnicalParameters.MAX_IT_FINAL1.value):
+        if break_condition_final_marking(marking, fm):
+            break
+        for group in get_req_transitions_for_final_marking(marking, fm, paths):
+            for transition in group:
+                if semantics.is_enabled(transition, net, marking):
+                    fire(transition)
+            if break_condition_final_marking(marking, fm):
+                break
+
+    # Zweiter Versuch über die kürzesten tau-Wege zur einzigen Stelle der Endmarkierung
+    if not break_condition_final_marking(marking, fm) and len(fm) == 1:
+        sink = list(fm)[0]
+        connections = sorted([paths[place][sink] for place in marking if place in paths and sink in paths[place]],
+                             key=len)
+        for _ in range(TechnicalParameters.MAX_IT_FINAL2.value):
+            for path in connections:
+                for transition in path:
+                    if not semantics.is_enabled(transition, net, marking):
+                        break
+                    fire(transition)
+
+    missing = sum(max(0, fm[place] - marking[place]) for place in fm)
+    remaining = sum(max(0, tokens - fm[place]) if place in fm else tokens for place, tokens in marking.items())
+    return missing, consumed + sum(fm.values()), remaining, produced
+
+# Noch fehlende Übergänge (Zustand, Aktivität) berechnen
+def _ensure_steps(automaton, states, codes):
+    unknown = automaton["next"][states, codes] < 0
+    if not unknown.any():
+        return
+    for state, code in set(zip(states[unknown].tolist(), codes[unknown].tolist())):
+        reached, missing, consumed, produced = _step(automaton, automaton["markings"][state],
+                                                     automaton["activities"][code])
+        successor = _add_state(automaton, reached)
+        automaton["next"][state, code] = successor
+        automaton["missing"][state, code] = missing
+        automaton["consumed"][state, code] = consumed
+        automaton["produced"][state, code] = produced
+
+# Abschluss zur Endmarkierung für die gegebenen Zustände
+def _ensure_finals(automaton, states):
+    for state in np.unique(states).tolist():
+        if automaton["final"][state, 0] < 0:
+            automaton["final"][state] = _close(automaton, automaton["markings"][state])
+
+# Sichtbare, letztlich aktivierte Labels der gegebenen Zustände (wie enabled_transitions_in_marking bei pm4py)
+def _ensure_enabled(automaton, states):
+    from pm4py.objects.petri_net.utils.align_utils import get_visible_transitions_eventually_enabled_by_marking
+    for state in np.unique(states).tolist():
+        if automaton["enabled_labels"][state] is not None:
+            continue
+        transitions = get_visible_transitions_eventually_enabled_by_marking(automaton["net"], automaton["markings"][state])
+        labels = {t.label for t in transitions if t.label is not None}
+        automaton["enabled_labels"][state] = labels
+        automaton["enabled"][state] = [activity in labels for activity in automaton["activities"]]
+        automaton["enabled_count"][state] = len(labels)
+
+# Alle Varianten gleichzeitig abspielen; liefert die Zählungen pro Variante wie pm4pys Token-based Replay
+# columns: Spalte des Automaten pro Aktivitätscode der Matrix (activity_columns)
+def replay_batch(automaton, matrix, lengths, columns):
+    n_variants = matrix.shape[0]
+    state = np.zeros(n_variants, dtype=np.int64)
+    missing = np.zeros(n_variants, dtype=np.int64)
+    consumed = np.zeros(n_variants, dtype=np.int64)
+    produced = np.zeros(n_variants, dtype=np.int64)
+
+    for column in range(matrix.shape[1]):
+        rows = np.flatnonzero(lengths > column)
+        current = state[rows]
+        codes = columns[matrix[rows, column]]
+        _ensure_steps(automaton, current, codes)
+        missing[rows] += automaton["missing"][current, codes]
+        consumed[rows] += automaton["consumed"][current, codes]
+        produced[rows] += automaton["produced"][current, codes]
+        state[rows] = automaton["next"][current, codes]
+
+    # Endmarkierung: fehlende Tokens zählen als missing, überzählige als remaining.
+    # Wie bei pm4py entscheidet trace_is_fit vor den am Ende fehlenden Tokens.
+    _ensure_finals(automaton, state)
+    final = automaton["final"][state]
+    trace_is_fit = (missing == 0) & (final[:, 2] == 0)
+    missing += final[:, 0]
+    consumed += final[:, 1]
+    remaining = final[:, 2]
+    produced += final[:, 3] + sum(automaton["im"].values())
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        trace_fitness = np.where(
+            (consumed > 0) & (produced > 0),
+            0.5 * (1 - missing / consumed) + 0.5 * (1 - remaining / produced),
+            1.0
+        )
+    return {
+        "trace_is_fit": trace_is_fit,
+        "trace_fitness": trace_fitness,
+        "missing_tokens": missing,
+        "consumed_tokens": consumed,
+        "remaining_tokens": remaining,
+        "produced_tokens": produced
+    }
+
+# Aggregation wie pm4py (replay_fitness, Variante token_replay), gewichtet mit der Variantenhäufigkeit
+def evaluate_weighted(replayed, counts):
+    no_traces = int(counts.sum())
+    total_m = int((counts * replayed["missing_tokens"]).sum())
+    total_c = int((counts * replayed["consumed_tokens"]).sum())
+    total_r = int((counts * replayed["remaining_tokens"]).sum())
+    total_p = int((counts * replayed["produced_tokens"]).sum())
+
+    perc_fit_traces = 0.0
+    average_fitness = 0.0
+    log_fitness = 0
+    if no_traces > 0 and total_c > 0 and total_p > 0:
+        perc_fit_traces = (100.0 * float(counts[replayed["trace_is_fit"]].sum())) / float(no_traces)
+        average_fitness = float((counts * replayed["trace_fitness"]).sum()) / float(no_traces)
+        log_fitness = 0.5 * (1 - total_m / total_c) + 0.5 * (1 - total_r / total_p)
+
+    return {
+        "perc_fit_traces": perc_fit_traces,
+        "average_trace_fitness": average_fitness,
+        "log_fitness": log_fitness,
+        "percentage_of_fitting_traces": perc_fit_traces
+    }
+
+# Automat des zuletzt abgespielten Netzes; Precision und Fitness desselben Modells teilen sich die Übergänge
+_last_automaton = {}
+
+def get_automaton(profile, net, im, fm):
+    automaton = _last_automaton.get("automaton")
+    if (automaton is None or automaton["net"] is not net or automaton["im"] is not im or automaton["fm"] is not fm
+            or automaton["activity_key"] != profile["activity_key"]):
+        automaton = compile_replay(net, im, fm, profile["activity_key"])
+        _last_automaton["automaton"] = automaton
+    return automaton
+
+# Replay-Ergebnisse pro Variante (Reihenfolge wie profile["variants"])
+def replay_variants_vectorized(profile, net, im, fm):
+    encoded = encode_variants(profile)
+    automaton = get_automaton(profile, net, im, fm)
+    columns = activity_columns(automaton, encoded["activities"])
+    return replay_batch(automaton, encoded["matrix"], encoded["lengths"], columns)
+
+# Fitness wie pm4py.fitness_token_based_replay
+def fitness_vectorized(profile, net, im, fm):
+    return evaluate_weighted(replay_variants_vectorized(profile, net, im, fm), encode_variants(profile)["counts"])
+
+# Tiefe jedes Knotens im Präfixbaum (Präfixe der Länge 1 haben Tiefe 0), über Pointer-Jumping:
+# distance ist der Abstand zum Vorfahren jump, jump springt in jeder Runde doppelt so weit
+def _prefix_depths(parent):
+    distance = (parent >= 0).astype(np.int64)
+    jump = parent.copy()
+    while (jump >= 0).any():
+        valid = jump >= 0
+        target = np.where(valid, jump, 0)
+        distance = np.where(valid, distance + distance[target], distance)
+        jump = np.where(valid, jump[target], -1)
+    return distance
+
+# ETConformance-Precision wie pm4py.precision_token_based_replay: Präfixe Ebene für Ebene durch den Automaten
+def precision_vectorized(profile, net, im, fm):
+    automaton = get_automaton(profile, net, im, fm)
+    encoded = encode_variants(profile)
+    columns = activity_columns(automaton, encoded["activities"])
+    tree = encode_prefixes(profile)
+    parent = np.asarray(tree["parent"], dtype=np.int64)
+    codes = columns[np.asarray(tree["activity"], dtype=np.int64)]
+
+    # Auch der leere Präfix (Anfangsmarkierung) zählt für jeden Trace
+    _ensure_enabled(automaton, np.zeros(1, dtype=np.int64))
+    lengths = np.asarray(encoded["lengths"])
+    start_codes = np.unique(columns[np.asarray(encoded["matrix"][lengths > 0, 0], dtype=np.int64)])
+    n_traces = int(profile["n_traces"])
+    sum_at = n_traces * int(automaton["enabled_count"][0])
+    sum_ee = sum_at - n_traces * int(automaton["enabled"][0, start_codes].sum())
+
+    # Zustand nach jedem Präfix; fit bleibt nur, solange kein Schritt Tokens ergänzt
+    state = np.zeros(len(parent), dtype=np.int64)
+    fit = np.zeros(len(parent), dtype=bool)
+    depth = _prefix_depths(parent)
+    order = np.argsort(depth, kind="stable")
+    bounds = np.searchsorted(depth[order], np.arange(int(depth.max()) + 2 if len(depth) else 1))
+    for level in range(len(bounds) - 1):
+        nodes = order[bounds[level]:bounds[level + 1]]
+        if level == 0:
+            current = np.zeros(len(nodes), dtype=np.int64)
+        else:
+            nodes = nodes[fit[parent[nodes]]]
+            current = state[parent[nodes]]
+        step = codes[nodes]
+        _ensure_steps(automaton, current, step)
+        state[nodes] = automaton["next"][current, step]
+        fit[nodes] = automaton["missing"][current, step] == 0
+
+    # Aktivierte Labels nach dem Präfix und davon nicht im Log beobachtete (escaping edges), gewichtet mit der Häufigkeit
+    _ensure_enabled(automaton, state[fit])
+    next_offsets = np.asarray(tree["next_offsets"], dtype=np.int64)
+    owner = np.repeat(np.arange(len(parent)), np.diff(next_offsets))
+    observed = automaton["enabled"][state[owner], columns[np.asarray(tree["next_codes"], dtype=np.int64)]]
+    reflected = np.bincount(owner, weights=observed, minlength=len(parent)).astype(np.int64)
+    activated = automaton["enabled_count"][state]
+    count = np.asarray(tree["count"], dtype=np.int64)
+    sum_at += int((activated * count)[fit].sum())
+    sum_ee += int(((activated - reflected) * count)[fit].sum())
+
+    if sum_at > 0:
+        return 1 - float(sum_ee) / float(sum_at)
+    return 1.0
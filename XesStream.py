@@ -0,0 +1,77 @@
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import quoteattr
+
+# Streaming-Zugriff auf XES-Dateien mit iterparse.
+# Es liegt immer nur das aktuell gelesene Element (Header-Eintrag oder Trace) im Speicher,
+# danach wird es aus dem Baum entfernt. Der Speicherbedarf ist damit unabhängig von der Loggröße.
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+def _namespace(tag):
+    return tag[1:].split("}", 1)[0] if tag.startswith("{") else None
+
+# Liefert ("log", root), danach für jedes direkte Kind des Logs ("trace", elem) bzw. ("header", elem).
+# Tags werden ohne Namespace zurückgegeben; die Elemente sind nur bis zum nächsten Schritt gültig.
+def iter_log_elements(path):
+    root = None
+    depth = 0
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if root is None:
+                root = elem
+                yield "log", root
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+        for child in elem.iter():
+            child.tag = _local_name(child.tag)
+        yield ("trace" if elem.tag == "trace" else "header"), elem
+        root.remove(elem)
+
+# Alle Traces nacheinander lesen
+def iter_traces(path):
+    for kind, elem in iter_log_elements(path):
+        if kind == "trace":
+            yield elem
+
+# Aktivitätsfolge (Variante) eines Trace-Elements
+def trace_activities(trace_elem, activity_key="concept:name"):
+    activities = []
+    for event in trace_elem:
+        if event.tag != "event":
+            continue
+        for attribute in event:
+            if attribute.get("key") == activity_key:
+                activities.append(attribute.get("value"))
+                break
+    return tuple(activities)
+
+def _log_start_tag(root):
+    attributes = "".join(f" {_local_name(k)}={quoteattr(v)}" for k, v in root.attrib.items())
+    namespace = _namespace(root.tag)
+    if namespace:
+        attributes += f" xmlns={quoteattr(namespace)}"
+    return f"<log{attributes}>\n"
+
+# XES-Datei streamend kopieren und dabei nur Traces übernehmen, für die keep_trace(trace) wahr ist.
+# Log-Attribute, Extensions, Globals und Classifier werden unverändert übernommen.
+def write_filtered_xes(input_path, output_path, keep_trace):
+    kept = 0
+    with open(output_path, "w", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        for kind, elem in iter_log_elements(input_path):
+            if kind == "log":
+                out.write(_log_start_tag(elem))
+                continue
+            if kind == "trace":
+                if not keep_trace(elem):
+                    continue
+                kept += 1
+            elem.tail = None
+            out.write("\t" + ET.tostring(elem, encoding="unicode") + "\n")
+        out.write("</log>\n")
+    return kept
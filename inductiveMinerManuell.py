@@ -1,7 +1,9 @@
 import os
 import json
 import pm4py
-from pm4py.objects.log.importer.xes import importer as xes_importer
+from CaseSummary import summarize_cases
+from LogCache import load_log
+from Rendering import figure_request, render_figures, render_petri_net
 from pm4py.algo.discovery.inductive import algorithm as inductive_miner
 from pm4py.algo.discovery.inductive.variants import imf
 from pm4py.objects.conversion.process_tree import converter as pt_converter
@@ -18,19 +20,14 @@ def main():
     anonymized_log_path = os.path.join(metrics_dir, "20250327_Beispiellog_v4.xes")
 
     # Logs einlesen
-    original_log = xes_importer.apply(original_log_path)
-    anonymized_log = xes_importer.apply(anonymized_log_path)
+    original_log = load_log(original_log_path)
+    anonymized_log = load_log(anonymized_log_path)
 
     df = pm4py.convert_to_dataframe(anonymized_log)
 
-    # Nur die relevanten Spalten Case ID und Activity auswählen
-    df_cases_activities = df[['case:concept:name', 'concept:name']]
-
-    # Gruppierung der Aktivitäten pro Case
-    df_grouped = df_cases_activities.groupby('case:concept:name')['concept:name'].apply(lambda x: " → ".join(x)).reset_index()
-    df_grouped.columns = ['Case ID', 'Activities']
-    print(df_grouped)
-    df_grouped.to_csv('beispiellog.csv')
+    # Aktivitätsfolge pro Case, blockweise aus dem Log-Cache geschrieben und nach Case ID sortiert
+    summary = summarize_cases(anonymized_log_path, 'beispiellog.csv', sort_cases=True)
+    print(f"{summary['cases']} Cases, {summary['variants']} Varianten gespeichert in 'beispiellog.csv'")
 
 
     df = df[['case:concept:name', 'concept:name', 'time:timestamp', 'Kosten', 'org:resource']]
@@ -40,7 +37,6 @@ def main():
 
     
     net, im, fm = pm4py.discover_petri_net_inductive(anonymized_log, True, 0.2, "concept:name", "time:timestamp", "concept:name")
-    pm4py.view_petri_net(net,im,fm)
     
     # Precision (Token-based Replay)
     precision = pm4py.precision_token_based_replay(original_log, net, im, fm)
@@ -57,7 +53,12 @@ def main():
     with open(os.path.join(metrics_dir, "evaluation_results.json"), "w") as f:
         json.dump(metrics, f, indent=4)
 
+    # Petri-Netz als SVG statt Anzeigefenster, erst nach den Metriken
+    net_path = os.path.join(metrics_dir, "petri_net.svg")
+    render_figures([figure_request(render_petri_net, net_path, net, im, fm)])
+
     # Ausgabe
+    print(f" Petri-Netz gespeichert unter '{net_path}'")
     print(" Metriken erfolgreich berechnet und gespeichert unter 'Metrics/evaluation_results.json'")
     print(f"Fitness:               {fitness}")
     print(f"Precision:             {precision}")
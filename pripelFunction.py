@@ -1,45 +1,28 @@
 import os
-import re
 import json
-import matplotlib.pyplot as plt
-import pm4py
-from pm4py.objects.log.importer.xes import importer as xes_importer
-
-def evaluate_for_log(original_log, anonymized_log, threshold):
-    net, im, fm = pm4py.discover_petri_net_inductive(
-        anonymized_log,
-        noise_threshold=threshold,
-        activity_key="concept:name",
-        timestamp_key="time:timestamp",
-        case_id_key="concept:name"
-    )
-
-    precision = pm4py.precision_token_based_replay(original_log, net, im, fm)
-    fitness_result = pm4py.fitness_token_based_replay(original_log, net, im, fm)
-    fitness = fitness_result["percentage_of_fitting_traces"] / 100
-    #fitness = fitness_result["log_fitness"]
-
-    f1_score = (
-        2 * precision * fitness / (precision + fitness)
-        if (precision + fitness) > 0 else 0
-    )
-
-    return {
-        "fitness": fitness,
-        "precision": precision,
-        "f1_score": f1_score
-    }
+from collections import Counter
+from AdaptiveSweep import run_adaptive_sweep
+from ModelCache import print_cache_report
+from Rendering import error_band, figure_request, pyplot, render_figures
+from ResultStore import import_json, open_store
+from SweepEngine import run_sweep
 
 def plot_metrics(results, output_path):
+    plt = pyplot()
     epsilons = [r["epsilon"] for r in results]
     fitnesses = [r["fitness"] for r in results]
     precisions = [r["precision"] for r in results]
     f1_scores = [r["f1_score"] for r in results]
 
     plt.figure(figsize=(10, 6))
-    plt.plot(epsilons, fitnesses, marker="o", label="Fitness")
-    plt.plot(epsilons, precisions, marker="s", label="Precision")
-    plt.plot(epsilons, f1_scores, marker="^", label="F1-Score")
+    fitness_line, = plt.plot(epsilons, fitnesses, marker="o", label="Fitness")
+    precision_line, = plt.plot(epsilons, precisions, marker="s", label="Precision")
+    f1_line, = plt.plot(epsilons, f1_scores, marker="^", label="F1-Score")
+
+    # Bei approximativer Evaluierung: Konfidenzintervalle als Bänder
+    error_band(plt, epsilons, results, "fitness", fitness_line.get_color())
+    error_band(plt, epsilons, results, "precision", precision_line.get_color())
+    error_band(plt, epsilons, results, "f1_score", f1_line.get_color())
 
     plt.xlabel("ε (Epsilon)")
     plt.ylabel("Score (0–1)")
@@ -57,30 +40,32 @@ def main():
     anonymized_dir = "PRIPEL_Klein_Input"
     os.makedirs(metrics_dir, exist_ok=True)
 
-    original_log_path = os.path.join(metrics_dir, "20250414_klein_event_log.xes")
-    original_log = xes_importer.apply(original_log_path)
     threshold = 0.2
-
-    anonymized_files = sorted([
-        f for f in os.listdir(anonymized_dir) if f.endswith(".xes")
-    ])
-
-    all_results = []
-
-    for file in anonymized_files:
-        # Beispielname: 20250414_klein_event_log_epsilon_0.1_k_1_anonymized.xes
-        match = re.match(r"20250414_klein_event_log_epsilon_([0-9.]+)_k_1_anonymized\.xes", file)
-        if not match:
-            continue
-
-        epsilon = float(match.group(1))
-        log_path = os.path.join(anonymized_dir, file)
-        anonymized_log = xes_importer.apply(log_path)
-
-        print(f"🔍 Evaluating ε = {epsilon} ({file})")
-        result = evaluate_for_log(original_log, anonymized_log, threshold)
-        result["epsilon"] = epsilon
-        all_results.append(result)
+    # Adaptiv: grobes ε-Gitter, verfeinert nur dort, wo sich der F1-Score zwischen Nachbarn um mehr als
+    # adaptive_tolerance ändert; der Plot zeigt dann nur die evaluierten ε-Werte
+    adaptive = False
+    adaptive_tolerance = 0.05
+    # Sweep über ε, z. B. 20250414_klein_event_log_epsilon_0.1_k_1_anonymized.xes.
+    # Jedes Ergebnis wird sofort gesichert; ein erneuter Lauf überspringt bereits berechnete Jobs
+    spec = {
+        "original": os.path.join(metrics_dir, "20250414_klein_event_log.xes"),
+        "logs": {
+            "dir": anonymized_dir,
+            "pattern": r"20250414_klein_event_log_epsilon_(?P<epsilon>[0-9.]+)_k_1_anonymized\.xes",
+            "types": {"epsilon": float}
+        },
+        "thresholds": [threshold],
+        # Vorauswahl über Varianten-/DFG-Statistiken, z. B. {"keep": 20}; None evaluiert alle Logs
+        "prescreen": None,
+        # Anzahl paralleler Worker (None = alle CPU-Kerne)
+        "workers": None,
+        "checkpoint": os.path.join(metrics_dir, "pripel_epsilon_results.checkpoint.jsonl")
+    }
+    cache_stats = Counter()
+    if adaptive:
+        all_results = run_adaptive_sweep(spec, ["epsilon"], tolerance=adaptive_tolerance, stats=cache_stats)["results"]
+    else:
+        all_results = run_sweep(spec, stats=cache_stats)
 
     # Nach aufsteigendem Epsilon sortieren
     all_results.sort(key=lambda r: r["epsilon"])
@@ -89,11 +74,15 @@ def main():
     json_path = os.path.join(metrics_dir, "pripel_epsilon_results.json")
     with open(json_path, "w") as f:
         json.dump(all_results, f, indent=4)
+    store = open_store()
+    import_json(store, json_path, log=metrics_dir, anonymizer="PRIPEL", threshold=threshold)
+    store.close()
 
     # Plot erzeugen
     plot_path = os.path.join(metrics_dir, "pripel_epsilon_plot.png")
-    plot_metrics(all_results, plot_path)
+    render_figures([figure_request(plot_metrics, plot_path, all_results)])
 
+    print_cache_report(cache_stats)
     print("\nPRIPEL-Evaluierung abgeschlossen!")
     print(f"Ergebnisse gespeichert in: {json_path}")
     print(f"Plot gespeichert unter:    {plot_path}")
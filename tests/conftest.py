@@ -0,0 +1,61 @@
+import os
+import random
+from datetime import datetime, timedelta
+import sys
+import tempfile
+import pytest
+
+os.environ.setdefault("PM4PY_SHOW_PROGRESS_BAR", "False")
+# Caches der Skripte in ein temporäres Verzeichnis statt ins Arbeitsverzeichnis
+_cache_root = tempfile.mkdtemp(prefix="pm4py_tests_")
+for _variable, _name in (("LOG_CACHE_DIR", "log_cache"), ("MAPPED_LOG_DIR", "mapped_logs"), ("MODEL_CACHE_DIR", "model_cache")):
+    os.environ[_variable] = os.path.join(_cache_root, _name)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Kleiner Log mit Parallelität (b/c), Schleife (d), optionalem e, Auswahl f/g und etwas Rauschen
+def make_log(seed=0, n_traces=300):
+    from pm4py.objects.log.obj import EventLog, Trace, Event
+    rnd = random.Random(seed)
+    log = EventLog()
+    for i in range(n_traces):
+        sequence = ["a"] + (["b", "c"] if rnd.random() < 0.5 else ["c", "b"])
+        while rnd.random() < 0.3:
+            sequence.append("d")
+        if rnd.random() < 0.6:
+            sequence.append("e")
+        sequence.append(rnd.choice(["f", "g"]))
+        if rnd.random() < 0.15:
+            k = rnd.randrange(len(sequence))
+            noise = rnd.random()
+            if noise < 0.3:
+                del sequence[k]
+            elif noise < 0.6:
+                sequence.insert(k, rnd.choice("abcdefgxy"))
+            else:
+                sequence[k], sequence[-1] = sequence[-1], sequence[k]
+        trace = Trace()
+        trace.attributes["concept:name"] = str(i)
+        start = datetime(2025, 1, 1) + timedelta(hours=i)
+        for j, activity in enumerate(sequence):
+            event = Event()
+            event["concept:name"] = activity
+            event["time:timestamp"] = start + timedelta(minutes=j)
+            trace.append(event)
+        log.append(trace)
+    return log
+
+@pytest.fixture(scope="session")
+def log():
+    return make_log()
+
+@pytest.fixture(scope="session")
+def imf_model(log):
+    import pm4py
+    return pm4py.discover_petri_net_inductive(log, noise_threshold=0.2)
+
+@pytest.fixture(scope="session")
+def log_path(log, tmp_path_factory):
+    import pm4py
+    path = str(tmp_path_factory.mktemp("logs") / "log.xes")
+    pm4py.write_xes(log, path)
+    return path
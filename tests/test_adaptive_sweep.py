@@ -0,0 +1,56 @@
+import pm4py
+import pytest
+from AdaptiveSweep import interpolate_matrix, run_adaptive_sweep
+from SweepEngine import run_sweep
+from conftest import make_log
+
+@pytest.fixture(scope="module")
+def spec(log_path, tmp_path_factory):
+    directory = tmp_path_factory.mktemp("adaptive")
+    logs = []
+    for k in (1, 2):
+        path = str(directory / f"K{k}.xes")
+        pm4py.write_xes(make_log(seed=k, n_traces=80), path)
+        logs.append({"path": path, "params": {"K": k}})
+    return {
+        "original": log_path,
+        "logs": logs,
+        "thresholds": [round(i * 0.05, 2) for i in range(21)],
+        "fitness_types": ["log_fitness"],
+        "share_threshold_models": True,
+        "workers": 1
+    }
+
+@pytest.fixture(scope="module")
+def full_grid(spec):
+    return {(record["K"], record["threshold"]): record for record in run_sweep(spec)}
+
+def _by_point(records):
+    return {(record["K"], record["threshold"]): record for record in records}
+
+# Ohne Toleranz wird jede Zelle bis zum Ende verfeinert: dieselben Datensätze wie der volle Sweep
+def test_full_refinement_matches_run_sweep(spec, full_grid):
+    sweep = run_adaptive_sweep(spec, ["K", "threshold"], tolerance=-1, coarse_points=2)
+    assert _by_point(sweep["results"]) == full_grid
+
+# Mit Toleranz: evaluierte Punkte wie im vollen Sweep, die übrigen aus den Ecken ihrer Blattzelle interpoliert
+def test_refined_points_and_interpolation(spec, full_grid):
+    sweep = run_adaptive_sweep(spec, ["K", "threshold"], tolerance=0.05, coarse_points=3)
+    results = _by_point(sweep["results"])
+    assert 0 < len(results) < len(full_grid)
+    for point, record in results.items():
+        assert record == full_grid[point]
+
+    ks, thresholds, matrix, evaluated = interpolate_matrix(sweep, "K", "threshold", "f1_score")
+    assert evaluated.sum() == len(results)
+    for i, k in enumerate(ks):
+        for j, threshold in enumerate(thresholds):
+            if evaluated[i, j]:
+                assert matrix[i, j] == full_grid[(k, threshold)]["f1_score"]
+    for group, box in sweep["leaves"]:
+        corners = [results[(ks[i], thresholds[j])]["f1_score"] for i in set(box[0]) for j in set(box[1])]
+        # Blattzellen schwanken an ihren Ecken höchstens um die Toleranz (oder sind nicht weiter teilbar)
+        assert max(corners) - min(corners) <= 0.05 or all(hi - lo <= 1 for lo, hi in box)
+        for i in range(box[0][0], box[0][1] + 1):
+            for j in range(box[1][0], box[1][1] + 1):
+                assert min(corners) - 1e-12 <= matrix[i, j] <= max(corners) + 1e-12
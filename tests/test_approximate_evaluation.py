@@ -0,0 +1,40 @@
+import pytest
+import pm4py
+from ApproximateEvaluation import approximate_metrics
+from ReferenceProfile import build_reference_profile
+
+@pytest.fixture(scope="module")
+def profile(log):
+    return build_reference_profile(log)
+
+# Wenige seltene Varianten: alles wird exakt gerechnet und entspricht pm4py, die Intervalle sind Punkte
+@pytest.mark.parametrize("fitness_method", ["token_based", "alignments"])
+def test_small_tail_is_exact(log, profile, imf_model, fitness_method):
+    net, im, fm = imf_model
+    if fitness_method == "token_based":
+        expected = pm4py.fitness_token_based_replay(log, net, im, fm)
+    else:
+        expected = pm4py.fitness_alignments(log, net, im, fm)
+    precision = pm4py.precision_token_based_replay(log, net, im, fm)
+    for fitness_type, value in (("percentage_of_fitting_traces", expected["percentage_of_fitting_traces"] / 100),
+                                ("log_fitness", expected["log_fitness"])):
+        result = approximate_metrics(profile, net, im, fm, fitness_method, fitness_type)
+        assert result["approximation"]["sampled_traces"] == 0
+        assert result["fitness"] == pytest.approx(value, abs=1e-12)
+        assert result["precision"] == pytest.approx(precision, abs=1e-12)
+        assert result["fitness_ci"] == [result["fitness"]] * 2
+
+# Stichprobe der seltenen Varianten: die Schätzungen liegen nahe am exakten Wert und sind im Mittel unverzerrt
+def test_sampled_estimate_is_close_to_exact(profile, imf_model):
+    net, im, fm = imf_model
+    exact = approximate_metrics(profile, net, im, fm, fitness_type="log_fitness")
+    errors = []
+    for seed in range(10):
+        result = approximate_metrics(profile, net, im, fm, fitness_type="log_fitness", top_k=3, initial_sample=20,
+                                     tolerance=0.05, seed=seed)
+        assert result["approximation"]["sampled_traces"] > 0
+        assert result["fitness_ci"][0] <= result["fitness"] <= result["fitness_ci"][1]
+        for key in ("fitness", "precision", "f1_score"):
+            assert result[key] == pytest.approx(exact[key], abs=0.05)
+        errors.append(result["fitness"] - exact["fitness"])
+    assert abs(sum(errors) / len(errors)) < 0.01
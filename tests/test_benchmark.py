@@ -0,0 +1,14 @@
+import random
+import numpy as np
+from Benchmark import variants_from_process_tree
+
+# Gleicher seed, gleiche Varianten; die globalen Generatoren laufen danach weiter, als wäre nichts gezogen worden
+def test_process_tree_variants_keep_global_rng_state():
+    random.seed(7)
+    np.random.seed(7)
+    expected = (random.random(), np.random.rand())
+    random.seed(7)
+    np.random.seed(7)
+    variants, _ = variants_from_process_tree(20, seed=1)
+    assert (random.random(), np.random.rand()) == expected
+    assert variants_from_process_tree(20, seed=1)[0] == variants
@@ -0,0 +1,20 @@
+import pytest
+import pm4py
+from pm4py.objects.log.obj import EventLog
+from BoundedAlignments import bounded_alignment_fitness
+from ReferenceProfile import build_reference_profile
+
+# Modell aus den Traces ohne x, y und e: Varianten mit diesen Aktivitäten passen laut Token-based Replay
+# (unbekannte Aktivitäten werden übersprungen), im Alignment kosten sie Log-Moves
+@pytest.fixture(scope="module")
+def partial_model(log):
+    known = EventLog([trace for trace in log if not {"x", "y", "e"} & {event["concept:name"] for event in trace}])
+    return pm4py.discover_petri_net_inductive(known, noise_threshold=0.2)
+
+def test_matches_exact_alignments(log, partial_model):
+    result = bounded_alignment_fitness(build_reference_profile(log), *partial_model, max_time_per_variant=None)
+    expected = pm4py.fitness_alignments(log, *partial_model)
+    assert result["percentage_of_fitting_traces"] == pytest.approx(expected["percentage_of_fitting_traces"], abs=1e-12)
+    # log_fitness weicht nur um die tau-Kosten der übernommenen Varianten ab (siehe Modulkopf)
+    assert result["log_fitness"] == pytest.approx(expected["log_fitness"], abs=1e-3)
+    assert not result["budget_report"]["approximate"]
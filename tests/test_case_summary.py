@@ -0,0 +1,51 @@
+import pandas as pd
+import pm4py
+from CaseSummary import summarize_cases
+from conftest import make_log
+
+# Ausgabe des ursprünglichen Skripts (inductiveMinerManuell.py): groupby über den DataFrame
+def _baseline(df):
+    grouped = df.groupby("case:concept:name")["concept:name"].apply(lambda x: " → ".join(x)).reset_index()
+    grouped.columns = ["Case ID", "Activities"]
+    return grouped
+
+# Kleine Blöcke erzwingen mehrere sortierte Läufe; die CSV entspricht der groupby-Ausgabe Zeichen für Zeichen
+def test_sorted_summary_matches_groupby(log, log_path, tmp_path):
+    expected_path = tmp_path / "expected.csv"
+    _baseline(pm4py.convert_to_dataframe(log)).to_csv(expected_path)
+    output_path = tmp_path / "summary.csv"
+    summary = summarize_cases(log_path, str(output_path), chunk_size=97, sort_cases=True)
+    assert output_path.read_text(encoding="utf-8") == expected_path.read_text(encoding="utf-8")
+    assert summary["cases"] == len(log)
+    assert summary["events"] == sum(len(trace) for trace in log)
+
+def test_durations_and_variants(log, tmp_path):
+    df = pm4py.convert_to_dataframe(log)
+    variants_path = tmp_path / "variants.csv"
+    summarize_cases(df, str(tmp_path / "summary.csv"), chunk_size=50, durations=True,
+                    variants_path=str(variants_path))
+    result = pd.read_csv(tmp_path / "summary.csv", index_col=0, dtype={"Case ID": str})
+    timestamps = df.groupby("case:concept:name")["time:timestamp"]
+    expected = (timestamps.max() - timestamps.min()).dt.total_seconds()
+    assert result.set_index("Case ID")["Duration (s)"].to_dict() == expected.to_dict()
+    variants = pd.read_csv(variants_path)
+    counts = _baseline(df)["Activities"].value_counts()
+    assert dict(zip(variants["Activities"], variants["Cases"])) == counts.to_dict()
+
+# Traces ohne Case ID werden übersprungen statt zu einem gemeinsamen Case zusammengelegt
+def test_traces_without_case_id_are_skipped(tmp_path):
+    log = make_log(seed=2, n_traces=20)
+    skipped = 0
+    for trace in log[3:5]:
+        del trace.attributes["concept:name"]
+        skipped += len(trace)
+    path = str(tmp_path / "no_case_id.xes")
+    pm4py.write_xes(log, path)
+    output_path = tmp_path / "summary.csv"
+    summary = summarize_cases(path, str(output_path), sort_cases=True)
+    assert summary["cases"] == 18
+    assert summary["events_without_case_id"] == skipped
+    expected = _baseline(pm4py.convert_to_dataframe(make_log(seed=2, n_traces=20)))
+    expected = expected[~expected["Case ID"].isin(["3", "4"])].reset_index(drop=True)
+    result = pd.read_csv(output_path, index_col=0, dtype={"Case ID": str})
+    pd.testing.assert_frame_equal(result, expected)
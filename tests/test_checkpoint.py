@@ -0,0 +1,34 @@
+import pm4py
+import Evaluation
+from Evaluation import make_job, run_jobs
+from Checkpoint import load_checkpoint
+from conftest import make_log
+
+# Abgebrochener Lauf: zwei Jobs gesichert, die letzte Zeile halb geschrieben. Der erneute Lauf berechnet nur
+# die fehlenden Jobs und liefert dieselben Ergebnisse wie ein Lauf ohne Checkpoint
+def test_resume_after_interruption(log, log_path, tmp_path, monkeypatch):
+    jobs = [make_job(log_path, threshold, meta={"threshold": threshold}) for threshold in (0.1, 0.2, 0.3, 0.4)]
+    expected = run_jobs(log, jobs, workers=1)
+    checkpoint = str(tmp_path / "run.checkpoint.jsonl")
+    assert run_jobs(log, jobs[:2], workers=1, checkpoint=checkpoint) == expected[:2]
+    with open(checkpoint, "a", encoding="utf-8") as f:
+        f.write('{"key": "abgebrochen", "res')
+
+    evaluated = []
+    evaluate_job = Evaluation._evaluate_job
+    def record(job):
+        evaluated.append(job["threshold"])
+        return evaluate_job(job)
+    monkeypatch.setattr(Evaluation, "_evaluate_job", record)
+    assert run_jobs(log, jobs, workers=1, checkpoint=checkpoint) == expected
+    assert evaluated == [0.3, 0.4]
+    assert len(load_checkpoint(checkpoint)) == 4
+
+    # Geänderter Log unter demselben Pfad: neuer Schlüssel, alle Jobs werden neu berechnet
+    changed_path = str(tmp_path / "changed.xes")
+    pm4py.write_xes(make_log(seed=5, n_traces=100), changed_path)
+    evaluated.clear()
+    run_jobs(log, [make_job(changed_path, 0.1)], workers=1, checkpoint=checkpoint)
+    pm4py.write_xes(make_log(seed=6, n_traces=100), changed_path)
+    run_jobs(log, [make_job(changed_path, 0.1)], workers=1, checkpoint=checkpoint)
+    assert evaluated == [0.1, 0.1]
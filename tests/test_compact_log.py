@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pm4py
+from CompactLog import (case_activities, from_dataframe, from_event_log, read_xes, to_dataframe, to_event_log,
+                        variant_counts, write_xes)
+from ReferenceProfile import get_variant_counts
+
+# Zeitstempel ohne Zeitzone (make_log) gelten wie bei pm4py als UTC
+def _utc(moment):
+    moment = pd.Timestamp(moment)
+    return moment.tz_localize("UTC") if moment.tzinfo is None else moment.tz_convert("UTC")
+
+def _cases(event_log):
+    return [(trace.attributes["concept:name"], [event["concept:name"] for event in trace],
+             [_utc(event["time:timestamp"]) for event in trace]) for trace in event_log]
+
+def _same_compact(a, b):
+    assert list(a["case_ids"]) == list(b["case_ids"])
+    assert list(a["activities"]) == list(b["activities"])
+    for key in ("codes", "offsets", "variant_index", "variant_counts", "timestamps"):
+        assert np.array_equal(a[key], b[key])
+
+def test_event_log_round_trip(log):
+    compact = from_event_log(log, keep_timestamps=True)
+    assert variant_counts(compact) == get_variant_counts(log)
+    assert _cases(to_event_log(compact)) == _cases(log)
+
+# CompactLog -> XES -> CompactLog bzw. pm4py: Case-IDs, Aktivitäten und Zeitstempel bleiben erhalten
+def test_xes_round_trip(log, log_path, tmp_path):
+    compact = read_xes(log_path, keep_timestamps=True)
+    _same_compact(compact, from_event_log(log, keep_timestamps=True))
+    path = str(tmp_path / "compact.xes")
+    write_xes(compact, path)
+    _same_compact(read_xes(path, keep_timestamps=True), compact)
+    assert _cases(pm4py.read_xes(path, return_legacy_log_object=True)) == _cases(log)
+
+def test_dataframe_round_trip(log):
+    df = pm4py.convert_to_dataframe(log)
+    compact = from_dataframe(df, keep_timestamps=True)
+    result = to_dataframe(compact)
+    expected = df[["case:concept:name", "concept:name", "time:timestamp"]].reset_index(drop=True)
+    pd.testing.assert_frame_equal(result.astype({"concept:name": str}), expected, check_dtype=False)
+
+# Aktivitätsfolge pro Case wie der groupby des ursprünglichen Skripts
+def test_case_activities_match_groupby(log):
+    df = pm4py.convert_to_dataframe(log)
+    expected = df.groupby("case:concept:name", sort=False)["concept:name"].apply(lambda x: " → ".join(x))
+    result = case_activities(from_event_log(log))
+    assert dict(zip(result["Case ID"], result["Activities"])) == expected.to_dict()
@@ -0,0 +1,82 @@
+import pytest
+import pm4py
+from pm4py.algo.filtering.dfg.dfg_filtering import clean_dfg_based_on_noise_thresh
+from pm4py.objects.conversion.dfg.variants import to_petri_net_invisibles_no_duplicates
+from DFGToPetri import discover_petri_net_from_dfg, dfg_from_encoded, encode_dataframe, filter_dfg_noise, to_dfg_dicts
+from ReferenceProfile import build_reference_profile, fitness_from_profile, precision_from_profile
+
+@pytest.fixture(scope="module")
+def dataframe(log):
+    return pm4py.convert_to_dataframe(log)
+
+def test_dfg_matches_pm4py(dataframe):
+    graph, start_activities, end_activities = to_dfg_dicts(dfg_from_encoded(encode_dataframe(dataframe)))
+    expected = pm4py.discover_dfg(dataframe)
+    assert graph == dict(expected[0])
+    assert start_activities == dict(expected[1])
+    assert end_activities == dict(expected[2])
+
+@pytest.mark.parametrize("threshold", [0.0, 0.05, 0.2, 0.5, 0.9])
+def test_noise_filter_matches_pm4py(dataframe, threshold):
+    dfg = dfg_from_encoded(encode_dataframe(dataframe))
+    graph, _, _ = to_dfg_dicts(filter_dfg_noise(dfg, threshold))
+    expected_dfg = pm4py.discover_dfg(dataframe)[0]
+    activities = {activity for edge in expected_dfg for activity in edge}
+    assert graph == dict(clean_dfg_based_on_noise_thresh(expected_dfg, activities, threshold))
+
+# Ganze Kette wie im ursprünglichen Skript: pm4py-DFG, Rauschfilter, Konvertierung, Replay
+def test_metrics_match_pm4py_pipeline(log, dataframe):
+    dfg, start_activities, end_activities = pm4py.discover_dfg(dataframe)
+    activities = {activity for edge in dfg for activity in edge}
+    expected_net, expected_im, expected_fm = to_petri_net_invisibles_no_duplicates.apply(
+        clean_dfg_based_on_noise_thresh(dfg, activities, 0.2),
+        parameters={"start_activities": start_activities, "end_activities": end_activities}
+    )
+    net, im, fm = discover_petri_net_from_dfg(encode_dataframe(dataframe), 0.2)
+    profile = build_reference_profile(log)
+    assert precision_from_profile(profile, net, im, fm) == pytest.approx(
+        pm4py.precision_token_based_replay(log, expected_net, expected_im, expected_fm), abs=1e-12)
+    expected = pm4py.fitness_token_based_replay(log, expected_net, expected_im, expected_fm)
+    result = fitness_from_profile(profile, net, im, fm)
+    for key in ["percentage_of_fitting_traces", "log_fitness"]:
+        assert result[key] == pytest.approx(expected[key], abs=1e-12)
+
+# Batch in einem Pool, jeder Log gegen sich selbst: Datensätze wie in DFG_to_Petri_Gesamt.json,
+# Werte wie die pm4py-Kette auf dem jeweiligen Log
+def test_run_batch_records(log, log_path, tmp_path):
+    from DFGToPetri import run_batch
+    from conftest import make_log
+    other = make_log(seed=1, n_traces=200)
+    other_path = str(tmp_path / "other.xes")
+    pm4py.write_xes(other, other_path)
+
+    results, models = run_batch({"Test": log_path, "Other": other_path}, [0.2, 0.5],
+                                ["log_fitness", "percentage_of_fitting_traces"], workers=2)
+    assert [list(r) for r in results] == [["name", "typ", "threshold", "fitness", "precision", "f1_score"]] * 8
+    assert [(r["name"], r["threshold"], r["typ"]) for r in results[:4]] == [
+        ("Test", 0.2, "log_fitness"), ("Test", 0.2, "percentage_of_fitting_traces"),
+        ("Test", 0.5, "log_fitness"), ("Test", 0.5, "percentage_of_fitting_traces")
+    ]
+    for name, event_log in (("Test", log), ("Other", other)):
+        for threshold in (0.2, 0.5):
+            fitness_record, percentage_record = [r for r in results if (r["name"], r["threshold"]) == (name, threshold)]
+            net, im, fm = models[(name, threshold)]
+            expected = pm4py.fitness_token_based_replay(event_log, net, im, fm)
+            assert fitness_record["fitness"] == pytest.approx(expected["log_fitness"], abs=1e-12)
+            assert percentage_record["fitness"] == pytest.approx(expected["percentage_of_fitting_traces"] / 100, abs=1e-12)
+            assert fitness_record["precision"] == pytest.approx(
+                pm4py.precision_token_based_replay(event_log, net, im, fm), abs=1e-12)
+
+# Zeitstempel gegen die Log-Reihenfolge: DataFrame- und CompactLog-Weg liefern denselben DFG wie pm4py auf dem EventLog
+def test_dataframe_and_compact_agree_on_event_order():
+    from datetime import timedelta
+    from CompactLog import from_event_log, to_encoded
+    from conftest import make_log
+    log = make_log(seed=3, n_traces=60)
+    for trace in log[::3]:
+        trace[-1]["time:timestamp"] = trace[0]["time:timestamp"] - timedelta(minutes=1)
+    from_dataframe = to_dfg_dicts(dfg_from_encoded(encode_dataframe(pm4py.convert_to_dataframe(log))))
+    from_compact = to_dfg_dicts(dfg_from_encoded(to_encoded(from_event_log(log))))
+    assert from_dataframe == from_compact
+    expected = pm4py.discover_dfg(log)
+    assert from_compact == (dict(expected[0]), dict(expected[1]), dict(expected[2]))
@@ -0,0 +1,26 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+import pm4py
+
+_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Start ohne NumPy, pandas und pm4py (Import des Evaluierungsmoduls und Kommandozeilenhilfe)
+@pytest.mark.parametrize("arguments", [["-c", "import Evaluation"], ["Evaluate.py", "--help"]])
+def test_startup_without_numpy(arguments):
+    imported = subprocess.run([sys.executable, "-X", "importtime", *arguments], cwd=_REPO,
+                              capture_output=True, text=True, check=True).stderr
+    modules = {line.rsplit("|", 1)[-1].strip() for line in imported.splitlines()}
+    assert not modules & {"numpy", "pandas", "pm4py"}
+
+def test_evaluate_against_mapped_original(log, log_path, tmp_path):
+    from Evaluate import main
+    output = str(tmp_path / "results.json")
+    main([log_path, log_path, "--threshold", "0.2", "--workers", "1", "--output", output])
+    with open(output) as f:
+        (result,) = json.load(f)
+    net, im, fm = pm4py.discover_petri_net_inductive(log, noise_threshold=0.2)
+    expected = pm4py.fitness_token_based_replay(log, net, im, fm)["percentage_of_fitting_traces"] / 100
+    assert result["fitness"] == pytest.approx(expected, abs=1e-12)
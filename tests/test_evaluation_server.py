@@ -0,0 +1,31 @@
+import os
+import shutil
+import EvaluationServer
+from EvaluationServer import acquire_reference, release_reference
+
+class _FakePool:
+    def __init__(self):
+        self.closed = False
+
+    def shutdown(self, wait=True):
+        self.closed = True
+
+def test_retired_pool_waits_for_users(log_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(EvaluationServer, "start_worker_pool", lambda profile, workers: _FakePool())
+    path = str(tmp_path / "original.xes")
+    shutil.copy(log_path, path)
+
+    old = acquire_reference(path, 1)
+    assert acquire_reference(path, 1) is old
+    release_reference(old)
+
+    # Geänderte Datei: neue Referenz, der alte Pool bleibt bis zur Freigabe offen
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    new = acquire_reference(path, 1)
+    assert new is not old and old["retired"]
+    assert not old["pool"].closed
+    release_reference(old)
+    assert old["pool"].closed
+    release_reference(new)
+    assert not new["pool"].closed
@@ -0,0 +1,39 @@
+import os
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+import pm4py
+from LogCache import file_hash, load_log
+from ReferenceProfile import get_variant_counts
+from conftest import make_log
+
+# Log, dessen letzte Events jedes dritten Cases einen früheren Zeitstempel tragen als ihre Vorgänger
+def _unordered_log():
+    log = make_log(seed=3, n_traces=60)
+    for trace in log[::3]:
+        trace[-1]["time:timestamp"] = trace[0]["time:timestamp"] - timedelta(minutes=1)
+    return log
+
+def test_compact_load_keeps_file_order(tmp_path):
+    path = str(tmp_path / "unordered.xes")
+    pm4py.write_xes(_unordered_log(), path)
+    cache_dir = str(tmp_path / "cache")
+
+    expected = get_variant_counts(load_log(path, cache_dir=cache_dir))
+    # Zuerst aus dem Parquet-Eintrag, danach ohne Eintrag über den Parse-Pfad
+    assert get_variant_counts(load_log(path, cache_dir=cache_dir, compact=True)) == expected
+    for name in os.listdir(cache_dir):
+        if name.endswith(".parquet"):
+            os.remove(os.path.join(cache_dir, name))
+    assert get_variant_counts(load_log(path, cache_dir=cache_dir, compact=True)) == expected
+
+def test_parallel_file_hash_keeps_all_index_entries(tmp_path):
+    paths = []
+    for i in range(16):
+        path = tmp_path / f"log_{i}.txt"
+        path.write_text(str(i))
+        paths.append(str(path))
+    cache_dir = str(tmp_path / "cache")
+    with ThreadPoolExecutor(8) as executor:
+        digests = list(executor.map(lambda path: file_hash(path, cache_dir), paths))
+    assert len(os.listdir(os.path.join(cache_dir, "index"))) == len(paths)
+    assert [file_hash(path, cache_dir) for path in paths] == digests
@@ -0,0 +1,46 @@
+import pickle
+import pytest
+from MappedLog import map_log, open_mapped_profile
+from ReferenceProfile import build_reference_profile, fitness_from_profile, precision_from_profile
+
+# Felder, die ein Worker für Fitness und Precision nicht aufbauen soll
+PYTHON_FIELDS = ["variants", "counts", "prefix_keys", "prefixes", "prefix_count", "start_activities",
+                 "variant_log", "prefix_log"]
+
+def test_mapped_profile_matches_in_memory_profile(log, log_path):
+    profile = open_mapped_profile(map_log(log_path))
+    expected = build_reference_profile(log)
+    assert profile["n_traces"] == expected["n_traces"]
+    assert dict(zip(profile["variants"], profile["counts"])) == dict(zip(expected["variants"], expected["counts"]))
+    assert set(profile["prefix_keys"]) == set(expected["prefix_keys"])
+    assert profile["prefixes"] == expected["prefixes"]
+    assert profile["prefix_count"] == expected["prefix_count"]
+
+def test_mapped_profile_replays_from_arrays(log, log_path, imf_model):
+    net, im, fm = imf_model
+    profile = open_mapped_profile(map_log(log_path))
+    expected = build_reference_profile(log)
+    assert fitness_from_profile(profile, net, im, fm) == pytest.approx(fitness_from_profile(expected, net, im, fm))
+    assert precision_from_profile(profile, net, im, fm) == pytest.approx(precision_from_profile(expected, net, im, fm))
+    assert not [field for field in PYTHON_FIELDS if dict.__contains__(profile, field)]
+
+def test_mapped_profile_pickles_as_path(log_path):
+    profile = open_mapped_profile(map_log(log_path))
+    assert len(pickle.dumps(profile)) < 200
+
+def test_concurrent_writes_of_the_same_mapping(log_path, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from LogCache import load_log
+    from MappedLog import write_mapped_log
+    compact = load_log(log_path, compact=True)
+    directory = str(tmp_path / "mapped")
+    with ThreadPoolExecutor(8) as pool:
+        written = list(pool.map(lambda _: write_mapped_log(compact, directory), range(8)))
+    assert written == [directory] * 8
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["mapped"]
+    assert open_mapped_profile(directory)["n_traces"] == compact["variant_counts"].sum()
+
+def test_map_log_reuses_existing_mapping(log_path, tmp_path):
+    first = map_log(log_path, str(tmp_path))
+    assert map_log(log_path, str(tmp_path)) == first
+    assert len(list(tmp_path.iterdir())) == 1
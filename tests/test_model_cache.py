@@ -0,0 +1,26 @@
+import os
+import pm4py
+import ModelCache
+from ModelCache import discover_cached
+from Evaluation import DISCOVERY_KEYS
+
+def _discover(log, threshold):
+    return lambda: pm4py.discover_petri_net_inductive(log, noise_threshold=threshold, **DISCOVERY_KEYS)
+
+def test_memory_cache_is_bounded(log, tmp_path):
+    ModelCache._memory_cache.clear()
+    for threshold in (0.1, 0.2, 0.3):
+        discover_cached(log, threshold, _discover(log, threshold), DISCOVERY_KEYS, cache_dir=str(tmp_path), max_models=2)
+    assert len(ModelCache._memory_cache) == 2
+    # Das älteste Modell kommt wieder von der Platte
+    hits = ModelCache.cache_stats["hits"]
+    discover_cached(log, 0.1, lambda: None, DISCOVERY_KEYS, cache_dir=str(tmp_path), max_models=2)
+    assert ModelCache.cache_stats["hits"] == hits + 1
+    assert len(ModelCache._memory_cache) == 2
+
+def test_disk_cache_is_pruned(log, tmp_path):
+    ModelCache._memory_cache.clear()
+    for threshold in (0.1, 0.2, 0.3):
+        discover_cached(log, threshold, _discover(log, threshold), DISCOVERY_KEYS, cache_dir=str(tmp_path), max_bytes=1)
+    # Nur der zuletzt geschriebene Eintrag bleibt über der Grenze erhalten
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".pnml")]) == 1
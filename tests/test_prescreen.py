@@ -0,0 +1,45 @@
+import pytest
+import pm4py
+from scipy.spatial.distance import jensenshannon
+from scipy.stats import wasserstein_distance
+from Prescreen import END, START, compare_statistics, log_statistics, prescreen, triage
+from conftest import make_log
+
+def test_log_against_itself(log):
+    statistics = log_statistics(log)
+    assert compare_statistics(statistics, statistics) == pytest.approx({
+        "variant_overlap": 1.0,
+        "variant_jaccard": 1.0,
+        "trace_coverage": 1.0,
+        "dfg_jsd": 0.0,
+        "dfg_edge_jaccard": 1.0,
+        "length_wasserstein": 0.0,
+        "prescreen_score": 1.0
+    }, abs=1e-12)
+
+# DFG inklusive Start/Ende wie pm4py.discover_dfg
+def test_dfg_matches_pm4py(log):
+    dfg = log_statistics(log)["dfg"]
+    graph, start_activities, end_activities = pm4py.discover_dfg(log)
+    assert {edge: count for edge, count in dfg.items() if START not in edge and END not in edge} == dict(graph)
+    assert {edge[1]: count for edge, count in dfg.items() if edge[0] == START} == dict(start_activities)
+    assert {edge[0]: count for edge, count in dfg.items() if edge[1] == END} == dict(end_activities)
+
+# Divergenz und Abstand wie die scipy-Referenzen
+def test_distances_match_scipy(log):
+    other = make_log(seed=9, n_traces=150)
+    original, anonymized = log_statistics(log), log_statistics(other)
+    result = compare_statistics(original, anonymized)
+    edges = sorted(set(original["dfg"]) | set(anonymized["dfg"]))
+    p = [original["dfg"][edge] for edge in edges]
+    q = [anonymized["dfg"][edge] for edge in edges]
+    assert result["dfg_jsd"] == pytest.approx(jensenshannon(p, q, base=2) ** 2, abs=1e-12)
+    assert result["length_wasserstein"] == pytest.approx(wasserstein_distance(
+        list(original["lengths"]), list(anonymized["lengths"]),
+        list(original["lengths"].values()), list(anonymized["lengths"].values())
+    ), abs=1e-12)
+
+def test_triage_prefers_the_original(log):
+    records = prescreen(log, [("other", make_log(seed=9, n_traces=150)), ("same", log)])
+    assert [record["log"] for record in triage(records, keep=1)] == ["same"]
+    assert [record["log"] for record in triage(records, min_score=0.999)] == ["same"]
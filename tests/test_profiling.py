@@ -0,0 +1,37 @@
+import tracemalloc
+from Profiling import stage
+
+def test_stage_without_stages_records_nothing():
+    with stage(None, "discovery") as record:
+        record["places"] = 3
+    assert record == {"places": 3}
+
+def test_stage_memory_is_per_stage():
+    stages = {}
+    tracemalloc.start()
+    try:
+        kept = bytearray(32 * 1024 * 1024)
+        with stage(stages, "small"):
+            small = bytearray(1024 * 1024)
+        with stage(stages, "large"):
+            large = bytearray(16 * 1024 * 1024)
+    finally:
+        tracemalloc.stop()
+    del kept, small, large
+    assert stages["small"]["peak_mb"] < 2
+    assert 15 < stages["large"]["peak_mb"] < 18
+    for record in stages.values():
+        assert {"wall_s", "cpu_s", "process_peak_rss_mb"} <= set(record)
+        assert "peak_rss_mb" not in record
+
+# Der Import von pm4py ist eine eigene Stufe und wird vor der Discovery erfasst
+def test_import_stage_before_discovery(log):
+    from Evaluation import evaluate_for_log, evaluate_many_for_log
+    from ReferenceProfile import build_reference_profile
+    profile = build_reference_profile(log)
+    result = evaluate_for_log(None, log, 0.2, profile=profile, stages={})
+    assert list(result["stages"])[:2] == ["import", "discovery"]
+    evaluations = [{"fitness_method": "token_based", "fitness_type": "log_fitness"}]
+    for result in evaluate_many_for_log(log, 0.2, evaluations, profile, stages={}):
+        assert list(result["stages"])[:2] == ["import", "discovery"]
+        assert result["stages"]["import"]["pm4py_loaded"]
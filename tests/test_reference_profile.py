@@ -0,0 +1,37 @@
+import pytest
+import pm4py
+from conftest import make_log
+from ReferenceProfile import build_reference_profile, fitness_from_profile, precision_from_profile
+
+MODELS = {
+    "imf": lambda log: pm4py.discover_petri_net_inductive(log, noise_threshold=0.2),
+    "im": lambda log: pm4py.discover_petri_net_inductive(log, noise_threshold=0.0),
+    "heuristics": pm4py.discover_petri_net_heuristics,
+    "alpha": pm4py.discover_petri_net_alpha
+}
+
+@pytest.mark.parametrize("seed", [0, 4])
+@pytest.mark.parametrize("model", list(MODELS))
+def test_precision_matches_pm4py(seed, model):
+    log = make_log(seed)
+    net, im, fm = MODELS[model](log)
+    expected = pm4py.precision_token_based_replay(log, net, im, fm)
+    assert precision_from_profile(build_reference_profile(log), net, im, fm) == pytest.approx(expected, abs=1e-12)
+
+@pytest.mark.parametrize("seed", [0, 4])
+@pytest.mark.parametrize("model", list(MODELS))
+def test_fitness_matches_pm4py(seed, model):
+    log = make_log(seed)
+    net, im, fm = MODELS[model](log)
+    expected = pm4py.fitness_token_based_replay(log, net, im, fm)
+    result = fitness_from_profile(build_reference_profile(log), net, im, fm)
+    for key in ["percentage_of_fitting_traces", "log_fitness", "average_trace_fitness"]:
+        assert result[key] == pytest.approx(expected[key], abs=1e-12)
+
+def test_profile_is_reused_across_models(log):
+    # Ein Profil, mehrere Modelle: der Automat des vorherigen Modells darf nicht weiterverwendet werden
+    profile = build_reference_profile(log)
+    for threshold in (0.0, 0.5, 0.2):
+        net, im, fm = pm4py.discover_petri_net_inductive(log, noise_threshold=threshold)
+        assert precision_from_profile(profile, net, im, fm) == pytest.approx(
+            pm4py.precision_token_based_replay(log, net, im, fm), abs=1e-12)
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from ResultStore import open_store, query_matrix, store_results
+
+@pytest.fixture
+def store(tmp_path):
+    conn = open_store(str(tmp_path / "results.sqlite"))
+    store_results(conn, [
+        {"K": 1, "L": 1, "fitness_method": "token_based", "fitness": 0.5},
+        {"K": 1, "L": 1, "fitness_method": "alignments", "fitness": 0.7},
+        {"K": 1, "L": 2, "fitness_method": "token_based", "fitness": 0.9},
+        {"K": 2, "L": 1, "fitness_method": "token_based", "fitness": 0.4}
+    ], "test")
+    yield conn
+    conn.close()
+
+def test_duplicate_cells_raise(store):
+    with pytest.raises(ValueError, match="mehrere Ergebnisse"):
+        query_matrix(store, "K", "L", "fitness")
+
+def test_duplicate_cells_aggregate(store):
+    _, _, matrix = query_matrix(store, "K", "L", "fitness", aggregate="max")
+    assert matrix[0, 0] == 0.7
+
+def test_missing_cells_warn(store, capsys):
+    K_values, L_values, matrix = query_matrix(store, "K", "L", "fitness", fitness_method="token_based")
+    assert (K_values, L_values) == ([1, 2], [1, 2])
+    assert matrix[0].tolist() == [0.5, 0.9] and matrix[1, 0] == 0.4 and np.isnan(matrix[1, 1])
+    assert "1 von 4 Zellen" in capsys.readouterr().out
@@ -0,0 +1,27 @@
+import Evaluation
+from SweepEngine import run_sweep
+
+# Gemeinsame Abstraktion in den Workern: dieselben Ergebnisse wie ohne; ein zweiter Lauf mit Checkpoint
+# evaluiert nichts, nach Hinzufügen eines Thresholds nur dessen Job
+def test_shared_models_only_for_pending_jobs(log_path, tmp_path, monkeypatch):
+    spec = {
+        "original": log_path,
+        "logs": [{"path": log_path, "params": {}}],
+        "thresholds": [0.1, 0.2],
+        "share_threshold_models": True,
+        "checkpoint": str(tmp_path / "sweep.checkpoint.jsonl"),
+        "workers": 1
+    }
+    first = run_sweep(spec)
+    assert first == run_sweep(dict(spec, share_threshold_models=False, checkpoint=None))
+
+    evaluated = []
+    evaluate_job = Evaluation._evaluate_job
+    def record(job):
+        evaluated.append(job["threshold"])
+        assert job["share_abstraction"]
+        return evaluate_job(job)
+    monkeypatch.setattr(Evaluation, "_evaluate_job", record)
+    assert run_sweep(spec) == first
+    assert run_sweep(dict(spec, thresholds=[0.1, 0.2, 0.3]))[:2] == first
+    assert evaluated == [0.3]
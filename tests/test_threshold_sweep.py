@@ -0,0 +1,17 @@
+import pytest
+import pm4py
+from ThresholdSweep import build_log_abstraction, discover_tree_from_abstraction
+
+@pytest.mark.parametrize("threshold", [0.0, 0.2, 0.5])
+def test_tree_matches_pm4py(log, threshold):
+    tree = discover_tree_from_abstraction(build_log_abstraction(log), threshold)
+    assert str(tree) == str(pm4py.discover_process_tree_inductive(log, noise_threshold=threshold))
+
+# Eine Abstraktion über ein feines Threshold-Gitter: die gemeinsam genutzten Schnitte ändern keinen Baum
+def test_shared_abstraction_matches_fresh_discovery(log):
+    abstraction = build_log_abstraction(log)
+    for threshold in [round(i * 0.05, 2) for i in range(21)]:
+        tree = discover_tree_from_abstraction(abstraction, threshold)
+        assert str(tree) == str(discover_tree_from_abstraction(build_log_abstraction(log), threshold))
+        assert str(tree) == str(pm4py.discover_process_tree_inductive(log, noise_threshold=threshold))
+    assert abstraction["cuts"]
@@ -0,0 +1,49 @@
+import pytest
+import pm4py
+from conftest import make_log
+from ReferenceProfile import build_reference_profile, fitness_from_profile
+from VectorReplay import replay_variants_vectorized
+
+KEYS = ["percentage_of_fitting_traces", "log_fitness", "average_trace_fitness"]
+
+# Ohne Rückfall: der Replay von pm4py darf nicht aufgerufen werden
+@pytest.fixture
+def no_pm4py_replay(monkeypatch):
+    from pm4py.algo.conformance.tokenreplay import algorithm as token_replay
+
+    def fail(*args, **kwargs):
+        raise AssertionError("pm4py-Replay aufgerufen")
+    monkeypatch.setattr(token_replay, "apply", fail)
+
+def test_imf_model_has_silent_transitions(imf_model):
+    net, _, _ = imf_model
+    assert any(t.label is None for t in net.transitions)
+
+def test_vectorized_fitness_matches_pm4py_on_imf_model(log, imf_model):
+    net, im, fm = imf_model
+    expected = pm4py.fitness_token_based_replay(log, net, im, fm)
+    profile = build_reference_profile(log)
+    replayed = replay_variants_vectorized(profile, net, im, fm)
+    assert len(replayed["trace_is_fit"]) == len(profile["variants"])
+    result = fitness_from_profile(profile, net, im, fm)
+    for key in KEYS:
+        assert result[key] == pytest.approx(expected[key], abs=1e-12)
+
+def test_vectorized_fitness_does_not_fall_back(log, imf_model, no_pm4py_replay):
+    net, im, fm = imf_model
+    fitness_from_profile(build_reference_profile(log), net, im, fm)
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("discover", [
+    lambda log: pm4py.discover_petri_net_inductive(log, noise_threshold=0.0),
+    lambda log: pm4py.discover_petri_net_inductive(log, noise_threshold=0.5),
+    pm4py.discover_petri_net_heuristics,
+    pm4py.discover_petri_net_alpha
+], ids=["im", "imf_0.5", "heuristics", "alpha"])
+def test_vectorized_fitness_matches_pm4py(seed, discover):
+    log = make_log(seed)
+    net, im, fm = discover(log)
+    expected = pm4py.fitness_token_based_replay(log, net, im, fm)
+    result = fitness_from_profile(build_reference_profile(log), net, im, fm)
+    for key in KEYS:
+        assert result[key] == pytest.approx(expected[key], abs=1e-12)